@@ -0,0 +1,154 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import copy
+import logging
+import math
+import multiprocessing
+import pickle
+from multiprocessing import shared_memory
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from haystack.nodes.retriever import BaseRetriever
+    from haystack.schema import Document
+
+
+logger = logging.getLogger(__name__)
+
+# Retriever attributes that are not needed to embed documents and are replaced before the retriever is sent to the
+# worker processes: the document store may hold open connections and the query cache holds a lock.
+_DETACHED_RETRIEVER_ATTRIBUTES: Dict[str, Any] = {"document_store": None, "query_embedding_cache": None}
+
+# retriever of the current worker process, loaded once by _init_worker()
+_worker_retriever: Optional["BaseRetriever"] = None
+
+
+def _serialize_retriever(retriever: "BaseRetriever") -> bytes:
+    # the attributes are replaced on a shallow copy, the retriever itself may be used by other threads meanwhile
+    detached_retriever = copy.copy(retriever)
+    for name, value in _DETACHED_RETRIEVER_ATTRIBUTES.items():
+        if name in vars(detached_retriever):
+            setattr(detached_retriever, name, value)
+    return pickle.dumps(detached_retriever, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _init_worker(serialized_retriever: bytes, threads_per_worker: Optional[int]):
+    global _worker_retriever
+    if threads_per_worker is not None:
+        import torch
+        torch.set_num_threads(threads_per_worker)
+    _worker_retriever = pickle.loads(serialized_retriever)
+
+
+def _embed_shard(documents: List["Document"]) -> Tuple[str, Tuple[int, ...], str]:
+    """
+    Embed a shard of documents in a worker process and return the name, shape and dtype of the shared memory block
+    that holds the embeddings. The caller is responsible for unlinking the block.
+    """
+    assert _worker_retriever is not None, "The worker process was not initialized with a retriever."
+    embeddings = np.stack(_worker_retriever.embed_documents(documents))  # type: ignore
+    block = shared_memory.SharedMemory(create=True, size=max(embeddings.nbytes, 1))
+    try:
+        np.ndarray(embeddings.shape, dtype=embeddings.dtype, buffer=block.buf)[:] = embeddings
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    return block.name, embeddings.shape, embeddings.dtype.str
+
+
+def _read_shard(name: str, shape: Tuple[int, ...], dtype: str) -> np.ndarray:
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=dtype, buffer=block.buf).copy()
+    finally:
+        block.close()
+        block.unlink()
+
+
+class EmbeddingWorkerPool:
+    """
+    Embeds batches of documents with a retriever in several worker processes, used by the document stores'
+    `update_embeddings()`.
+
+    Every worker loads the retriever's encoders once when the pool is started. Each batch the document store streams
+    is split into one shard per worker, the workers return their embeddings in shared memory blocks and the
+    embeddings are put back together in the order of the documents in the batch.
+    With `num_workers=1` no processes are started and the documents are embedded by the retriever directly.
+
+    Usage:
+
+    ```python
+    with EmbeddingWorkerPool(retriever, num_workers=4, threads_per_worker=2) as pool:
+        for document_batch in batches:
+            embeddings = pool.embed_documents(document_batch)
+    ```
+    """
+    def __init__(
+        self,
+        retriever: "BaseRetriever",
+        num_workers: int = 1,
+        threads_per_worker: Optional[int] = None,
+        start_method: str = "spawn",
+    ):
+        """
+        :param retriever: Retriever to create the embeddings with. Each worker process loads its own copy.
+        :param num_workers: Number of worker processes.
+        :param threads_per_worker: Number of threads torch uses for intra-op parallelism in each worker. None keeps
+                                   the torch default, which usually oversubscribes the CPU if there is more than one
+                                   worker. A good value is the number of cores divided by `num_workers`.
+        :param start_method: Method to start the worker processes with, see `multiprocessing.get_context()`.
+                             Forking a process that already used torch can deadlock, hence "spawn" is the default.
+        """
+        if num_workers < 1:
+            raise ValueError(f"num_workers needs to be at least 1, but is {num_workers}.")
+        self.retriever = retriever
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+        self._pool = None
+        if num_workers > 1:
+            logger.info(f"Starting {num_workers} processes to create embeddings ...")
+            self._pool = multiprocessing.get_context(start_method).Pool(
+                processes=num_workers,
+                initializer=_init_worker,
+                initargs=(_serialize_retriever(retriever), threads_per_worker),
+            )
+
+    def embed_documents(self, documents: List["Document"]) -> List[np.ndarray]:
+        """
+        Create the embeddings of a batch of documents.
+
+        :param documents: Documents to embed.
+        :return: Embeddings, one per document and in the same order as `documents`.
+        """
+        if self._pool is None or len(documents) <= 1:
+            return self.retriever.embed_documents(documents)  # type: ignore
+
+        shard_size = math.ceil(len(documents) / self.num_workers)
+        shards = [documents[start: start + shard_size] for start in range(0, len(documents), shard_size)]
+        embeddings: List[np.ndarray] = []
+        # imap() keeps the order of the shards, the embeddings of a shard are copied while the next ones are computed.
+        # Blocks of shards that are not read because of an error are unlinked by the resource tracker on shutdown.
+        for name, shape, dtype in self._pool.imap(_embed_shard, shards):
+            embeddings.extend(_read_shard(name, shape, dtype))
+        return embeddings
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> "EmbeddingWorkerPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None and self._pool is not None:
+            self._pool.terminate()
+        self.close()
+
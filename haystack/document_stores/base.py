@@ -52,6 +52,8 @@ class BaseDocumentStore(BaseComponent):
     """
     Base class for implementing Document Stores.
     """
+    # run() parses the input dicts in place and some document stores add the vector ids to the documents' meta data
+    modifies_inputs = True
     index: Optional[str]
     label_index: Optional[str]
     similarity: Optional[str]
@@ -270,6 +272,33 @@ class BaseDocumentStore(BaseComponent):
                            headers: Optional[Dict[str, str]] = None) -> List[Document]:
         pass
 
+    def query_by_embedding_batch(self,
+                                 query_embs: np.ndarray,
+                                 filters: Optional[Dict[str, List[str]]] = None,
+                                 top_k: int = 10,
+                                 index: Optional[str] = None,
+                                 return_embedding: Optional[bool] = None,
+                                 headers: Optional[Dict[str, str]] = None) -> List[List[Document]]:
+        """
+        Find the documents that are most similar to each of the provided query embeddings.
+        This default implementation calls `query_by_embedding()` once per query. Document stores that can
+        search several vectors at once override it.
+
+        :param query_embs: Embeddings of the queries (e.g. gathered from DPR), one query per row.
+        :param filters: Optional filters to narrow down the search space. They apply to all queries.
+                        Example: {"name": ["some", "more"], "category": ["only_one"]}
+        :param top_k: How many documents to return per query.
+        :param index: Index name to query the documents from.
+        :param return_embedding: To return document embedding.
+        :param headers: Custom HTTP headers to pass to document store client if supported (e.g. {'Authorization': 'Basic YWRtaW46cm9vdA=='} for basic authentication)
+        :return: One list of documents per query, in the same order as `query_embs`.
+        """
+        return [
+            self.query_by_embedding(query_emb=query_emb, filters=filters, top_k=top_k, index=index,
+                                    return_embedding=return_embedding, headers=headers)
+            for query_emb in query_embs
+        ]
+
     @abstractmethod
     def get_label_count(self, index: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> int:
         pass
@@ -389,7 +418,7 @@ class BaseDocumentStore(BaseComponent):
          :param documents: A list of Haystack Document objects.
          :return: A list of Haystack Document objects.
         """
-        _hash_ids: list = []
+        _hash_ids: set = set()
         _documents: List[Document] = []
 
         for document in documents:
@@ -398,7 +427,7 @@ class BaseDocumentStore(BaseComponent):
                                f"'{self.index}'")
                 continue
             _documents.append(document)
-            _hash_ids.append(document.id)
+            _hash_ids.add(document.id)
 
         return _documents
 
@@ -432,7 +461,8 @@ class BaseDocumentStore(BaseComponent):
                 raise DuplicateDocumentError(f"Document with ids '{', '.join(ids_exist_in_db)} already exists"
                                              f" in index = '{index}'.")
 
-            documents = list(filter(lambda doc: doc.id not in ids_exist_in_db, documents))
+            ids_to_skip = set(ids_exist_in_db)
+            documents = [doc for doc in documents if doc.id not in ids_to_skip]
 
         return documents
 
@@ -22,6 +22,7 @@ except (ImportError, ModuleNotFoundError) as ie:
 from haystack.document_stores import KeywordDocumentStore
 from haystack.schema import Document, Label
 from haystack.document_stores.base import get_batches_from_generator
+from haystack.document_stores._embedding_pool import EmbeddingWorkerPool
 
 
 logger = logging.getLogger(__name__)
@@ -1093,7 +1094,9 @@ class ElasticsearchDocumentStore(KeywordDocumentStore):
         filters: Optional[Dict[str, List[str]]] = None,
         update_existing_embeddings: bool = True,
         batch_size: int = 10_000,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        num_workers: int = 1,
+        threads_per_worker: Optional[int] = None
     ):
         """
         Updates the embeddings in the the document store using the encoding model specified in the retriever.
@@ -1110,6 +1113,9 @@ class ElasticsearchDocumentStore(KeywordDocumentStore):
         :param batch_size: When working with large number of documents, batching can help reduce memory footprint.
         :param headers: Custom HTTP headers to pass to elasticsearch client (e.g. {'Authorization': 'Basic YWRtaW46cm9vdA=='})
                 Check out https://www.elastic.co/guide/en/elasticsearch/reference/current/http-clients.html for more information.
+        :param num_workers: Number of processes to create the embeddings in. Each process loads its own copy of the
+                            retriever's encoders and gets an equal share of the documents of each batch.
+        :param threads_per_worker: Number of threads torch uses in each of these processes. None keeps the torch default.
         :return: None
         """
         if index is None:
@@ -1139,10 +1145,11 @@ class ElasticsearchDocumentStore(KeywordDocumentStore):
 
         logging.getLogger("elasticsearch").setLevel(logging.CRITICAL)
 
-        with tqdm(total=document_count, position=0, unit=" Docs", desc="Updating embeddings") as progress_bar:
+        with EmbeddingWorkerPool(retriever, num_workers=num_workers, threads_per_worker=threads_per_worker) as pool, \
+                tqdm(total=document_count, position=0, unit=" Docs", desc="Updating embeddings") as progress_bar:
             for result_batch in get_batches_from_generator(result, batch_size):
                 document_batch = [self._convert_es_hit_to_document(hit, return_embedding=False) for hit in result_batch]
-                embeddings = retriever.embed_documents(document_batch)  # type: ignore
+                embeddings = pool.embed_documents(document_batch)
                 assert len(document_batch) == len(embeddings)
 
                 if embeddings[0].shape[0] != self.embedding_dim:
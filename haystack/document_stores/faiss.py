@@ -6,10 +6,11 @@ if TYPE_CHECKING:
 import json
 import logging
 from pathlib import Path
-from typing import Union, List, Optional, Dict, Generator
+from typing import Union, List, Optional, Dict, Generator, Tuple
 from tqdm.auto import tqdm
 import warnings
 import numpy as np
+from copy import deepcopy
 from inspect import Signature, signature
 
 try:
@@ -22,6 +23,7 @@ except (ImportError, ModuleNotFoundError) as ie:
 
 from haystack.schema import Document
 from haystack.document_stores.base import get_batches_from_generator
+from haystack.document_stores._embedding_pool import EmbeddingWorkerPool
 
 
 logger = logging.getLogger(__name__)
@@ -53,6 +55,7 @@ class FAISSDocumentStore(SQLDocumentStore):
         faiss_index_path: Union[str, Path] = None,
         faiss_config_path: Union[str, Path] = None,
         isolation_level: str = None,
+        stable_vector_ids: bool = False,
         **kwargs,
     ):
         """
@@ -98,6 +101,12 @@ class FAISSDocumentStore(SQLDocumentStore):
         :param faiss_config_path: Stored FAISS initial configuration parameters.
             Can be created via calling `save()`
         :param isolation_level: see SQLAlchemy's `isolation_level` parameter for `create_engine()` (https://docs.sqlalchemy.org/en/14/core/engines.html#sqlalchemy.create_engine.params.isolation_level)
+        :param stable_vector_ids: Wrap new FAISS indexes in an `IndexIDMap2`, so that every document keeps the same
+                                  integer vector id for as long as it is in the index. Overwriting documents, deleting
+                                  documents and updating embeddings with filters then only remove and re-add the
+                                  affected vectors instead of rebuilding the whole index.
+                                  Not supported by index types that can't remove vectors (e.g. "HNSW") if you need
+                                  to overwrite or delete documents.
         """
         # special case if we want to load an existing index from disk
         # load init params from disk and run init again
@@ -120,7 +129,8 @@ class FAISSDocumentStore(SQLDocumentStore):
             similarity=similarity,
             embedding_field=embedding_field,
             progress_bar=progress_bar,
-            isolation_level=isolation_level
+            isolation_level=isolation_level,
+            stable_vector_ids=stable_vector_ids
         )
 
         if similarity in ("dot_product", "cosine"):
@@ -141,6 +151,7 @@ class FAISSDocumentStore(SQLDocumentStore):
             self.embedding_dim = embedding_dim
 
         self.faiss_index_factory_str = faiss_index_factory_str
+        self.stable_vector_ids = stable_vector_ids
         self.faiss_indexes: Dict[str, faiss.swigfaiss.Index] = {}
         if faiss_index:
             self.faiss_indexes[index] = faiss_index
@@ -202,8 +213,25 @@ class FAISSDocumentStore(SQLDocumentStore):
             logger.info(f"HNSW params: n_links: {n_links}, efSearch: {index.hnsw.efSearch}, efConstruction: {index.hnsw.efConstruction}")
         else:
             index = faiss.index_factory(embedding_dim, index_factory, metric_type)
+        if self.stable_vector_ids:
+            index = faiss.IndexIDMap2(index)
         return index
 
+    def _uses_id_map(self, index: str) -> bool:
+        """
+        Whether the vectors of the FAISS index are added with explicit (stable) ids instead of sequential positions.
+        """
+        return isinstance(self.faiss_indexes.get(index), faiss.IndexIDMap)
+
+    def _add_vectors(self, embeddings: np.ndarray, vector_ids: List[int], index: str, replaced_vector_ids: List[int]):
+        """
+        Add embeddings with explicit vector ids to an index using stable vector ids.
+        The vectors with ids in `replaced_vector_ids` are removed from the index first.
+        """
+        if replaced_vector_ids:
+            self.faiss_indexes[index].remove_ids(np.array(replaced_vector_ids, dtype="int64"))
+        self.faiss_indexes[index].add_with_ids(embeddings, np.array(vector_ids, dtype="int64"))
+
     def write_documents(self, documents: Union[List[dict], List[Document]], index: Optional[str] = None,
                         batch_size: int = 10_000, duplicate_documents: Optional[str] = None,
                         headers: Optional[Dict[str, str]] = None) -> None:
@@ -245,30 +273,57 @@ class FAISSDocumentStore(SQLDocumentStore):
                                                             duplicate_documents=duplicate_documents)
         if len(document_objects) > 0:
             add_vectors = False if document_objects[0].embedding is None else True
-
-            if self.duplicate_documents == "overwrite" and add_vectors:
-                logger.warning("You have to provide `duplicate_documents = 'overwrite'` arg and "
-                               "`FAISSDocumentStore` does not support update in existing `faiss_index`.\n"
-                               "Please call `update_embeddings` method to repopulate `faiss_index`")
-
-            vector_id = self.faiss_indexes[index].ntotal
+            uses_id_map = self._uses_id_map(index)
+
+            existing_vector_ids: Dict[str, str] = {}
+            if uses_id_map:
+                # overwritten documents keep their vector id, their old vectors get replaced
+                if duplicate_documents == "overwrite":
+                    existing_vector_ids = self._get_vector_id_map([doc.id for doc in document_objects], index=index)
+                vector_id = self._get_next_vector_id()
+            else:
+                if self.duplicate_documents == "overwrite" and add_vectors:
+                    logger.warning("You have to provide `duplicate_documents = 'overwrite'` arg and "
+                                   "`FAISSDocumentStore` does not support update in existing `faiss_index`.\n"
+                                   "Please call `update_embeddings` method to repopulate `faiss_index`")
+                vector_id = self.faiss_indexes[index].ntotal
             with tqdm(total = len(document_objects), disable =not self.progress_bar, position=0,
                     desc="Writing Documents") as progress_bar:
                 for i in range(0, len(document_objects), batch_size):
+                    document_batch = document_objects[i: i + batch_size]
+                    replaced_vector_ids = []
+                    if uses_id_map:
+                        replaced_vector_ids = [int(existing_vector_ids[doc.id]) for doc in document_batch
+                                               if doc.id in existing_vector_ids]
+
+                    batch_vector_ids = []
                     if add_vectors:
-                        embeddings = [doc.embedding for doc in document_objects[i: i + batch_size]]
+                        for doc in document_batch:
+                            if doc.id in existing_vector_ids:
+                                batch_vector_ids.append(int(existing_vector_ids[doc.id]))
+                            else:
+                                batch_vector_ids.append(vector_id)
+                                vector_id += 1
+
+                        embeddings = [doc.embedding for doc in document_batch]
                         embeddings_to_index = np.array(embeddings, dtype="float32")
 
                         if self.similarity=="cosine": self.normalize_embedding(embeddings_to_index)
 
-                        self.faiss_indexes[index].add(embeddings_to_index)
+                        if uses_id_map:
+                            self._add_vectors(embeddings_to_index, batch_vector_ids, index=index,
+                                              replaced_vector_ids=replaced_vector_ids)
+                        else:
+                            self.faiss_indexes[index].add(embeddings_to_index)
+                    elif replaced_vector_ids:
+                        # the overwritten documents don't have embeddings anymore
+                        self.faiss_indexes[index].remove_ids(np.array(replaced_vector_ids, dtype="int64"))
 
                     docs_to_write_in_sql = []
-                    for doc in document_objects[i: i + batch_size]:
+                    for doc_idx, doc in enumerate(document_batch):
                         meta = doc.meta
                         if add_vectors:
-                            meta["vector_id"] = vector_id
-                            vector_id += 1
+                            meta["vector_id"] = batch_vector_ids[doc_idx]
                         docs_to_write_in_sql.append(doc)
 
                     super(FAISSDocumentStore, self).write_documents(docs_to_write_in_sql, index=index,
@@ -286,7 +341,9 @@ class FAISSDocumentStore(SQLDocumentStore):
         index: Optional[str] = None,
         update_existing_embeddings: bool = True,
         filters: Optional[Dict[str, List[str]]] = None,
-        batch_size: int = 10_000
+        batch_size: int = 10_000,
+        num_workers: int = 1,
+        threads_per_worker: Optional[int] = None
     ):
         """
         Updates the embeddings in the the document store using the encoding model specified in the retriever.
@@ -300,28 +357,43 @@ class FAISSDocumentStore(SQLDocumentStore):
                                            get processed.
         :param filters: Optional filters to narrow down the documents for which embeddings are to be updated.
                         Example: {"name": ["some", "more"], "category": ["only_one"]}
+                        Updating existing embeddings with filters requires `stable_vector_ids=True`.
         :param batch_size: When working with large number of documents, batching can help reduce memory footprint.
+        :param num_workers: Number of processes to create the embeddings in. Each process loads its own copy of the
+                            retriever's encoders and gets an equal share of the documents of each batch.
+        :param threads_per_worker: Number of threads torch uses in each of these processes. None keeps the torch default.
         :return: None
         """
         index = index or self.index
+        uses_id_map = self._uses_id_map(index)
 
+        # with stable vector ids, documents keep their vector id and only their vectors get replaced
+        replace_vectors = update_existing_embeddings and uses_id_map
         if update_existing_embeddings is True:
             if filters is None:
                 self.faiss_indexes[index].reset()
-                self.reset_vector_ids(index)
-            else:
-                raise Exception("update_existing_embeddings=True is not supported with filters.")
+                if uses_id_map:
+                    replace_vectors = False
+                else:
+                    self.reset_vector_ids(index)
+            elif not uses_id_map:
+                raise Exception("update_existing_embeddings=True is only supported with filters "
+                                "if the FAISSDocumentStore was created with stable_vector_ids=True.")
 
         if not self.faiss_indexes.get(index):
             raise ValueError("Couldn't find a FAISS index. Try to init the FAISSDocumentStore() again ...")
 
-        document_count = self.get_document_count(index=index)
+        document_count = self.get_document_count(index=index, filters=filters,
+                                                 only_documents_without_embedding=not update_existing_embeddings)
         if document_count == 0:
             logger.warning("Calling DocumentStore.update_embeddings() on an empty index")
             return
 
         logger.info(f"Updating embeddings for {document_count} docs...")
-        vector_id = sum([self.faiss_indexes[index].ntotal for index in self.faiss_indexes.keys()])
+        if uses_id_map:
+            vector_id = self._get_next_vector_id()
+        else:
+            vector_id = sum([self.faiss_indexes[index].ntotal for index in self.faiss_indexes.keys()])
 
         result = self._query(
             index=index,
@@ -331,22 +403,39 @@ class FAISSDocumentStore(SQLDocumentStore):
             only_documents_without_embedding=not update_existing_embeddings
         )
         batched_documents = get_batches_from_generator(result, batch_size)
-        with tqdm(total=document_count, disable=not self.progress_bar, position=0, unit=" docs",
-                  desc="Updating Embedding") as progress_bar:
+        with EmbeddingWorkerPool(retriever, num_workers=num_workers, threads_per_worker=threads_per_worker) as pool, \
+                tqdm(total=document_count, disable=not self.progress_bar, position=0, unit=" docs",
+                     desc="Updating Embedding") as progress_bar:
             for document_batch in batched_documents:
-                embeddings = retriever.embed_documents(document_batch)  # type: ignore
+                embeddings = pool.embed_documents(document_batch)
                 assert len(document_batch) == len(embeddings)
 
                 embeddings_to_index = np.array(embeddings, dtype="float32")
 
                 if self.similarity=="cosine": self.normalize_embedding(embeddings_to_index)
 
-                self.faiss_indexes[index].add(embeddings_to_index)
-
-                vector_id_map = {}
-                for doc in document_batch:
-                    vector_id_map[str(doc.id)] = str(vector_id)
-                    vector_id += 1
+                if uses_id_map:
+                    batch_vector_ids = []
+                    replaced_vector_ids = []
+                    vector_id_map = {}
+                    for doc in document_batch:
+                        if doc.meta.get("vector_id") is not None:
+                            batch_vector_ids.append(int(doc.meta["vector_id"]))
+                            if replace_vectors:
+                                replaced_vector_ids.append(int(doc.meta["vector_id"]))
+                        else:
+                            batch_vector_ids.append(vector_id)
+                            vector_id_map[str(doc.id)] = str(vector_id)
+                            vector_id += 1
+                    self._add_vectors(embeddings_to_index, batch_vector_ids, index=index,
+                                      replaced_vector_ids=replaced_vector_ids)
+                else:
+                    self.faiss_indexes[index].add(embeddings_to_index)
+
+                    vector_id_map = {}
+                    for doc in document_batch:
+                        vector_id_map[str(doc.id)] = str(vector_id)
+                        vector_id += 1
                 self.update_vector_ids(vector_id_map, index=index)
                 progress_bar.set_description_str("Documents Processed")
                 progress_bar.update(batch_size)
@@ -481,6 +570,8 @@ class FAISSDocumentStore(SQLDocumentStore):
             If filters are provided along with a list of IDs, this method deletes the
             intersection of the two query results (documents that match the filters and
             have their ID in the list).
+            Only a FAISSDocumentStore created with `stable_vector_ids=True` keeps the vectors of the remaining
+            documents consistent after deleting a subset of the documents.
         :return: None
         """
         if headers:
@@ -522,8 +613,33 @@ class FAISSDocumentStore(SQLDocumentStore):
         if headers:
             raise NotImplementedError("FAISSDocumentStore does not support headers.")
         
-        if filters:
-            logger.warning("Query filters are not implemented for the FAISSDocumentStore.")
+        return self.query_by_embedding_batch(query_embs=query_emb.reshape(1, -1), filters=filters, top_k=top_k,
+                                             index=index, return_embedding=return_embedding)[0]
+
+    def query_by_embedding_batch(
+        self,
+        query_embs: np.ndarray,
+        filters: Optional[Dict[str, List[str]]] = None,
+        top_k: int = 10,
+        index: Optional[str] = None,
+        return_embedding: Optional[bool] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> List[List[Document]]:
+        """
+        Find the documents that are most similar to each of the provided query embeddings.
+        All queries are searched with a single call to the FAISS index and the documents of all queries are
+        fetched from the SQL database together.
+
+        :param query_embs: Embeddings of the queries (e.g. gathered from DPR), one query per row.
+        :param filters: Optional filters to narrow down the search space.
+                        Example: {"name": ["some", "more"], "category": ["only_one"]}
+        :param top_k: How many documents to return per query.
+        :param index: Index name to query the document from.
+        :param return_embedding: To return document embedding. Unlike other document stores, FAISS will return normalized embeddings
+        :return: One list of documents per query, in the same order as `query_embs`.
+        """
+        if headers:
+            raise NotImplementedError("FAISSDocumentStore does not support headers.")
 
         index = index or self.index
         if not self.faiss_indexes.get(index):
@@ -532,25 +648,192 @@ class FAISSDocumentStore(SQLDocumentStore):
         if return_embedding is None:
             return_embedding = self.return_embedding
 
-        query_emb = query_emb.reshape(1, -1).astype(np.float32)
+        query_embs = np.array(query_embs, dtype=np.float32).reshape(len(query_embs), -1)
 
-        if self.similarity=="cosine": self.normalize_embedding(query_emb)
+        if self.similarity=="cosine": self.normalize_embedding(query_embs)
 
-        score_matrix, vector_id_matrix = self.faiss_indexes[index].search(query_emb, top_k)
-        vector_ids_for_query = [str(vector_id) for vector_id in vector_id_matrix[0] if vector_id != -1]
+        if filters:
+            score_matrix, vector_id_matrix = self._search_with_filters(query_embs, filters=filters, top_k=top_k, index=index)
+        else:
+            score_matrix, vector_id_matrix = self.faiss_indexes[index].search(query_embs, top_k)
 
-        documents = self.get_documents_by_vector_ids(vector_ids_for_query, index=index)
+        unique_vector_ids = list({str(vector_id) for vector_id in vector_id_matrix.flatten() if vector_id != -1})
+        documents_by_vector_id = {
+            doc.meta["vector_id"]: doc for doc in self.get_documents_by_vector_ids(unique_vector_ids, index=index)
+        }
 
-        #assign query score to each document
-        scores_for_vector_ids: Dict[str, float] = {str(v_id): s for v_id, s in zip(vector_id_matrix[0], score_matrix[0])}
-        for doc in documents:
-            raw_score = scores_for_vector_ids[doc.meta["vector_id"]]
-            doc.score = self.finalize_raw_score(raw_score,self.similarity)
+        results = []
+        for scores, vector_ids in zip(score_matrix, vector_id_matrix):
+            documents = []
+            for raw_score, vector_id in zip(scores, vector_ids):
+                doc = documents_by_vector_id.get(str(vector_id))
+                if doc is None:
+                    continue
+                # the same document can be retrieved by several queries, each with its own score
+                if doc.score is not None:
+                    doc = deepcopy(doc)
+                doc.score = self.finalize_raw_score(raw_score, self.similarity)
+
+                if return_embedding is True:
+                    doc.embedding = self.faiss_indexes[index].reconstruct(int(vector_id))
+                documents.append(doc)
+            results.append(documents)
+
+        return results
+
+    def _search_with_filters(
+        self,
+        query_embs: np.ndarray,
+        filters: Dict[str, List[str]],
+        top_k: int,
+        index: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search the FAISS index restricted to the vectors of the documents matching `filters`.
+        The candidate vector ids are resolved through the SQL meta tables. If the installed faiss supports it, the
+        search is restricted to the candidates with an `IDSelectorBatch`. Otherwise, or if this search returns less
+        than `top_k` results (which happens with approximate indexes like HNSW), small candidate sets are scored
+        exactly against the query embeddings, and for large candidate sets the whole index is searched with an
+        increasing number of results until `top_k` of them pass the filters (or the whole index has been searched).
+
+        :return: Scores and vector ids of the results, in the same format as `faiss.Index.search()`.
+        """
+        candidate_vector_ids = np.array(self._get_vector_ids(filters=filters, index=index), dtype="int64")
+
+        # faiss >= 1.7.3 can restrict the search to the candidates itself
+        if hasattr(faiss, "SearchParameters") and len(candidate_vector_ids) > 0 and top_k > 0:
+            try:
+                score_matrix, vector_id_matrix = self._search_with_id_selector(
+                    query_embs, candidate_vector_ids, top_k=top_k, index=index
+                )
+            except RuntimeError:
+                # the index type doesn't support search parameters
+                logger.debug("Falling back to filtering without an IDSelector, as the FAISS index does not support it.")
+            else:
+                # approximate indexes (e.g. HNSW) only search a part of the index, which may miss the candidates
+                n_expected = min(top_k, len(candidate_vector_ids))
+                incomplete = np.flatnonzero((vector_id_matrix != -1).sum(axis=1) < n_expected)
+                if len(incomplete) == 0:
+                    return score_matrix, vector_id_matrix
+                logger.debug(f"The IDSelector search found less than top_k results for {len(incomplete)} queries, "
+                             f"searching the candidates without it.")
+                incomplete_scores, incomplete_vector_ids = self._search_without_id_selector(
+                    query_embs[incomplete], candidate_vector_ids, top_k=top_k, index=index
+                )
+                # the fallback may return less columns, if there are less than top_k candidates
+                n_columns = incomplete_vector_ids.shape[1]
+                vector_id_matrix[incomplete] = -1
+                vector_id_matrix[incomplete, :n_columns] = incomplete_vector_ids
+                score_matrix[incomplete, :n_columns] = incomplete_scores
+                return score_matrix, vector_id_matrix
+
+        return self._search_without_id_selector(query_embs, candidate_vector_ids, top_k=top_k, index=index)
+
+    def _search_without_id_selector(
+        self,
+        query_embs: np.ndarray,
+        candidate_vector_ids: np.ndarray,
+        top_k: int,
+        index: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search the FAISS index restricted to the vectors with the given `candidate_vector_ids`, for faiss versions or
+        index types without IDSelector support.
+        """
+        faiss_index = self.faiss_indexes[index]
+
+        # scoring a few candidates directly is cheaper than searching the whole index for them
+        if len(candidate_vector_ids) * 10 <= faiss_index.ntotal:
+            try:
+                return self._search_subset(query_embs, candidate_vector_ids, top_k=top_k, index=index)
+            except RuntimeError:
+                # the index type can't reconstruct its vectors (e.g. IVF without a direct map)
+                logger.debug("Falling back to post-filtering, as the FAISS index does not support reconstructing vectors.")
+
+        n_queries = len(query_embs)
+        score_matrix = np.zeros((n_queries, top_k), dtype=np.float32)
+        vector_id_matrix = np.full((n_queries, top_k), -1, dtype="int64")
+        if len(candidate_vector_ids) == 0 or top_k <= 0:
+            return score_matrix, vector_id_matrix
+
+        # on average, a fraction len(candidates) / ntotal of the unfiltered results passes the filters
+        fetch_k = min(faiss_index.ntotal, int(np.ceil(2 * top_k * faiss_index.ntotal / len(candidate_vector_ids))))
+        pending = np.arange(n_queries)
+        while len(pending) > 0:
+            scores, vector_ids = faiss_index.search(query_embs[pending], fetch_k)
+            still_pending = []
+            for query_idx, query_scores, query_vector_ids in zip(pending, scores, vector_ids):
+                hits = np.isin(query_vector_ids, candidate_vector_ids)
+                n_hits = min(int(hits.sum()), top_k)
+                if n_hits < top_k and fetch_k < faiss_index.ntotal:
+                    still_pending.append(query_idx)
+                    continue
+                score_matrix[query_idx, :n_hits] = query_scores[hits][:n_hits]
+                vector_id_matrix[query_idx, :n_hits] = query_vector_ids[hits][:n_hits]
+            pending = np.array(still_pending, dtype="int64")
+            fetch_k = min(faiss_index.ntotal, 2 * fetch_k)
+
+        return score_matrix, vector_id_matrix
+
+    def _search_with_id_selector(
+        self,
+        query_embs: np.ndarray,
+        vector_ids: np.ndarray,
+        top_k: int,
+        index: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search `query_embs` in the FAISS index, skipping all vectors but the ones with the given `vector_ids`.
+        Flat and IVF indexes return the best `top_k` candidates. Approximate indexes (e.g. HNSW) may return less.
+        """
+        faiss_index = self.faiss_indexes[index]
+        selector = faiss.IDSelectorBatch(vector_ids)
+        ivf_index = faiss.try_extract_index_ivf(faiss_index)
+        if ivf_index is not None:
+            # IVF indexes only accept their own type of search parameters. The candidates can be in any of the lists,
+            # all of them are probed, which only costs a comparison with the selector for the other vectors.
+            search_params = faiss.SearchParametersIVF(sel=selector, nprobe=ivf_index.nlist)
+        else:
+            search_params = faiss.SearchParameters(sel=selector)
+        return faiss_index.search(query_embs, top_k, params=search_params)
+
+    def _search_subset(
+        self,
+        query_embs: np.ndarray,
+        vector_ids: np.ndarray,
+        top_k: int,
+        index: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact search of `query_embs` against the vectors with the given `vector_ids` only.
+        """
+        n_queries = len(query_embs)
+        top_k = min(top_k, len(vector_ids))
+        if top_k <= 0:
+            return np.zeros((n_queries, 0), dtype=np.float32), np.zeros((n_queries, 0), dtype="int64")
+
+        faiss_index = self.faiss_indexes[index]
+        if hasattr(faiss_index, "reconstruct_batch"):
+            vectors = faiss_index.reconstruct_batch(vector_ids)
+        else:
+            vectors = np.vstack([faiss_index.reconstruct(int(vector_id)) for vector_id in vector_ids])
 
-            if return_embedding is True:
-                doc.embedding = self.faiss_indexes[index].reconstruct(int(doc.meta["vector_id"]))
+        if self.metric_type == faiss.METRIC_L2:
+            # squared L2 distances, the lower the better (as returned by FAISS)
+            score_matrix = (query_embs ** 2).sum(axis=1)[:, None] - 2 * query_embs @ vectors.T + (vectors ** 2).sum(axis=1)[None, :]
+            order_matrix = score_matrix
+        else:
+            score_matrix = query_embs @ vectors.T
+            order_matrix = -score_matrix
 
-        return documents
+        if top_k < len(vector_ids):
+            top_positions = np.argpartition(order_matrix, top_k - 1, axis=1)[:, :top_k]
+        else:
+            top_positions = np.tile(np.arange(len(vector_ids)), (n_queries, 1))
+        top_positions = np.take_along_axis(
+            top_positions, np.argsort(np.take_along_axis(order_matrix, top_positions, axis=1), axis=1, kind="stable"), axis=1
+        )
+        return np.take_along_axis(score_matrix, top_positions, axis=1), vector_ids[top_positions]
 
     def save(self, index_path: Union[str, Path], config_path: Optional[Union[str, Path]] = None):
         """
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Dict, List, Optional, Union, Generator
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Union, Generator
 
 if TYPE_CHECKING:
     from haystack.nodes.retriever import BaseRetriever
@@ -8,18 +8,168 @@ import logging
 import numpy as np
 from copy import deepcopy
 from collections import defaultdict
-from scipy.spatial.distance import cosine
 from tqdm import tqdm
 
 from haystack.schema import Document, Label
 from haystack.errors import DuplicateDocumentError
 from haystack.document_stores import BaseDocumentStore
-from haystack.document_stores.base import get_batches_from_generator
+from haystack.document_stores._embedding_pool import EmbeddingWorkerPool
 
 
 logger = logging.getLogger(__name__)
 
 
+class _EmbeddingMatrix:
+    """
+    Contiguous float32 matrix holding the embeddings of one index, together with the mapping between matrix rows
+    and document ids. Removing a document moves the last row into the freed slot, so the used rows stay contiguous
+    and a query is a single matrix-vector product.
+    """
+    def __init__(self):
+        self._matrix: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def set(self, id: str, embedding: np.ndarray):
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if self._matrix is None:
+            self._matrix = np.empty((1024, embedding.shape[0]), dtype=np.float32)
+            self._norms = np.empty(1024, dtype=np.float32)
+        elif embedding.shape[0] != self._matrix.shape[1]:
+            raise ValueError(f"Embedding of document '{id}' has dimension {embedding.shape[0]}, but the other "
+                             f"embeddings of this index have dimension {self._matrix.shape[1]}.")
+
+        row = self.rows.get(id)
+        if row is None:
+            row = len(self.ids)
+            if row == self._matrix.shape[0]:
+                self._grow()
+            self.ids.append(id)
+            self.rows[id] = row
+        self._matrix[row] = embedding
+        self._norms[row] = np.linalg.norm(embedding)  # type: ignore
+
+    def remove(self, id: str):
+        row = self.rows.pop(id, None)
+        if row is None:
+            return
+        last_row = len(self.ids) - 1
+        if row != last_row:
+            last_id = self.ids[last_row]
+            self._matrix[row] = self._matrix[last_row]  # type: ignore
+            self._norms[row] = self._norms[last_row]  # type: ignore
+            self.ids[row] = last_id
+            self.rows[last_id] = row
+        self.ids.pop()
+
+    def scores(self, query_emb: np.ndarray, similarity: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Compute the raw similarity between `query_emb` and the stored embeddings (or only the given `rows`).
+        `query_emb` can be a single vector or a 2D matrix with one query per row.
+        """
+        if self._matrix is None:
+            return np.zeros((0,) if np.ndim(query_emb) == 1 else (0, len(query_emb)), dtype=np.float32)
+        matrix = self._matrix[:len(self.ids)]
+        norms = self._norms[:len(self.ids)]  # type: ignore
+        if rows is not None:
+            matrix, norms = matrix[rows], norms[rows]
+
+        query_emb = np.asarray(query_emb, dtype=np.float32)
+        scores = matrix @ query_emb.T
+        if similarity == "cosine":
+            # cosine similarity score = dot product of the L2-normalized vectors
+            query_norms = np.linalg.norm(query_emb, axis=-1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = scores / np.multiply.outer(norms, query_norms)
+        return scores
+
+    def _grow(self):
+        capacity = 2 * self._matrix.shape[0]  # type: ignore
+        matrix = np.empty((capacity, self._matrix.shape[1]), dtype=np.float32)  # type: ignore
+        norms = np.empty(capacity, dtype=np.float32)
+        matrix[:len(self.ids)] = self._matrix[:len(self.ids)]  # type: ignore
+        norms[:len(self.ids)] = self._norms[:len(self.ids)]  # type: ignore
+        self._matrix, self._norms = matrix, norms
+
+
+class _MetaIndex:
+    """
+    Inverted index from (meta key, value) to the ids of the documents of one index having this value, so that filters
+    are resolved by set operations instead of checking the meta of every document. It also keeps the insertion position
+    of each document so that filtered results are returned in the same order as unfiltered ones.
+    """
+    def __init__(self):
+        self.positions: Dict[str, int] = {}
+        self._next_position = 0
+        self._postings: Dict[str, Dict[Any, Set[str]]] = defaultdict(dict)
+        # values that can't be hashed (e.g. lists) are compared one by one, like before
+        self._unhashable_values: Dict[str, Dict[str, Any]] = defaultdict(dict)
+
+    def add(self, document: Document, previous: Optional[Document] = None):
+        """
+        Index the meta of `document`. If it replaces the document `previous` with the same id, the meta of `previous`
+        is unindexed but the document keeps its position.
+        """
+        if previous is not None:
+            self._remove_meta(previous)
+        if document.id not in self.positions:
+            self.positions[document.id] = self._next_position
+            self._next_position += 1
+
+        for key, value in document.meta.items():
+            # documents with an empty value are never matched by a filter on this key
+            if not value:
+                continue
+            try:
+                self._postings[key].setdefault(value, set()).add(document.id)
+            except TypeError:
+                self._unhashable_values[key][document.id] = value
+
+    def remove(self, document: Document):
+        if self.positions.pop(document.id, None) is not None:
+            self._remove_meta(document)
+
+    def match(self, filters: Dict[str, List[str]]) -> Set[str]:
+        """
+        Return the ids of the documents that have one of the accepted values for every key in `filters`.
+        """
+        result: Optional[Set[str]] = None
+        for key, values in filters.items():
+            postings = self._postings.get(key, {})
+            ids: Set[str] = set()
+            for value in values:
+                try:
+                    ids.update(postings.get(value, ()))
+                except TypeError:
+                    pass
+            ids.update(id for id, value in self._unhashable_values.get(key, {}).items() if value in values)
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result or set()
+
+    def sort(self, ids) -> List[str]:
+        return sorted(ids, key=self.positions.__getitem__)
+
+    def _remove_meta(self, document: Document):
+        for key, value in document.meta.items():
+            if not value:
+                continue
+            try:
+                ids = self._postings[key].get(value)
+            except TypeError:
+                self._unhashable_values[key].pop(document.id, None)
+                continue
+            if ids is not None:
+                ids.discard(document.id)
+                if not ids:
+                    del self._postings[key][value]
+
+
 class InMemoryDocumentStore(BaseDocumentStore):
     """
     In-memory document store
@@ -61,6 +211,8 @@ class InMemoryDocumentStore(BaseDocumentStore):
         )
 
         self.indexes: Dict[str, Dict] = defaultdict(dict)
+        self.embedding_matrices: Dict[str, _EmbeddingMatrix] = defaultdict(_EmbeddingMatrix)
+        self.meta_indexes: Dict[str, _MetaIndex] = defaultdict(_MetaIndex)
         self.index: str = index
         self.label_index: str = label_index
         self.embedding_field = embedding_field
@@ -107,7 +259,8 @@ class InMemoryDocumentStore(BaseDocumentStore):
                              documents]
         documents_objects = self._drop_duplicate_documents(documents=documents_objects)
         for document in documents_objects:
-            if document.id in self.indexes[index]:
+            previous = self.indexes[index].get(document.id)
+            if previous is not None:
                 if duplicate_documents == "fail":
                     raise DuplicateDocumentError(f"Document with id '{document.id} already "
                                                  f"exists in index '{index}'")
@@ -116,6 +269,11 @@ class InMemoryDocumentStore(BaseDocumentStore):
                                    f"'{index}'")
                     continue
             self.indexes[index][document.id] = document
+            self.meta_indexes[index].add(document, previous=previous)
+            if document.embedding is not None:
+                self.embedding_matrices[index].set(document.id, document.embedding)
+            else:
+                self.embedding_matrices[index].remove(document.id)
 
     def _create_document_field_map(self):
         return {
@@ -163,10 +321,14 @@ class InMemoryDocumentStore(BaseDocumentStore):
 
     def get_documents_by_id(self, ids: List[str], index: Optional[str] = None) -> List[Document]:  # type: ignore
         """
-        Fetch documents by specifying a list of text id strings.
+        Fetch documents by specifying a list of text id strings. Unknown ids are skipped, like in the other
+        document stores. The documents are copies (including their embeddings), changing them doesn't change the
+        stored documents.
         """
         index = index or self.index
-        documents = [self.indexes[index][id] for id in ids]
+        documents = [
+            self._copy_document(self.indexes[index][id], return_embedding=True) for id in ids if id in self.indexes[index]
+        ]
         return documents
         
     def query_by_embedding(self,
@@ -190,34 +352,96 @@ class InMemoryDocumentStore(BaseDocumentStore):
         if headers:
             raise NotImplementedError("InMemoryDocumentStore does not support headers.")
         
+        if query_emb is None:
+            return []
+
+        return self.query_by_embedding_batch(query_embs=np.asarray(query_emb).reshape(1, -1), filters=filters,
+                                             top_k=top_k, index=index, return_embedding=return_embedding)[0]
+
+    def query_by_embedding_batch(self,
+                                 query_embs: np.ndarray,
+                                 filters: Optional[Dict[str, List[str]]] = None,
+                                 top_k: int = 10,
+                                 index: Optional[str] = None,
+                                 return_embedding: Optional[bool] = None,
+                                 headers: Optional[Dict[str, str]] = None) -> List[List[Document]]:
+        """
+        Find the documents that are most similar to each of the provided query embeddings.
+        All queries are scored with a single matrix multiplication.
+
+        :param query_embs: Embeddings of the queries (e.g. gathered from DPR), one query per row.
+        :param filters: Optional filters to narrow down the search space. They apply to all queries.
+                        Example: {"name": ["some", "more"], "category": ["only_one"]}
+        :param top_k: How many documents to return per query.
+        :param index: Index name for storing the docs and metadata
+        :param return_embedding: To return document embedding
+        :return: One list of documents per query, in the same order as `query_embs`.
+        """
+        if headers:
+            raise NotImplementedError("InMemoryDocumentStore does not support headers.")
+
         index = index or self.index
         if return_embedding is None:
             return_embedding = self.return_embedding
 
-        if query_emb is None:
-            return []
+        embedding_matrix = self.embedding_matrices[index]
+        if filters:
+            candidate_ids = self.meta_indexes[index].match(filters)
+            rows = np.sort(np.array([embedding_matrix.rows[id] for id in candidate_ids if id in embedding_matrix.rows],
+                                    dtype=np.int64))
+        else:
+            rows = None
+
+        query_embs = np.asarray(query_embs).reshape(len(query_embs), -1)
+        # shape (number of candidates, number of queries)
+        score_matrix = embedding_matrix.scores(query_embs, similarity=self.similarity, rows=rows)
+
+        results = []
+        for scores in score_matrix.T:
+            top_rows = self._top_k_rows(scores, top_k)
+            scores = scores[top_rows]
+            if rows is not None:
+                top_rows = rows[top_rows]
+
+            documents = []
+            for row, score in zip(top_rows, scores):
+                doc = self.indexes[index][embedding_matrix.ids[row]]
+                new_document = self._copy_document(doc, return_embedding=return_embedding)
+                new_document.score = self.finalize_raw_score(float(score), self.similarity)
+                documents.append(new_document)
+            results.append(documents)
+
+        return results
+
+    @staticmethod
+    def _top_k_rows(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """
+        Return the positions of the `top_k` highest scores, sorted by descending score.
+        """
+        if top_k <= 0 or len(scores) == 0:
+            return np.array([], dtype=np.int64)
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
 
-        document_to_search = self.get_all_documents(index=index, filters=filters, return_embedding=True)
-        candidate_docs = []
-        for doc in document_to_search:
-            curr_meta = deepcopy(doc.meta)
-            new_document = Document(
-                id=doc.id,
-                content=doc.content,
-                meta=curr_meta,
-                embedding=doc.embedding
-            )
-            new_document.embedding = doc.embedding if return_embedding is True else None
-
-            if self.similarity == "dot_product":
-                score = np.dot(query_emb, doc.embedding)
-            elif self.similarity == "cosine":
-                # cosine similarity score = 1 - cosine distance
-                score = 1 - cosine(query_emb, doc.embedding)
-            new_document.score = self.finalize_raw_score(score, self.similarity)
-            candidate_docs.append(new_document)
-
-        return sorted(candidate_docs, key=lambda x: x.score if x.score is not None else 0.0, reverse=True)[0:top_k]
+    @staticmethod
+    def _copy_document(doc: Document, return_embedding: bool) -> Document:
+        """
+        Copy a stored document so that callers can't modify the store's content.
+        """
+        new_document = Document(
+            content=deepcopy(doc.content),
+            content_type=doc.content_type,
+            id=doc.id,
+            meta=deepcopy(doc.meta),
+            score=doc.score,
+            id_hash_keys=doc.id_hash_keys
+        )
+        if return_embedding and doc.embedding is not None:
+            new_document.embedding = doc.embedding.copy()
+        return new_document
 
     def update_embeddings(
         self,
@@ -226,6 +450,8 @@ class InMemoryDocumentStore(BaseDocumentStore):
         filters: Optional[Dict[str, List[str]]] = None,
         update_existing_embeddings: bool = True,
         batch_size: int = 10_000,
+        num_workers: int = 1,
+        threads_per_worker: Optional[int] = None,
     ):
         """
         Updates the embeddings in the the document store using the encoding model specified in the retriever.
@@ -240,6 +466,9 @@ class InMemoryDocumentStore(BaseDocumentStore):
         :param filters: Optional filters to narrow down the documents for which embeddings are to be updated.
                         Example: {"name": ["some", "more"], "category": ["only_one"]}
         :param batch_size: When working with large number of documents, batching can help reduce memory footprint.
+        :param num_workers: Number of processes to create the embeddings in. Each process loads its own copy of the
+                            retriever's encoders and gets an equal share of the documents of each batch.
+        :param threads_per_worker: Number of threads torch uses in each of these processes. None keeps the torch default.
         :return: None
         """
         if index is None:
@@ -248,17 +477,22 @@ class InMemoryDocumentStore(BaseDocumentStore):
         if not self.embedding_field:
             raise RuntimeError("Specify the arg embedding_field when initializing InMemoryDocumentStore()")
 
-        # TODO Index embeddings every X batches to avoid OOM for huge document collections
-        result = self._query(
-            index=index, filters=filters, only_documents_without_embedding=not update_existing_embeddings
-        )
-        document_count = len(result)
+        document_ids = self._get_document_ids(index=index, filters=filters,
+                                              only_documents_without_embedding=not update_existing_embeddings)
+        document_ids = self.meta_indexes[index].sort(document_ids)
+        document_count = len(document_ids)
         logger.info(f"Updating embeddings for {document_count} docs ...")
-        batched_documents = get_batches_from_generator(result, batch_size)
-        with tqdm(total=document_count, disable=not self.progress_bar, position=0, unit=" docs",
-                  desc="Updating Embedding") as progress_bar:
-            for document_batch in batched_documents:
-                embeddings = retriever.embed_documents(document_batch)  # type: ignore
+        embedding_matrix = self.embedding_matrices[index]
+        with EmbeddingWorkerPool(retriever, num_workers=num_workers, threads_per_worker=threads_per_worker) as pool, \
+                tqdm(total=document_count, disable=not self.progress_bar, position=0, unit=" docs",
+                     desc="Updating Embedding") as progress_bar:
+            for batch_start in range(0, document_count, batch_size):
+                # only the current batch is copied, the embeddings are written straight into the stored documents
+                document_batch = [
+                    self._copy_document(self.indexes[index][id], return_embedding=False)
+                    for id in document_ids[batch_start: batch_start + batch_size]
+                ]
+                embeddings = pool.embed_documents(document_batch)
                 assert len(document_batch) == len(embeddings)
 
                 if embeddings[0].shape[0] != self.embedding_dim:
@@ -268,8 +502,9 @@ class InMemoryDocumentStore(BaseDocumentStore):
 
                 for doc, emb in zip(document_batch, embeddings):
                     self.indexes[index][doc.id].embedding = emb
+                    embedding_matrix.set(doc.id, emb)
                 progress_bar.set_description_str("Documents Processed")
-                progress_bar.update(batch_size)
+                progress_bar.update(len(document_batch))
 
     def get_document_count(self, filters: Optional[Dict[str, List[str]]] = None, index: Optional[str] = None, only_documents_without_embedding: bool = False, headers: Optional[Dict[str, str]] = None) -> int:
         """
@@ -278,16 +513,20 @@ class InMemoryDocumentStore(BaseDocumentStore):
         if headers:
             raise NotImplementedError("InMemoryDocumentStore does not support headers.")
         
-        documents = self._query(index=index, filters=filters, only_documents_without_embedding=only_documents_without_embedding)
-        return len(documents)
+        index = index or self.index
+        document_ids = self._get_document_ids(index=index, filters=filters,
+                                              only_documents_without_embedding=only_documents_without_embedding)
+        return len(document_ids)
 
     def get_embedding_count(self, filters: Optional[Dict[str, List[str]]] = None, index: Optional[str] = None) -> int:
         """
         Return the count of embeddings in the document store.
         """
-        documents = self.get_all_documents(filters=filters, index=index)
-        embedding_count = sum(doc.embedding is not None for doc in documents)
-        return embedding_count
+        index = index or self.index
+        embedding_matrix = self.embedding_matrices[index]
+        if not filters:
+            return len(embedding_matrix)
+        return sum(id in embedding_matrix.rows for id in self.meta_indexes[index].match(filters))
 
     def get_label_count(self, index: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> int:
         """
@@ -305,36 +544,32 @@ class InMemoryDocumentStore(BaseDocumentStore):
         filters: Optional[Dict[str, List[str]]] = None,
         return_embedding: Optional[bool] = None,
         only_documents_without_embedding: bool = False
-    ):
+    ) -> List[Document]:
         index = index or self.index
-        documents = deepcopy(list(self.indexes[index].values()))
-        documents = [d for d in documents if isinstance(d, Document)]
-
-        filtered_documents = []
-
         if return_embedding is None:
             return_embedding = self.return_embedding
-        if return_embedding is False:
-            for doc in documents:
-                doc.embedding = None
 
-        if only_documents_without_embedding:
-            documents = [doc for doc in documents if doc.embedding is None]
-        if filters:
-            for doc in documents:
-                is_hit = True
-                for key, values in filters.items():
-                    if doc.meta.get(key):
-                        if doc.meta[key] not in values:
-                            is_hit = False
-                    else:
-                        is_hit = False
-                if is_hit:
-                    filtered_documents.append(doc)
-        else:
-            filtered_documents = documents
+        document_ids = self._get_document_ids(index=index, filters=filters,
+                                              only_documents_without_embedding=only_documents_without_embedding)
+        if filters or only_documents_without_embedding:
+            document_ids = self.meta_indexes[index].sort(document_ids)
+        return [self._copy_document(self.indexes[index][id], return_embedding=return_embedding) for id in document_ids]
 
-        return filtered_documents
+    def _get_document_ids(
+        self,
+        index: str,
+        filters: Optional[Dict[str, List[str]]] = None,
+        only_documents_without_embedding: bool = False
+    ):
+        """
+        Resolve the ids of the matching documents through the meta index, without touching the documents themselves.
+        The ids are only in insertion order if neither filters nor `only_documents_without_embedding` are used.
+        """
+        meta_index = self.meta_indexes[index]
+        document_ids = meta_index.match(filters) if filters else meta_index.positions.keys()
+        if only_documents_without_embedding:
+            document_ids = document_ids - self.embedding_matrices[index].rows.keys()
+        return document_ids
 
     def get_all_documents(
         self,
@@ -381,12 +616,17 @@ class InMemoryDocumentStore(BaseDocumentStore):
         if headers:
             raise NotImplementedError("InMemoryDocumentStore does not support headers.")
         
-        result = self._query(
-            index=index,
-            filters=filters,
-            return_embedding=return_embedding
-        )
-        yield from result
+        index = index or self.index
+        if return_embedding is None:
+            return_embedding = self.return_embedding
+
+        document_ids = self._get_document_ids(index=index, filters=filters)
+        # snapshot of the ids, documents are copied one at a time while iterating
+        document_ids = self.meta_indexes[index].sort(document_ids) if filters else list(document_ids)
+        for id in document_ids:
+            document = self.indexes[index].get(id)
+            if document is not None:
+                yield self._copy_document(document, return_embedding=return_embedding)
 
     def get_all_labels(self, index: str = None, filters: Optional[Dict[str, List[str]]] = None, headers: Optional[Dict[str, str]] = None) -> List[Label]:
         """
@@ -453,12 +693,16 @@ class InMemoryDocumentStore(BaseDocumentStore):
         index = index or self.index
         if not filters and not ids:
             self.indexes[index] = {}
+            self.embedding_matrices[index] = _EmbeddingMatrix()
+            self.meta_indexes[index] = _MetaIndex()
             return
-        docs_to_delete = self.get_all_documents(index=index, filters=filters)
+        ids_to_delete = self._get_document_ids(index=index, filters=filters)
         if ids:
-            docs_to_delete = [doc for doc in docs_to_delete if doc.id in ids]
-        for doc in docs_to_delete:
-            del self.indexes[index][doc.id]
+            ids_to_delete = [id for id in set(ids) if id in ids_to_delete]
+        for id in list(ids_to_delete):
+            document = self.indexes[index].pop(id)
+            self.meta_indexes[index].remove(document)
+            self.embedding_matrices[index].remove(id)
 
     def delete_labels(self, index: Optional[str] = None, ids: Optional[List[str]] = None, filters: Optional[Dict[str, List[str]]] = None, headers: Optional[Dict[str, str]] = None):
         """
@@ -6,7 +6,7 @@ import numpy as np
 from uuid import uuid4
 
 try:
-    from sqlalchemy import and_, func, create_engine, Column, String, DateTime, ForeignKey, Boolean, Text, text, JSON, ForeignKeyConstraint
+    from sqlalchemy import and_, func, create_engine, Column, String, DateTime, ForeignKey, Boolean, Text, text, JSON, ForeignKeyConstraint, Integer, cast, delete, insert
     from sqlalchemy.ext.declarative import declarative_base
     from sqlalchemy.orm import relationship, sessionmaker
     from sqlalchemy.sql import case, null
@@ -179,7 +179,8 @@ class SQLDocumentStore(BaseDocumentStore):
             for row in query.all():
                 documents.append(self._convert_sql_row_to_document(row))
 
-        sorted_documents = sorted(documents, key=lambda doc: vector_ids.index(doc.meta["vector_id"]))
+        positions = {vector_id: position for position, vector_id in enumerate(vector_ids)}
+        sorted_documents = sorted(documents, key=lambda doc: positions[doc.meta["vector_id"]])
         return sorted_documents
 
     def get_all_documents(
@@ -296,6 +297,52 @@ class SQLDocumentStore(BaseDocumentStore):
             documents_map = self._get_documents_meta(documents_map)
             yield from documents_map.values()
 
+    def _get_vector_ids(self, filters: Optional[Dict[str, List[str]]] = None, index: Optional[str] = None) -> List[str]:
+        """
+        Return the vector ids of the documents that match the filters. Documents without a vector id are skipped.
+
+        :param filters: Optional filters to narrow down the documents.
+                        Example: {"name": ["some", "more"], "category": ["only_one"]}
+        :param index: Name of the index to get the vector ids from. If None, the
+                      DocumentStore's default index (self.index) will be used.
+        """
+        index = index or self.index
+        vector_ids_query = self.session.query(DocumentORM.vector_id).filter(
+            DocumentORM.index == index,
+            DocumentORM.vector_id.isnot(None)
+        )
+        if filters:
+            for key, values in filters.items():
+                vector_ids_query = vector_ids_query. \
+                    join(MetaDocumentORM, aliased=True). \
+                    filter(
+                        MetaDocumentORM.name == key,
+                        MetaDocumentORM.value.in_(values),
+                    )
+        return [row.vector_id for row in vector_ids_query]
+
+    def _get_vector_id_map(self, ids: List[str], index: Optional[str] = None, batch_size: int = 10_000) -> Dict[str, str]:
+        """
+        Return a mapping of document_id -> vector_id for the given document ids. Documents without a vector id are skipped.
+        """
+        index = index or self.index
+        vector_id_map = {}
+        for i in range(0, len(ids), batch_size):
+            query = self.session.query(DocumentORM.id, DocumentORM.vector_id).filter(
+                DocumentORM.index == index,
+                DocumentORM.id.in_(ids[i: i + batch_size]),
+                DocumentORM.vector_id.isnot(None)
+            )
+            vector_id_map.update({row.id: row.vector_id for row in query})
+        return vector_id_map
+
+    def _get_next_vector_id(self) -> int:
+        """
+        Return the smallest integer vector id that is greater than all vector ids in use, across all indexes.
+        """
+        max_vector_id = self.session.query(func.max(cast(DocumentORM.vector_id, Integer))).scalar()
+        return 0 if max_vector_id is None else int(max_vector_id) + 1
+
     def _get_documents_meta(self, documents_map):
         doc_ids = documents_map.keys()
         meta_query = self.session.query(
@@ -361,20 +408,45 @@ class SQLDocumentStore(BaseDocumentStore):
         document_objects = self._handle_duplicate_documents(documents=document_objects,
                                                             index=index,
                                                             duplicate_documents=duplicate_documents)
+        if duplicate_documents == "overwrite":
+            # the last occurrence of a document id wins, as if the documents were written one after another
+            document_objects = list({doc.id: doc for doc in document_objects}.values())
+
         for i in range(0, len(document_objects), batch_size):
+            document_rows = []
+            meta_rows = []
             for doc in document_objects[i: i + batch_size]:
                 meta_fields = doc.meta or {}
                 vector_id = meta_fields.pop("vector_id", None)
-                meta_orms = [MetaDocumentORM(name=key, value=value) for key, value in meta_fields.items()]
-                doc_orm = DocumentORM(id=doc.id, content=doc.to_dict()["content"], content_type=doc.content_type,
-                                      vector_id=vector_id, meta=meta_orms, index=index)
-                if duplicate_documents == "overwrite":
-                    # First old meta data cleaning is required
-                    self.session.query(MetaDocumentORM).filter_by(document_id=doc.id).delete()
-                    self.session.merge(doc_orm)
-                else:
-                    self.session.add(doc_orm)
+                document_rows.append({"id": doc.id, "content": doc.to_dict()["content"],
+                                      "content_type": doc.content_type, "vector_id": vector_id, "index": index})
+                meta_rows.extend({"id": str(uuid4()), "name": key, "value": value, "document_id": doc.id,
+                                  "document_index": index} for key, value in meta_fields.items())
+
             try:
+                # documents and their meta data are written with a few bulk statements per batch
+                if duplicate_documents == "overwrite":
+                    batch_ids = [row["id"] for row in document_rows]
+                    # overwritten documents are deleted and inserted again, but keep their original creation time
+                    created_at_by_id = dict(self.session.query(DocumentORM.id, DocumentORM.created_at).filter(
+                        DocumentORM.id.in_(batch_ids), DocumentORM.index == index
+                    ).all())
+                    for row in document_rows:
+                        if row["id"] in created_at_by_id:
+                            row["created_at"] = created_at_by_id[row["id"]]
+                    self.session.execute(delete(MetaDocumentORM.__table__).where(
+                        MetaDocumentORM.document_id.in_(batch_ids), MetaDocumentORM.document_index == index
+                    ))
+                    self.session.execute(delete(DocumentORM.__table__).where(
+                        DocumentORM.id.in_(batch_ids), DocumentORM.index == index
+                    ))
+                # the rows of a bulk insert need the same columns, new documents get the default creation time
+                for rows in ([row for row in document_rows if "created_at" not in row],
+                             [row for row in document_rows if "created_at" in row]):
+                    if rows:
+                        self.session.execute(insert(DocumentORM.__table__), rows)
+                if meta_rows:
+                    self.session.execute(insert(MetaDocumentORM.__table__), meta_rows)
                 self.session.commit()
             except Exception as ex:
                 logger.error(f"Transaction rollback: {ex.__cause__}")
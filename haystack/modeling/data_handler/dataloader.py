@@ -1,6 +1,14 @@
+from typing import Dict, List, Optional, Sequence
+
 from math import ceil
+import numpy as np
 import torch
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, Sampler, TensorDataset
+
+
+# suffixes of the tensors that are padded to max_seq_len; the mask tells which of their positions are padding
+_PADDING_MASK_SUFFIXES = ("attention_mask", "padding_mask")
+_PADDED_TENSOR_SUFFIXES = ("input_ids", "segment_ids") + _PADDING_MASK_SUFFIXES
 
 
 class NamedDataLoader(DataLoader):
@@ -9,7 +17,8 @@ class NamedDataLoader(DataLoader):
     the name of the tensor and the value is the tensor itself.
     """
 
-    def __init__(self, dataset, batch_size, sampler=None, tensor_names=None, num_workers=0, pin_memory=False):
+    def __init__(self, dataset, batch_size=1, sampler=None, tensor_names=None, num_workers=0, pin_memory=False,
+                 batch_sampler=None):
         """
         :param dataset: The dataset that will be wrapped by this NamedDataLoader
         :type dataset: Dataset
@@ -17,6 +26,9 @@ class NamedDataLoader(DataLoader):
         :type sampler: Sampler
         :param batch_size: The size of the batch to be returned by the NamedDataLoader
         :type batch_size: int
+        :param batch_sampler: Sampler returning the indices of a whole batch at a time, e.g. a LengthBucketBatchSampler.
+                              Mutually exclusive with `batch_size` and `sampler`.
+        :type batch_sampler: Sampler
         :param tensor_names: The names of the tensor, in the order that the dataset returns them in.
         :type tensor_names: list
         :param num_workers: number of workers to use for the DataLoader
@@ -54,14 +66,23 @@ class NamedDataLoader(DataLoader):
 
             return ret
 
-        super(NamedDataLoader, self).__init__(
-            dataset=dataset,
-            sampler=sampler,
-            batch_size=batch_size,
-            collate_fn=collate_fn,
-            pin_memory=pin_memory,
-            num_workers=num_workers,
-        )
+        if batch_sampler is not None:
+            super(NamedDataLoader, self).__init__(
+                dataset=dataset,
+                batch_sampler=batch_sampler,
+                collate_fn=collate_fn,
+                pin_memory=pin_memory,
+                num_workers=num_workers,
+            )
+        else:
+            super(NamedDataLoader, self).__init__(
+                dataset=dataset,
+                sampler=sampler,
+                batch_size=batch_size,
+                collate_fn=collate_fn,
+                pin_memory=pin_memory,
+                num_workers=num_workers,
+            )
 
     def __len__(self):
         if type(self.dataset).__name__ == "_StreamingDataSet":
@@ -88,3 +109,101 @@ def covert_dataset_to_dataloader(dataset, sampler, batch_size):
         dataset, sampler=sampler_initialized, batch_size=batch_size
     )
     return data_loader
+
+
+class LengthBucketBatchSampler(Sampler):
+    """
+    Batch sampler for inference that groups samples of similar length into the same batch, so that little compute is
+    wasted on padding once the padding is removed from each batch (see `remove_padding()`).
+    Instead of a fixed number of samples, each batch holds as many samples as fit into a budget of `max_tokens`
+    (number of samples x length of the longest sample), i.e. batches of short samples are larger.
+
+    The samples are sorted by descending length, so that the largest batch in terms of memory is the first one.
+    Use `order` to restore the original order of the predictions.
+    """
+    def __init__(self, lengths: Sequence[int], max_tokens: int, max_batch_size: Optional[int] = None):
+        """
+        :param lengths: Number of (non-padding) tokens of each sample.
+        :param max_tokens: Maximum number of tokens in a batch, counting the padding up to the longest sample.
+        :param max_batch_size: Optional maximum number of samples in a batch.
+        """
+        lengths = np.asarray(lengths)
+        # stable sort, so that samples of equal length keep their order
+        self.order = np.argsort(-lengths, kind="stable")
+        self.batches: List[List[int]] = []
+        batch: List[int] = []
+        batch_length = 0
+        for idx in self.order:
+            if batch and ((len(batch) + 1) * batch_length > max_tokens
+                          or (max_batch_size is not None and len(batch) >= max_batch_size)):
+                self.batches.append(batch)
+                batch = []
+            if not batch:
+                # the first sample of a batch is its longest one
+                batch_length = max(int(lengths[idx]), 1)
+            batch.append(int(idx))
+        if batch:
+            self.batches.append(batch)
+
+    def __iter__(self):
+        return iter(self.batches)
+
+    def __len__(self):
+        return len(self.batches)
+
+    def restore_order(self, predictions: np.ndarray) -> np.ndarray:
+        """
+        Bring predictions that were made in the order of the batches back into the order of the samples.
+
+        :param predictions: Array with the predictions of all batches along its first dimension.
+        """
+        # samples may have several predictions, e.g. one per passage
+        grouped_predictions = predictions.reshape(len(self.order), -1, *predictions.shape[1:])
+        restored = np.empty_like(grouped_predictions)
+        restored[self.order] = grouped_predictions
+        return restored.reshape(predictions.shape)
+
+
+def get_sequence_lengths(dataset: TensorDataset, tensor_names: List[str]) -> np.ndarray:
+    """
+    Return the number of non-padding tokens of each sample in the dataset (the maximum over its sequences if a sample
+    consists of several ones, e.g. a query and passages).
+    """
+    lengths = np.zeros(len(dataset), dtype=np.int64)
+    for tensor_name, tensor in zip(tensor_names, dataset.tensors):
+        if tensor_name.endswith(_PADDING_MASK_SUFFIXES):
+            mask_lengths = (tensor != 0).reshape(len(dataset), -1, tensor.shape[-1]).sum(dim=-1).max(dim=-1).values
+            lengths = np.maximum(lengths, mask_lengths.numpy())
+    return lengths
+
+
+def get_padded_length(dataset: TensorDataset, tensor_names: List[str]) -> int:
+    """
+    Return the length that the sequences of the dataset are padded to (usually max_seq_len).
+    """
+    return max(tensor.shape[-1] for tensor_name, tensor in zip(tensor_names, dataset.tensors)
+               if tensor_name.endswith(_PADDING_MASK_SUFFIXES))
+
+
+def remove_padding(batch: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+    """
+    Cut off the trailing positions of the padded tensors (input ids, segment ids, masks) that are padding in all
+    samples of the batch. Leading positions are left untouched, so the position of every token stays the same.
+
+    :param batch: Batch as returned by a NamedDataLoader.
+    :return: The batch with shortened tensors. Tensors that aren't padded are returned as they are.
+    """
+    batch = dict(batch)
+    for mask_name in [name for name in batch if name.endswith(_PADDING_MASK_SUFFIXES)]:
+        prefix = mask_name[:-len("attention_mask")] if mask_name.endswith("attention_mask") else mask_name[:-len("padding_mask")]
+        mask = batch[mask_name]
+        used_positions = torch.nonzero((mask != 0).reshape(-1, mask.shape[-1]).any(dim=0))
+        length = int(used_positions[-1]) + 1 if len(used_positions) > 0 else 1
+        if length == mask.shape[-1]:
+            continue
+        for name in list(batch):
+            tensor = batch[name]
+            if (name.startswith(prefix) and name[len(prefix):] in _PADDED_TENSOR_SUFFIXES
+                    and tensor.shape == mask.shape):
+                batch[name] = tensor[..., :length].contiguous()
+    return batch
@@ -0,0 +1,145 @@
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import logging
+import math
+import threading
+
+import torch.multiprocessing as mp
+from torch.utils.data import Dataset
+
+from haystack.modeling.data_handler.processor import Processor
+from haystack.modeling.data_handler.samples import SampleBasket
+from haystack.modeling.utils import grouper, log_ascii_workers
+
+
+logger = logging.getLogger(__name__)
+
+# processor of the current worker process, set once by _init_worker()
+_worker_processor: Optional[Processor] = None
+
+
+def _init_worker(processor: Processor):
+    global _worker_processor
+    _worker_processor = processor
+
+
+def _dataset_from_chunk(chunk: List[Tuple[int, Dict]]):
+    """
+    Convert one chunk of (index, dict) tuples into a dataset with the processor of the worker process.
+
+    The dataset's tensors are sent back to the parent process in shared memory by the reducers of
+    `torch.multiprocessing`. Sequence features that were converted to tensors are removed from the baskets,
+    so that they don't get pickled a second time as python lists.
+    """
+    assert _worker_processor is not None, "The worker process was not initialized with a processor."
+    dicts = [d[1] for d in chunk]
+    indices = [d[0] for d in chunk]
+    dataset, tensor_names, problematic_sample_ids, baskets = _worker_processor.dataset_from_dicts(
+        dicts, indices, return_baskets=True
+    )
+    if dataset is not None:
+        _remove_tensor_features(baskets, tensor_names)
+    return dataset, tensor_names, problematic_sample_ids, baskets
+
+
+def _remove_tensor_features(baskets: List[SampleBasket], tensor_names: List[str]):
+    tensor_names_set = set(tensor_names)
+    for basket in baskets:
+        for sample in basket.samples or []:
+            if not sample.features:
+                continue
+            features = sample.features if isinstance(sample.features, list) else [sample.features]
+            for feature in features:
+                for name in tensor_names_set.intersection(feature.keys()):
+                    # scalar features (e.g. passage_start_t) are still needed to format the predictions
+                    if isinstance(feature[name], (list, tuple)):
+                        del feature[name]
+
+
+class ProcessorPool:
+    """
+    A long-lived pool of processes that convert input dicts into datasets with the processor of an Inferencer.
+
+    Each worker receives the processor once when it is started instead of once per chunk of dicts. The tensors of
+    the datasets are passed back in shared memory. The pool can be used by several threads at the same time
+    (e.g. the request handlers of the REST API). Call `set_processor()` after changing the processor's settings,
+    so that the workers are restarted with the new ones.
+    """
+    def __init__(
+        self,
+        processor: Processor,
+        num_processes: Optional[int] = None,
+        chunks_per_process: int = 4,
+        max_chunksize: int = 2000,
+    ):
+        """
+        :param processor: Processor that converts the dicts into datasets.
+        :param num_processes: Number of worker processes. None uses all CPU cores minus one.
+        :param chunks_per_process: Number of chunks each worker gets if the chunksize is chosen automatically. More
+                                   chunks let the model start predicting earlier, fewer chunks have less overhead.
+        :param max_chunksize: Maximum number of dicts per chunk if the chunksize is chosen automatically.
+        """
+        if num_processes is None:
+            num_processes = mp.cpu_count() - 1 if mp.cpu_count() > 3 else mp.cpu_count()
+        self.num_processes = num_processes
+        self.chunks_per_process = chunks_per_process
+        self.max_chunksize = max_chunksize
+        self.processor = processor
+        self._lock = threading.Lock()
+        self._pool = self._start_pool()
+        logger.info(f"Got ya {num_processes} parallel workers to do inference ...")
+        log_ascii_workers(n=num_processes, logger=logger)
+
+    def _start_pool(self):
+        return mp.get_context().Pool(processes=self.num_processes, initializer=_init_worker, initargs=(self.processor,))
+
+    def calc_chunksize(self, num_dicts: int) -> int:
+        """
+        Number of dicts per chunk so that every worker gets `chunks_per_process` chunks.
+        """
+        chunksize = math.ceil(num_dicts / (self.num_processes * self.chunks_per_process))
+        return max(1, min(chunksize, self.max_chunksize))
+
+    def dataset_from_dicts(
+        self, dicts: List[Dict], chunksize: Optional[int] = None
+    ) -> Iterator[Tuple[Optional[Dataset], List[str], Set[int], List[SampleBasket]]]:
+        """
+        Convert dicts into datasets chunk by chunk, in the order of the dicts.
+
+        :param dicts: Input dicts for the processor.
+        :param chunksize: Number of dicts to put together in one chunk and feed to one process. None adapts it to
+                          the number of dicts and workers.
+        :return: iterator that yields a tuple of (dataset, tensor names, problematic sample ids, baskets) per chunk
+        """
+        if chunksize is None:
+            chunksize = self.calc_chunksize(len(dicts))
+        with self._lock:
+            if self._pool is None:
+                raise RuntimeError("The ProcessorPool was closed.")
+            return self._pool.imap(_dataset_from_chunk, grouper(iterable=dicts, n=chunksize), 1)
+
+    def set_processor(self, processor: Processor):
+        """
+        Restart the workers with a new or changed processor. Conversions that already started finish with the old
+        processor.
+        """
+        with self._lock:
+            if self._pool is None:
+                raise RuntimeError("The ProcessorPool was closed.")
+            old_pool = self._pool
+            self.processor = processor
+            self._pool = self._start_pool()
+        old_pool.close()
+
+    def close(self, join: bool = False):
+        """
+        Stop the worker processes once they finished their pending chunks.
+
+        :param join: wait for the worker processes to exit
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            if join:
+                pool.join()
@@ -2,17 +2,18 @@ from typing import List, Optional, Dict, Union, Generator, Set, Any
 
 import os
 import logging
-import multiprocessing as mp
-from functools import partial
 from tqdm import tqdm
 import torch
 from torch.utils.data.sampler import SequentialSampler
-from torch.utils.data import Dataset
+from torch.utils.data import Dataset, TensorDataset
 
-from haystack.modeling.data_handler.dataloader import NamedDataLoader
+from haystack.modeling.data_handler.dataloader import (
+    NamedDataLoader, LengthBucketBatchSampler, get_padded_length, get_sequence_lengths, remove_padding
+)
 from haystack.modeling.data_handler.processor import Processor, InferenceProcessor
+from haystack.modeling.data_handler.processor_pool import ProcessorPool
 from haystack.modeling.data_handler.samples import SampleBasket
-from haystack.modeling.utils import grouper, initialize_device_settings, set_all_seeds, calc_chunksize, log_ascii_workers
+from haystack.modeling.utils import initialize_device_settings, set_all_seeds
 from haystack.modeling.data_handler.inputs import QAInput
 from haystack.modeling.model.adaptive_model import AdaptiveModel, BaseAdaptiveModel
 from haystack.modeling.logger import MLFlowLogger
@@ -228,7 +229,8 @@ class Inferencer:
 
     def _set_multiprocessing_pool(self, num_processes: Optional[int]) -> None:
         """
-        Initialize a multiprocessing.Pool for instances of Inferencer.
+        Initialize a ProcessorPool for instances of Inferencer. Its workers keep a copy of the processor and are
+        reused by all calls of `inference_from_dicts()`, also if they are made from several threads at once.
 
         :param num_processes: the number of processes for `multiprocessing.Pool`.
                               Set to value of 1 (or 0) to disable multiprocessing.
@@ -240,20 +242,19 @@ class Inferencer:
                               done using this class. The garbage collector will not do this for you!
         :return: None
         """
-        self.process_pool = None
+        self.process_pool: Optional[ProcessorPool] = None
         if num_processes == 0 or num_processes == 1:  # disable multiprocessing
             self.process_pool = None
         else:
-            if num_processes is None:  # use all CPU cores
-                if mp.cpu_count() > 3:
-                    num_processes = mp.cpu_count() - 1
-                else:
-                    num_processes = mp.cpu_count()
-            self.process_pool = mp.Pool(processes=num_processes)
-            logger.info(
-                f"Got ya {num_processes} parallel workers to do inference ..."
-            )
-            log_ascii_workers(n=num_processes,logger=logger)
+            self.process_pool = ProcessorPool(self.processor, num_processes=num_processes)
+
+    def update_multiprocessing_pool(self):
+        """
+        Restart the workers of the multiprocessing pool, so that they use the current settings of `self.processor`.
+        Needs to be called after changing the processor (e.g. its `max_seq_len`).
+        """
+        if self.process_pool is not None:
+            self.process_pool.set_processor(self.processor)
 
     def close_multiprocessing_pool(self, join: bool = False):
         """Close the `multiprocessing.Pool` again.
@@ -265,9 +266,7 @@ class Inferencer:
         :param join: wait for the worker processes to exit
         """
         if self.process_pool is not None:
-            self.process_pool.close()
-            if join:
-                self.process_pool.join()
+            self.process_pool.close(join=join)
             self.process_pool = None
 
     def save(self, path: str):
@@ -304,8 +303,9 @@ class Inferencer:
                       One dict per sample.
         :param return_json: Whether the output should be in a json appropriate format. If False, it returns the prediction
                             object where applicable, else it returns PredObj.to_json()
-                :param multiprocessing_chunksize: number of dicts to put together in one chunk and feed to one process
-                                          (only relevant if you do multiprocessing)
+        :param multiprocessing_chunksize: number of dicts to put together in one chunk and feed to one process
+                                          (only relevant if you do multiprocessing). None adapts it to the number
+                                          of dicts and processes.
         :return: list of predictions
         """
         # whether to aggregate predictions across different samples (e.g. for QA on long texts)
@@ -321,12 +321,7 @@ class Inferencer:
             predictions: Any = self._inference_without_multiprocessing(dicts, return_json, aggregate_preds)
             return predictions
         else:  # use multiprocessing for inference
-            # Calculate values of multiprocessing_chunksize and num_processes if not supplied in the parameters.
-
-            if multiprocessing_chunksize is None:
-                _chunk_size, _ = calc_chunksize(len(dicts))
-                multiprocessing_chunksize = _chunk_size
-
+            # multiprocessing_chunksize=None lets the pool adapt the chunksize to the number of dicts
             predictions = self._inference_with_multiprocessing(
                 dicts, return_json, aggregate_preds, multiprocessing_chunksize,
             )
@@ -371,7 +366,7 @@ class Inferencer:
         return preds_all
 
     def _inference_with_multiprocessing(
-        self, dicts: Union[List[Dict], Generator[Dict, None, None]], return_json: bool, aggregate_preds: bool, multiprocessing_chunksize: int
+        self, dicts: Union[List[Dict], Generator[Dict, None, None]], return_json: bool, aggregate_preds: bool, multiprocessing_chunksize: Optional[int]
     ) -> Generator[Dict, None, None]:
         """
         Implementation of inference. This method is a generator that yields the results.
@@ -380,18 +375,14 @@ class Inferencer:
         :param return_json: Whether the output should be in a json appropriate format. If False, it returns the prediction
                             object where applicable, else it returns PredObj.to_json()
         :param aggregate_preds: whether to aggregate predictions across different samples (e.g. for QA on long texts)
-        :param multiprocessing_chunksize: number of dicts to put together in one chunk and feed to one process
+        :param multiprocessing_chunksize: number of dicts to put together in one chunk and feed to one process.
+                                          None adapts it to the number of dicts and processes.
         :return: generator object that yield predictions
         """
 
         # We group the input dicts into chunks and feed each chunk to a different process
         # in the pool, where it gets converted to a pytorch dataset
-        if self.process_pool is not None:
-            results = self.process_pool.imap(
-                partial(self._create_datasets_chunkwise, processor=self.processor),
-                grouper(iterable=dicts, n=multiprocessing_chunksize),
-                1,
-            )
+        results = self.process_pool.dataset_from_dicts(dicts, chunksize=multiprocessing_chunksize)  # type: ignore
 
         # Once a process spits out a preprocessed chunk. we feed this dataset directly to the model.
         # So we don't need to wait until all preprocessing has finished before getting first predictions.
@@ -417,16 +408,6 @@ class Inferencer:
                         pass
                 yield from predictions
 
-    @classmethod
-    def _create_datasets_chunkwise(cls, chunk, processor: Processor):
-        """Convert ONE chunk of data (i.e. dictionaries) into ONE pytorch dataset.
-        This is usually executed in one of many parallel processes.
-        The resulting datasets of the processes are merged together afterwards"""
-        dicts = [d[1] for d in chunk]
-        indices = [d[0] for d in chunk]
-        dataset, tensor_names, problematic_sample_ids, baskets = processor.dataset_from_dicts(dicts, indices, return_baskets=True)
-        return dataset, tensor_names, problematic_sample_ids, baskets
-
     def _get_predictions(self, dataset: Dataset, tensor_names: List, baskets):
         """
         Feed a preprocessed dataset to the model and get the actual predictions (forward pass + formatting).
@@ -440,13 +421,30 @@ class Inferencer:
         """
         samples = [s for b in baskets for s in b.samples]
 
-        data_loader = NamedDataLoader(
-            dataset=dataset, sampler=SequentialSampler(dataset), batch_size=self.batch_size, tensor_names=tensor_names
-        )  # type ignore
+        # samples and dataset need to be aligned to restore the order of the predictions
+        uses_length_buckets = (
+            self._uses_length_buckets() and isinstance(dataset, TensorDataset) and len(samples) == len(dataset)
+        )
+        if uses_length_buckets:
+            # Batch samples of similar length together and only pad them to the longest sample of their batch.
+            # The token budget of a batch equals a batch of batch_size samples padded to max_seq_len.
+            batch_sampler = LengthBucketBatchSampler(
+                lengths=get_sequence_lengths(dataset, tensor_names),
+                max_tokens=self.batch_size * get_padded_length(dataset, tensor_names)
+            )
+            data_loader = NamedDataLoader(dataset=dataset, batch_sampler=batch_sampler, tensor_names=tensor_names)
+        else:
+            data_loader = NamedDataLoader(
+                dataset=dataset, sampler=SequentialSampler(dataset), batch_size=self.batch_size, tensor_names=tensor_names
+            )  # type ignore
         preds_all = []
         for i, batch in enumerate(tqdm(data_loader, desc=f"Inferencing Samples", unit=" Batches", disable=self.disable_tqdm)):
+            if uses_length_buckets:
+                batch = remove_padding(batch)
+                batch_samples = [samples[sample_idx] for sample_idx in batch_sampler.batches[i]]
+            else:
+                batch_samples = samples[i * self.batch_size : (i + 1) * self.batch_size]
             batch = {key: batch[key].to(self.devices[0]) for key in batch}
-            batch_samples = samples[i * self.batch_size : (i + 1) * self.batch_size]
 
             # get logits
             with torch.no_grad():
@@ -458,8 +456,25 @@ class Inferencer:
                     return_class_probs=self.return_class_probs,
                     **batch)
                 preds_all += preds
+
+        if uses_length_buckets:
+            # restore the order of the samples
+            preds_in_order = [None] * len(preds_all)
+            for pred, sample_idx in zip(preds_all, batch_sampler.order):
+                preds_in_order[sample_idx] = pred
+            preds_all = preds_in_order
         return preds_all
 
+    def _uses_length_buckets(self) -> bool:
+        """
+        Whether to sort samples into batches of similar length and remove their padding. This is done when extracting
+        embeddings that don't depend on the amount of padding, i.e. all but the per-token vectors.
+        """
+        return (
+            self.task_type == "embeddings"
+            and getattr(getattr(self.model, "language_model", None), "extraction_strategy", None) != "per_token"
+        )
+
     def _get_predictions_and_aggregate(self, dataset: Dataset, tensor_names: List, baskets: List[SampleBasket]):
         """
         Feed a preprocessed dataset to the model and get the actual predictions (forward pass + logits_to_preds + formatted_preds).
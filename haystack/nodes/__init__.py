@@ -33,6 +33,7 @@ from haystack.nodes.retriever import (
     ElasticsearchRetriever,
     ElasticsearchFilterOnlyRetriever,
     TfidfRetriever,
+    BM25Retriever,
     Text2SparqlRetriever,
     TableTextRetriever,
 )
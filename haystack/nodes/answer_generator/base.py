@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 from haystack.schema import Document
 from haystack.nodes.base import BaseComponent
@@ -24,6 +24,21 @@ class BaseGenerator(BaseComponent):
         """
         pass
 
+    def predict_batch(self, query_doc_list: List[dict], top_k: Optional[int] = None,
+                      batch_size: Optional[int] = None) -> List[Dict]:
+        """
+        Generate the answers to several queries, each conditioned on its own documents.
+        Generators that can generate for several queries at once override this method.
+
+        :param query_doc_list: One dict per query with the keys "query" (the query string) and "docs" (the
+                               documents that the answer shall be conditioned on).
+        :param top_k: Number of returned answers per query
+        :param batch_size: Number of queries to generate answers for at once
+        :return: One dict per query, like the result of `predict()`
+        """
+        return [self.predict(query=query_docs["query"], documents=query_docs["docs"], top_k=top_k)
+                for query_docs in query_doc_list]
+
     def run(self, query: str, documents: List[Document], top_k: Optional[int] = None): # type: ignore
 
         if documents:
@@ -32,3 +47,16 @@ class BaseGenerator(BaseComponent):
             results = {"answers": []}
 
         return results, "output_1"
+
+    def _run_queries(self, runs_inputs: List[dict], run_params: dict) -> Optional[List[Tuple[Dict, str]]]:
+        """
+        Generate the answers of the queries of several pipeline runs with one call of `predict_batch()`.
+        """
+        if not all(run_inputs.keys() <= {"query", "documents"} for run_inputs in runs_inputs):
+            return None
+        with_documents = [run_inputs for run_inputs in runs_inputs if run_inputs.get("documents")]
+        query_doc_list = [{"query": run_inputs["query"], "docs": run_inputs["documents"]} for run_inputs in with_documents]
+        predictions = self.predict_batch(query_doc_list=query_doc_list, top_k=run_params.get("top_k")) if query_doc_list else []
+
+        results_by_run = {id(run_inputs): prediction for run_inputs, prediction in zip(with_documents, predictions)}
+        return [(results_by_run.get(id(run_inputs), {"answers": []}), "output_1") for run_inputs in runs_inputs]
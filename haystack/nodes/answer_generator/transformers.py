@@ -78,6 +78,8 @@ class RAGenerator(BaseGenerator):
             embed_title: bool = True,
             prefix: Optional[str] = None,
             use_gpu: bool = True,
+            batch_size: int = 8,
+            length_bucketing: bool = True,
     ):
         """
         Load a RAG model from Transformers along with passage_embedding_model.
@@ -96,6 +98,10 @@ class RAGenerator(BaseGenerator):
         :param embed_title: Embedded the title of passage while generating embedding
         :param prefix: The prefix used by the generator's tokenizer.
         :param use_gpu: Whether to use GPU. Falls back on CPU if no GPU is available.
+        :param batch_size: Number of queries to generate answers for in one call of `generate()` in `predict_batch()`.
+        :param length_bucketing: Whether to sort the queries by the length of their documents before they are batched
+                                 and pad the documents only to the longest ones of their batch. Otherwise, the documents
+                                 are padded to the maximum input length of the model.
         """
 
         # save init parameters to enable export of component config as YAML
@@ -103,6 +109,7 @@ class RAGenerator(BaseGenerator):
             model_name_or_path=model_name_or_path, model_version=model_version, retriever=retriever,
             generator_type=generator_type, top_k=top_k, max_length=max_length, min_length=min_length,
             num_beams=num_beams, embed_title=embed_title, prefix=prefix, use_gpu=use_gpu,
+            batch_size=batch_size, length_bucketing=length_bucketing,
         )
 
         self.model_name_or_path = model_name_or_path
@@ -113,6 +120,8 @@ class RAGenerator(BaseGenerator):
         self.embed_title = embed_title
         self.prefix = prefix
         self.retriever = retriever
+        self.batch_size = batch_size
+        self.length_bucketing = length_bucketing
 
         if top_k > self.num_beams:
             top_k = self.num_beams
@@ -148,13 +157,11 @@ class RAGenerator(BaseGenerator):
         return out
 
     # Copied postprocess_docs method from transformers.RagRetriever and modified
-    def _get_contextualized_inputs(self, texts: List[str], query: str, titles: Optional[List[str]] = None,
-                                   return_tensors: str = "pt"):
-
+    def _get_rag_input_strings(self, texts: List[str], query: str, titles: Optional[List[str]] = None) -> List[str]:
         titles_list = titles if self.embed_title and titles is not None else [""] * len(texts)
         prefix = self.prefix if self.prefix is not None else self.model.config.generator.prefix
 
-        rag_input_strings = [
+        return [
             self._cat_input_and_doc(
                 doc_title=titles_list[i],
                 doc_text=texts[i],
@@ -164,34 +171,35 @@ class RAGenerator(BaseGenerator):
             for i in range(len(texts))
         ]
 
+    def _encode_rag_input_strings(self, rag_input_strings: List[str], return_tensors: str = "pt"):
         contextualized_inputs = self.tokenizer.generator.batch_encode_plus(
             rag_input_strings,
             max_length=self.model.config.max_combined_length,
             return_tensors=return_tensors,
-            padding="max_length",
+            # with length bucketing the strings are padded to the longest one of the batch
+            padding="longest" if self.length_bucketing else "max_length",
             truncation=True,
         )
 
         return contextualized_inputs["input_ids"].to(self.devices[0]), \
                contextualized_inputs["attention_mask"].to(self.devices[0])
 
-    def _prepare_passage_embeddings(self, docs: List[Document], embeddings: List[numpy.ndarray]) -> torch.Tensor:
-
-        # If document missing embedding, then need embedding for all the documents
-        is_embedding_required = embeddings is None or any(embedding is None for embedding in embeddings)
-
-        if is_embedding_required:
-            if self.retriever is None:
-                raise AttributeError("_prepare_passage_embeddings need a DPR instance as self.retriever to embed document")
-
-            embeddings = self.retriever.embed_documents(docs)
-
-        embeddings_in_tensor = torch.cat(
-            [torch.from_numpy(embedding).float().unsqueeze(0) for embedding in embeddings],
-            dim=0
-        )
-
-        return embeddings_in_tensor.to(self.devices[0])
+    def _embed_missing_passages(self, docs: List[Document], embeddings: List[Optional[numpy.ndarray]]) -> List[numpy.ndarray]:
+        """
+        Use the existing `Document.embedding` of the documents and embed only the documents that are missing one,
+        each distinct document once.
+        """
+        missing_docs: Dict[str, Document] = {}
+        for doc, embedding in zip(docs, embeddings):
+            if embedding is None:
+                missing_docs.setdefault(doc.id, doc)
+        if not missing_docs:
+            return embeddings  # type: ignore
+
+        if self.retriever is None:
+            raise AttributeError("_embed_missing_passages need a DPR instance as self.retriever to embed document")
+        new_embeddings = dict(zip(missing_docs.keys(), self.retriever.embed_documents(list(missing_docs.values()))))
+        return [new_embeddings[doc.id] if embedding is None else embedding for doc, embedding in zip(docs, embeddings)]
 
     def predict(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> Dict:
         """
@@ -216,50 +224,114 @@ class RAGenerator(BaseGenerator):
         |      }}]}
         ```
         """
+        return self.predict_batch(query_doc_list=[{"query": query, "docs": documents}], top_k=top_k)[0]
+
+    def predict_batch(self, query_doc_list: List[dict], top_k: Optional[int] = None,
+                      batch_size: Optional[int] = None) -> List[Dict]:
+        """
+        Generate the answers to several queries, each conditioned on its own documents. Queries with the same number
+        of documents are passed to the model together, `batch_size` queries per call of `generate()`.
+
+        :param query_doc_list: List of dictionaries with the keys "query" (the query string) and "docs" (the
+                               documents that the answer shall be conditioned on)
+        :param top_k: Number of returned answers per query
+        :param batch_size: Number of queries to generate answers for at once. Defaults to the batch_size of the
+                           generator.
+        :return: List of dictionaries with generated answers plus additional infos, like the result of `predict()`
+        """
         torch.set_grad_enabled(False)
-        if len(documents) == 0:
+        if any(len(query_docs["docs"]) == 0 for query_docs in query_doc_list):
             raise AttributeError("generator need documents to predict the answer")
 
         top_k = top_k if top_k is not None else self.top_k
+        batch_size = batch_size if batch_size is not None else self.batch_size
 
         if top_k > self.num_beams:
             top_k = self.num_beams
             logger.warning(f'top_k value should not be greater than num_beams, hence setting it to {top_k}')
 
-        # Flatten the documents so easy to reference
-        flat_docs_dict: Dict[str, Any] = {}
-        for document in documents:
-            for k, v in document.__dict__.items():
-                if k not in flat_docs_dict:
-                    flat_docs_dict[k] = []
-                flat_docs_dict[k].append(v)
-
-        # Extract title
-        titles = [d.meta["name"] if d.meta and "name" in d.meta else "" for d in documents]
-
-        # Raw document embedding and set device of query_embedding
-        passage_embeddings = self._prepare_passage_embeddings(docs=documents, embeddings=flat_docs_dict["embedding"])
-
+        # Raw document embeddings, missing ones are embedded together for all queries
+        all_docs = [doc for query_docs in query_doc_list for doc in query_docs["docs"]]
+        all_embeddings = self._embed_missing_passages(docs=all_docs, embeddings=[doc.embedding for doc in all_docs])
+
+        # Extract titles and rag input strings
+        titles = []
+        rag_input_strings = []
+        passage_embeddings = []
+        start = 0
+        for query_docs in query_doc_list:
+            documents = query_docs["docs"]
+            query_titles = [d.meta["name"] if d.meta and "name" in d.meta else "" for d in documents]
+            titles.append(query_titles)
+            rag_input_strings.append(self._get_rag_input_strings(
+                texts=[d.content for d in documents], titles=query_titles, query=query_docs["query"]
+            ))
+            passage_embeddings.append(all_embeddings[start:start + len(documents)])
+            start += len(documents)
+
+        # Queries are generated in batches of queries with the same number of documents
+        order = list(range(len(query_doc_list)))
+        if self.length_bucketing:
+            order.sort(key=lambda i: sum(len(string) for string in rag_input_strings[i]))
+        buckets: Dict[int, List[int]] = {}
+        for i in order:
+            buckets.setdefault(len(query_doc_list[i]["docs"]), []).append(i)
+
+        generated_answers: List[List[str]] = [[] for _ in query_doc_list]
+        for n_docs, indices in buckets.items():
+            for batch_start in range(0, len(indices), batch_size):
+                batch_indices = indices[batch_start:batch_start + batch_size]
+                batch_answers = self._generate(
+                    queries=[query_doc_list[i]["query"] for i in batch_indices],
+                    rag_input_strings=[string for i in batch_indices for string in rag_input_strings[i]],
+                    passage_embeddings=[passage_embeddings[i] for i in batch_indices],
+                    n_docs=n_docs,
+                    top_k=top_k
+                )
+                for i, answers in zip(batch_indices, batch_answers):
+                    generated_answers[i] = answers
+
+        results = []
+        for query_docs, query_titles, query_answers in zip(query_doc_list, titles, generated_answers):
+            documents = query_docs["docs"]
+            answers: List[Any] = []
+            for generated_answer in query_answers:
+                answers.append(Answer(
+                    answer=generated_answer,
+                    type="generative",
+                    meta={
+                        "doc_ids": [d.id for d in documents],
+                        "doc_scores": [d.score for d in documents],
+                        "content": [d.content for d in documents],
+                        "titles": query_titles,
+                    }))
+            results.append({"query": query_docs["query"], "answers": answers})
+
+        return results
+
+    def _generate(self, queries: List[str], rag_input_strings: List[str], passage_embeddings: List[List[numpy.ndarray]],
+                  n_docs: int, top_k: int) -> List[List[str]]:
+        """
+        Generate `top_k` answers per query in one call of `generate()`. Every query has `n_docs` documents.
+        """
         # Query tokenization
         input_dict = self.tokenizer.prepare_seq2seq_batch(
-            src_texts=[query],
+            src_texts=queries,
             return_tensors="pt"
         )
         input_ids = input_dict['input_ids'].to(self.devices[0])
+        attention_mask = input_dict['attention_mask'].to(self.devices[0])
         # Query embedding
-        query_embedding = self.model.question_encoder(input_ids)[0]
+        query_embedding = self.model.question_encoder(input_ids, attention_mask=attention_mask)[0]
 
         # Prepare contextualized input_ids of documents
         # (will be transformed into contextualized inputs inside generator)
-        context_input_ids, context_attention_mask = self._get_contextualized_inputs(
-            texts=flat_docs_dict["content"],
-            titles=titles,
-            query=query
-        )
+        context_input_ids, context_attention_mask = self._encode_rag_input_strings(rag_input_strings)
 
         # Compute doc scores from docs_embedding
+        passage_embeddings_in_tensor = torch.from_numpy(numpy.array(passage_embeddings)).float().to(self.devices[0])
         doc_scores = torch.bmm(query_embedding.unsqueeze(1),
-                               passage_embeddings.unsqueeze(0).transpose(1, 2)).squeeze(1)
+                               passage_embeddings_in_tensor.transpose(1, 2)).squeeze(1)
 
         # Get generated ids from generator
         generator_ids = self.model.generate(
@@ -270,25 +342,11 @@ class RAGenerator(BaseGenerator):
             num_beams=self.num_beams,
             max_length=self.max_length,
             min_length=self.min_length,
-            n_docs=len(flat_docs_dict["content"])
+            n_docs=n_docs
         )
 
         generated_answers = self.tokenizer.batch_decode(generator_ids, skip_special_tokens=True)
-        answers: List[Any] = []
-
-        for generated_answer in generated_answers:
-            answers.append(Answer(
-                answer=generated_answer,
-                type="generative",
-                meta={
-                    "doc_ids": flat_docs_dict["id"],
-                    "doc_scores": flat_docs_dict["score"],
-                    "content": flat_docs_dict["content"],
-                    "titles": titles,
-                }))
-        result = {"query": query, "answers": answers}
-
-        return result
+        return [generated_answers[i * top_k:(i + 1) * top_k] for i in range(len(queries))]
 
 
 class Seq2SeqGenerator(BaseGenerator):
@@ -349,6 +407,8 @@ class Seq2SeqGenerator(BaseGenerator):
             min_length: int = 2,
             num_beams: int = 8,
             use_gpu: bool = True,
+            batch_size: int = 8,
+            length_bucketing: bool = True,
     ):
         """
         :param model_name_or_path: a HF model name for auto-regressive language model like GPT2, XLNet, XLM, Bart, T5 etc
@@ -362,12 +422,17 @@ class Seq2SeqGenerator(BaseGenerator):
         :param min_length: Minimum length of generated text
         :param num_beams: Number of beams for beam search. 1 means no beam search.
         :param use_gpu: Whether to use GPU or the CPU. Falls back on CPU if no GPU is available.
+        :param batch_size: Number of queries to generate answers for in one call of `generate()` in `predict_batch()`.
+        :param length_bucketing: Whether to sort the queries by the length of their model input before they are
+                                 batched, so that the inputs of a batch need little padding.
         """
 
         self.model_name_or_path = model_name_or_path
         self.max_length = max_length
         self.min_length = min_length
         self.num_beams = num_beams
+        self.batch_size = batch_size
+        self.length_bucketing = length_bucketing
 
         if top_k > self.num_beams:
             top_k = self.num_beams
@@ -408,12 +473,28 @@ class Seq2SeqGenerator(BaseGenerator):
         :param top_k: Number of returned answers
         :return: Generated answers
 
+        """
+        return self.predict_batch(query_doc_list=[{"query": query, "docs": documents}], top_k=top_k)[0]
+
+    def predict_batch(self, query_doc_list: List[dict], top_k: Optional[int] = None,
+                      batch_size: Optional[int] = None) -> List[Dict]:
+        """
+        Generate the answers to several queries, each conditioned on its own documents. The model inputs of
+        `batch_size` queries are padded to the same length and passed to the model in one call of `generate()`.
+
+        :param query_doc_list: List of dictionaries with the keys "query" (the query string) and "docs" (the
+                               documents that the answer shall be conditioned on)
+        :param top_k: Number of returned answers per query
+        :param batch_size: Number of queries to generate answers for at once. Defaults to the batch_size of the
+                           generator.
+        :return: List of dictionaries with the query and the generated answers, like the result of `predict()`
         """
         torch.set_grad_enabled(False)
-        if len(documents) == 0:
+        if any(len(query_docs["docs"]) == 0 for query_docs in query_doc_list):
             raise AttributeError("generator needs documents to predict the answer")
 
         top_k = top_k if top_k is not None else self.top_k
+        batch_size = batch_size if batch_size is not None else self.batch_size
 
         if top_k > self.num_beams:
             top_k = self.num_beams
@@ -425,14 +506,43 @@ class Seq2SeqGenerator(BaseGenerator):
                            f"Provide custom converter for {self.model_name_or_path} in Seq2SeqGenerator initialization")
 
         try:
-            query_and_docs_encoded: BatchEncoding = converter(tokenizer=self.tokenizer, query=query,
-                                                              documents=documents, top_k=top_k).to(self.devices[0])
+            encoded_inputs: List[BatchEncoding] = [
+                converter(tokenizer=self.tokenizer, query=query_docs["query"], documents=query_docs["docs"], top_k=top_k)
+                for query_docs in query_doc_list
+            ]
         except TypeError as e:
             raise TypeError(f"Language model input converter {converter} provided in Seq2SeqGenerator.__init__() does "
                             f"not have a valid __call__ method signature. The required Callable __call__ signature is: "
                             f"__call__(tokenizer: PreTrainedTokenizer, query: str, documents: List[Document], "
                             f"top_k: Optional[int] = None) -> BatchEncoding:")
 
+        order = list(range(len(query_doc_list)))
+        if self.length_bucketing:
+            order.sort(key=lambda i: encoded_inputs[i]["input_ids"].shape[-1])
+
+        generated_answers: List[List[str]] = [[] for _ in query_doc_list]
+        for batch_start in range(0, len(order), batch_size):
+            batch_indices = order[batch_start:batch_start + batch_size]
+            batch_answers = self._generate([encoded_inputs[i] for i in batch_indices], top_k=top_k)
+            for i, answers in zip(batch_indices, batch_answers):
+                generated_answers[i] = answers
+
+        return [{"query": query_docs["query"], "answers": answers}
+                for query_docs, answers in zip(query_doc_list, generated_answers)]
+
+    def _generate(self, encoded_inputs: List[BatchEncoding], top_k: int) -> List[List[str]]:
+        """
+        Generate `top_k` answers for each of the encoded model inputs in one call of `generate()`.
+        """
+        # each converter returns a batch with a single input, the inputs are padded to the longest one
+        query_and_docs_encoded = self.tokenizer.pad(
+            {
+                "input_ids": [inputs["input_ids"][0].tolist() for inputs in encoded_inputs],
+                "attention_mask": [inputs["attention_mask"][0].tolist() for inputs in encoded_inputs],
+            },
+            return_tensors="pt"
+        ).to(self.devices[0])
+
         generated_answers_encoded = self.model.generate(
             input_ids=query_and_docs_encoded["input_ids"],
             attention_mask=query_and_docs_encoded["attention_mask"],
@@ -450,7 +560,7 @@ class Seq2SeqGenerator(BaseGenerator):
             decoder_start_token_id=self.tokenizer.bos_token_id
         )
         generated_answers = self.tokenizer.batch_decode(generated_answers_encoded, skip_special_tokens=True)
-        return {"query": query, "answers": generated_answers}
+        return [generated_answers[i * top_k:(i + 1) * top_k] for i in range(len(encoded_inputs))]
 
 
 class _BartEli5Converter:
@@ -7,12 +7,16 @@ from copy import deepcopy
 from abc import abstractmethod
 import inspect
 import logging
+import sys
 
 from haystack.schema import Document, MultiLabel
 
 
 logger = logging.getLogger(__name__)
 
+# names of the parameters accepted by each run() implementation, see BaseComponent._get_run_signature_args()
+_run_signature_args_cache: Dict[Callable, frozenset] = {}
+
 
 class BaseComponent:
     """
@@ -22,6 +26,10 @@ class BaseComponent:
     subclasses: dict = {}
     pipeline_config: dict = {}
     name: Optional[str] = None
+    # Nodes receive references to their inputs, which are shared with the other nodes of the pipeline.
+    # Nodes that modify their inputs in place (e.g. add meta data to the input documents) must set this to True,
+    # so that they receive a deep copy of their inputs instead.
+    modifies_inputs: bool = False
 
     def __init_subclass__(cls, **kwargs):
         """ 
@@ -94,30 +102,97 @@ class BaseComponent:
         """
         pass
 
+    def _get_run_signature_args(self) -> frozenset:
+        """
+        Return the names of the parameters accepted by the run() method of this component.
+        The signature is only inspected once per run() implementation.
+        """
+        run_method = self.run
+        run_function = getattr(run_method, "__func__", run_method)
+        run_signature_args = _run_signature_args_cache.get(run_function)
+        if run_signature_args is None:
+            run_signature_args = frozenset(inspect.signature(run_method).parameters.keys())
+            _run_signature_args_cache[run_function] = run_signature_args
+        return run_signature_args
+
     def _dispatch_run(self, **kwargs) -> Tuple[Dict, str]:
         """
         The Pipelines call this method which in turn executes the run() method of Component.
 
         It takes care of the following:
           - inspect run() signature to validate if all necessary arguments are available
-          - pop `debug` and sets them on the instance to control debug output
+          - deep copy the inputs if the node modifies them (see `modifies_inputs`)
+          - read `debug` and sets them on the instance to control debug output
           - call run() with the corresponding arguments and gather output
           - collate `_debug` information if present
           - merge component output with the preceding output and pass it on to the subsequent Component in the Pipeline
         """
-        arguments = deepcopy(kwargs)
-        params = arguments.get("params") or {}
+        if self.modifies_inputs:
+            arguments = deepcopy(kwargs)
+        else:
+            arguments = kwargs
+        run_params = self._get_run_params(arguments.get("params") or {})
+        run_inputs = self._get_run_inputs(arguments)
+
+        output, stream = self.run(**run_inputs, **run_params)
+
+        # pass the params object of the pipeline on (not a copy or a new empty dict), the following nodes can only
+        # process the queries of Pipeline.run_batch() together if they all share the same params object
+        params = kwargs.get("params")
+        return self._collate_output(output, stream, arguments, params if params is not None else {}, run_inputs,
+                                    run_params, kwargs)
+
+    def _dispatch_run_batch(self, node_inputs: List[dict]) -> List[Tuple[Dict, str]]:
+        """
+        Like `_dispatch_run()`, but for the inputs of several runs of a pipeline at once (see `Pipeline.run_batch()`).
+
+        If all inputs share the same params and the component can process them together (see `_run_queries()`),
+        run() is replaced by one call of `_run_queries()`. Otherwise, the inputs are dispatched one by one.
+        """
+        shared_params = node_inputs[0].get("params")
+        if (
+            len(node_inputs) > 1
+            and not self.modifies_inputs
+            and all(node_input.get("params") is shared_params for node_input in node_inputs)
+        ):
+            params = shared_params or {}
+            run_params = self._get_run_params(params)
+            runs_inputs = [self._get_run_inputs(node_input) for node_input in node_inputs]
+            outputs = self._run_queries(runs_inputs, run_params)
+            if outputs is not None:
+                return [
+                    self._collate_output(output, stream, node_input, params, run_inputs, run_params, node_input)
+                    for (output, stream), node_input, run_inputs in zip(outputs, node_inputs, runs_inputs)
+                ]
+        return [self._dispatch_run(**node_input) for node_input in node_inputs]
+
+    def _run_queries(self, runs_inputs: List[dict], run_params: dict) -> Optional[List[Tuple[Dict, str]]]:
+        """
+        Process the inputs of several runs of a pipeline together (e.g. embed all queries in one batch), instead of
+        calling run() once per input. Components that support this override this method.
+
+        :param runs_inputs: The arguments of run() that are specific to each pipeline run (e.g. the query).
+        :param run_params: The arguments of run() that are shared by all pipeline runs (e.g. top_k).
+        :return: The output and outgoing edge of each run, as they would have been returned by run(). None if the
+                 inputs can't be processed together, which makes the pipeline call run() once per input.
+        """
+        return None
 
-        run_signature_args = inspect.signature(self.run).parameters.keys()
+    def _get_run_params(self, params: dict) -> Dict[str, Any]:
+        """
+        Select the params of the pipeline that are meant for this component and accepted by its run() method.
+        """
+        run_signature_args = self._get_run_signature_args()
 
         run_params: Dict[str, Any] = {}
         for key, value in params.items():
             if key == self.name:  # targeted params for this node
                 if isinstance(value, dict):
 
-                    # Extract debug attributes
+                    # Extract debug attributes (without modifying the params, they are shared with the other nodes)
                     if "debug" in value.keys():
-                        self.debug = value.pop("debug")
+                        self.debug = value["debug"]
+                        value = {_k: _v for _k, _v in value.items() if _k != "debug"}
 
                     for _k, _v in value.items():
                         if _k not in run_signature_args:
@@ -126,14 +201,16 @@ class BaseComponent:
                 run_params.update(**value)
             elif key in run_signature_args:  # global params
                 run_params[key] = value
+        return run_params
 
-        run_inputs = {}
-        for key, value in arguments.items():
-            if key in run_signature_args:
-                run_inputs[key] = value
-
-        output, stream = self.run(**run_inputs, **run_params)
+    def _get_run_inputs(self, arguments: dict) -> Dict[str, Any]:
+        run_signature_args = self._get_run_signature_args()
+        return {key: value for key, value in arguments.items() if key in run_signature_args}
 
+    def _collate_output(
+        self, output: Dict, stream: str, arguments: dict, params: dict, run_inputs: dict, run_params: dict,
+        kwargs: dict
+    ) -> Tuple[Dict, str]:
         # Collect debug information
         debug_info = {}
         if getattr(self, "debug", None):
@@ -143,13 +220,16 @@ class BaseComponent:
             # Include output
             filtered_output = {key: value for key, value in output.items() if key != "_debug"}  # Exclude _debug to avoid recursion
             debug_info["output"] = filtered_output
+            if self.modifies_inputs:
+                # size of the inputs that were deep-copied for this node, to profile the cost of copying
+                debug_info["copied_input_bytes"] = _get_size_in_bytes(kwargs)
         # Include custom debug info
         custom_debug = output.get("_debug", {})
         if custom_debug:
             debug_info["runtime"] = custom_debug
 
         # append _debug information from nodes
-        all_debug = arguments.get("_debug", {})
+        all_debug = dict(arguments.get("_debug", {}))
         if debug_info:
             all_debug[self.name] = debug_info
         if all_debug:
@@ -177,3 +257,23 @@ class BaseComponent:
                     self.pipeline_config["params"][k] = v.pipeline_config
                 elif v is not None:
                     self.pipeline_config["params"][k] = v
+
+
+def _get_size_in_bytes(obj: Any, seen: Optional[set] = None) -> int:
+    """
+    Approximate the memory used by an object and everything it references (e.g. documents and their embeddings).
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)  # includes the data of numpy arrays and pandas DataFrames
+    if isinstance(obj, dict):
+        size += sum(_get_size_in_bytes(key, seen) + _get_size_in_bytes(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_get_size_in_bytes(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += _get_size_in_bytes(vars(obj), seen)
+    return size
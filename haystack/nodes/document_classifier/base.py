@@ -14,6 +14,7 @@ logger = logging.getLogger(__name__)
 
 class BaseDocumentClassifier(BaseComponent):
     outgoing_edges = 1
+    modifies_inputs = True  # adds the classification to the meta data of the input documents
     query_count = 0
     query_time = 0
 
@@ -1,6 +1,8 @@
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 import logging
+from time import perf_counter
 
+import torch
 from transformers import pipeline
 
 from haystack.schema import Document
@@ -23,7 +25,8 @@ class TransformersDocumentClassifier(BaseDocumentClassifier):
     Classification is run on document's content field by default. If you want it to run on another field,
     set the `classification_field` to one of document's meta fields.
 
-    With this document_classifier, you can directly get predictions via predict()
+    With this document_classifier, you can directly get predictions via predict(). To classify more documents than
+    fit into memory, use predict_stream(), which classifies the documents of an iterable buffer by buffer.
     
      **Usage example at query time:**
      ```python
@@ -51,7 +54,7 @@ class TransformersDocumentClassifier(BaseDocumentClassifier):
     |    preprocessor = Preprocessor()
     |    document_store = ElasticsearchDocumentStore()
     |    document_classifier = TransformersDocumentClassifier(model_name_or_path="bhadresh-savani/distilbert-base-uncased-emotion",
-    |                                                         batch_size=16)
+    |                                                         batch_size=16, max_seq_len=256)
     |    p = Pipeline()
     |    p.add_node(component=converter, name="TextConverter", inputs=["File"])
     |    p.add_node(component=preprocessor, name="Preprocessor", inputs=["TextConverter"])
@@ -69,8 +72,9 @@ class TransformersDocumentClassifier(BaseDocumentClassifier):
         return_all_scores: bool = False,
         task: str = 'text-classification',
         labels: Optional[List[str]] = None,
-        batch_size: int = -1,
-        classification_field: str = None
+        batch_size: int = 16,
+        classification_field: str = None,
+        max_seq_len: Optional[int] = None
     ):
         """
         Load a text classification model from Transformers.
@@ -97,14 +101,17 @@ class TransformersDocumentClassifier(BaseDocumentClassifier):
         ["positive", "negative"] otherwise None. Given a LABEL, the sequence fed to the model is "<cls> sequence to
         classify <sep> This example is LABEL . <sep>" and the model predicts whether that sequence is a contradiction
         or an entailment.
-        :param batch_size: batch size to be processed at once
+        :param batch_size: Number of documents to be processed at once. Documents of similar length are put in the
+                           same batch to keep padding low. -1 processes all documents in one batch.
         :param classification_field: Name of Document's meta field to be used for classification. If left unset, Document.content is used by default.
+        :param max_seq_len: Maximum number of tokens of a document that is classified, longer documents are truncated.
+                            If left unset, the maximum sequence length of the model is used.
         """
         # save init parameters to enable export of component config as YAML
         self.set_config(
             model_name_or_path=model_name_or_path, model_version=model_version, tokenizer=tokenizer,
             use_gpu=use_gpu, return_all_scores=return_all_scores, labels=labels, task=task, batch_size=batch_size,
-            classification_field=classification_field
+            classification_field=classification_field, max_seq_len=max_seq_len
         )
         if labels and task == 'text-classification':
             logger.warning(f'Provided labels {labels} will be ignored for task text-classification. Set task to '
@@ -124,6 +131,13 @@ class TransformersDocumentClassifier(BaseDocumentClassifier):
         self.task = task
         self.batch_size = batch_size
         self.classification_field = classification_field
+        self.max_seq_len = max_seq_len
+        if max_seq_len is not None:
+            # the pipeline truncates to the model_max_length of its tokenizer
+            self.model.tokenizer.model_max_length = max_seq_len
+        # throughput counters
+        self.document_count = 0
+        self.classification_time = 0.0
 
     def predict(self, documents: List[Document]) -> List[Document]:
         """
@@ -133,20 +147,63 @@ class TransformersDocumentClassifier(BaseDocumentClassifier):
         :param documents: List of Document to classify
         :return: List of Document enriched with meta information
         """
+        for _ in self.predict_stream(documents, buffer_size=len(documents)):
+            pass
+        return documents
+
+    def predict_stream(self, documents: Iterable[Document], buffer_size: int = 10000) -> Iterator[Document]:
+        """
+        Classifies the documents of an iterable, e.g. a generator that reads documents from disk.
+
+        The documents are read into a buffer of `buffer_size` documents. The documents of a buffer are sorted by
+        length, classified in batches of `batch_size` and yielded in their original order once the whole buffer is
+        classified. The classification result is added to a document's meta field as soon as its batch is classified.
+
+        :param documents: Iterable of Document to classify
+        :param buffer_size: Maximum number of documents that are held in memory
+        :return: Iterator of Document enriched with meta information
+        """
+        buffer: List[Document] = []
+        for document in documents:
+            buffer.append(document)
+            if len(buffer) >= buffer_size:
+                self._classify_buffer(buffer)
+                yield from buffer
+                buffer = []
+        if buffer:
+            self._classify_buffer(buffer)
+            yield from buffer
+
+    def _classify_buffer(self, documents: List[Document]):
         texts = [doc.content if self.classification_field is None else doc.meta[self.classification_field] for doc in documents]
-        batches = self.get_batches(texts, batch_size=self.batch_size)
+        # sorting by length keeps the padding within a batch low
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for batch_indices in self.get_batches(order, batch_size=self.batch_size):
+            tic = perf_counter()
+            predictions = self._classify_texts([texts[i] for i in batch_indices])
+            for i, prediction in zip(batch_indices, predictions):
+                documents[i].meta["classification"] = prediction
+            self.classification_time += perf_counter() - tic
+            self.document_count += len(batch_indices)
+            logger.debug(f"Classified {self.document_count} documents "
+                         f"({self.document_count / self.classification_time:.1f} documents per second)")
+
+    def _classify_texts(self, texts: List[str]) -> List:
         if self.task == 'zero-shot-classification':
-            batched_predictions = [self.model(batch, candidate_labels=self.labels, truncation=True) for batch in batches]
-        elif self.task == 'text-classification':
-            batched_predictions = [self.model(batch, return_all_scores=self.return_all_scores, truncation=True) for batch in batches]
-        predictions = [pred for batched_prediction in batched_predictions for pred in batched_prediction]
-
-        for prediction, doc in zip(predictions, documents):
-            if self.task == 'zero-shot-classification':
+            predictions = self.model(texts, candidate_labels=self.labels, truncation=True)
+            # the pipeline returns a single prediction for a single text
+            if isinstance(predictions, dict):
+                predictions = [predictions]
+            for prediction in predictions:
                 prediction["label"] = prediction["labels"][0]
-            doc.meta["classification"] = prediction
-
-        return documents
+            return predictions
+
+        # the pipeline would run the model on one text at a time, so the batch is tokenized and run here
+        inputs = self.model.tokenizer(texts, padding=True, truncation=True, return_tensors="pt").to(self.model.device)
+        with torch.no_grad():
+            logits = self.model.model(**inputs).logits.cpu()
+        return [self.model.postprocess({"logits": logits[i:i + 1]}, return_all_scores=self.return_all_scores)
+                for i in range(len(texts))]
 
     def get_batches(self, items, batch_size):
         if batch_size == -1:
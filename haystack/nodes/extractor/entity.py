@@ -1,13 +1,21 @@
 from typing import List, Union, Dict, Optional, Tuple
 
+import logging
+from collections import OrderedDict
+
+import torch
 from transformers import AutoTokenizer, AutoModelForTokenClassification
 from transformers import pipeline
+from transformers.pipelines.token_classification import AggregationStrategy
 
 from haystack.schema import Document
 from haystack.nodes.base import BaseComponent
 from haystack.modeling.utils import initialize_device_settings
 
 
+logger = logging.getLogger(__name__)
+
+
 class EntityExtractor(BaseComponent):
     """
     This node is used to extract entities out of documents.
@@ -16,14 +24,33 @@ class EntityExtractor(BaseComponent):
     This node can be placed in a querying pipeline to perform entity extraction on retrieved documents only,
     or it can be placed in an indexing pipeline so that all documents in the document store have extracted entities.
     The entities extracted by this Node will populate Document.entities
+
+    Documents are sent through the model in padded batches. Texts longer than the model's maximum sequence length are
+    split into overlapping windows, whose entities are merged back with offsets relative to the whole text.
     """
     outgoing_edges = 1
+    modifies_inputs = True  # adds the entities to the meta data of the input documents
 
     def __init__(self,
                  model_name_or_path: str = "dslim/bert-base-NER",
-                 use_gpu: bool = True):
-
-        self.set_config(model_name_or_path=model_name_or_path)
+                 use_gpu: bool = True,
+                 batch_size: int = 16,
+                 max_seq_len: Optional[int] = None,
+                 stride: int = 32,
+                 entity_cache_size: int = 0):
+        """
+        :param model_name_or_path: Directory of a saved model or the name of a public token classification model.
+        :param use_gpu: Whether to use GPU (if available).
+        :param batch_size: Number of text windows the model receives in one batch.
+        :param max_seq_len: Maximum number of tokens of a text window. Defaults to the maximum sequence length of the
+                            model.
+        :param stride: Number of tokens by which consecutive windows of a long text overlap.
+        :param entity_cache_size: Number of documents whose entities are cached by document id, so that running the
+                                  extractor again on unchanged documents skips the model. The default ids of
+                                  documents are hashes of their content. Default: 0 (no cache).
+        """
+        self.set_config(model_name_or_path=model_name_or_path, batch_size=batch_size, max_seq_len=max_seq_len,
+                        stride=stride, entity_cache_size=entity_cache_size)
         self.devices, _ = initialize_device_settings(use_cuda=use_gpu, multi_gpu=False)
 
         tokenizer = AutoTokenizer.from_pretrained(model_name_or_path)
@@ -31,19 +58,28 @@ class EntityExtractor(BaseComponent):
         token_classifier.to(str(self.devices[0]))
         self.model = pipeline("ner", model=token_classifier, tokenizer=tokenizer, aggregation_strategy="simple",
                               device=0 if self.devices[0].type == "cuda" else -1)
+        self.batch_size = batch_size
+        self.max_seq_len = max_seq_len or tokenizer.model_max_length
+        self.stride = stride
+        self.entity_cache_size = entity_cache_size
+        self.entity_cache: Dict[str, List[dict]] = OrderedDict()
+        if not tokenizer.is_fast:
+            logger.warning(f"The tokenizer of {model_name_or_path} is not a fast tokenizer. EntityExtractor will "
+                           f"extract the entities of one text at a time, without splitting long texts into windows.")
 
     def run(self, documents: Optional[Union[List[Document], List[dict]]] = None) -> Tuple[Dict, str]:  # type: ignore
         """
         This is the method called when this node is used in a pipeline
         """
         if documents:
-            for doc in documents:
-                # In a querying pipeline, doc is a haystack.schema.Document object
-                try:
-                    doc.meta["entities"] = self.extract(doc.content)  # type: ignore
-                # In an indexing pipeline, doc is a dictionary
-                except AttributeError:
-                    doc["meta"]["entities"] = self.extract(doc["content"])  # type: ignore
+            # In a querying pipeline, doc is a haystack.schema.Document object
+            # In an indexing pipeline, doc is a dictionary
+            metas = [doc["meta"] if isinstance(doc, dict) else doc.meta for doc in documents]
+            texts = [doc["content"] if isinstance(doc, dict) else doc.content for doc in documents]
+            ids = [self._get_document_id(doc) for doc in documents] if self.entity_cache_size > 0 else None
+
+            for meta, entities in zip(metas, self.extract_batch(texts, ids=ids)):
+                meta["entities"] = entities
         output = {"documents": documents}
         return output, "output_1"
 
@@ -51,9 +87,111 @@ class EntityExtractor(BaseComponent):
         """
         This function can be called to perform entity extraction when using the node in isolation.
         """
-        entities = self.model(text)
+        return self.extract_batch([text])[0]
+
+    def extract_batch(self, texts: List[str], ids: Optional[List[str]] = None, batch_size: Optional[int] = None) -> List[List[dict]]:
+        """
+        This function can be called to perform entity extraction on several texts when using the node in isolation.
+
+        :param texts: Texts to extract the entities of.
+        :param ids: Document ids of the texts. If given and the entity cache is enabled, the entities of cached ids
+                    are taken from the cache.
+        :param batch_size: Number of text windows the model receives in one batch. Defaults to the batch_size of the
+                           extractor.
+        :return: One list of entities per text.
+        """
+        results: List[Optional[List[dict]]] = [None] * len(texts)
+        if ids is not None and self.entity_cache_size > 0:
+            for idx, doc_id in enumerate(ids):
+                if doc_id in self.entity_cache:
+                    self.entity_cache.move_to_end(doc_id)  # type: ignore
+                    results[idx] = self._copy_entities(self.entity_cache[doc_id])
+
+        missing = [idx for idx, entities in enumerate(results) if entities is None]
+        if missing:
+            if self.model.tokenizer.is_fast:
+                extracted = self._extract_windows([texts[idx] for idx in missing], batch_size or self.batch_size)
+            else:
+                extracted = [self.model(texts[idx]) for idx in missing]
+            for idx, entities in zip(missing, extracted):
+                results[idx] = entities
+                if ids is not None and self.entity_cache_size > 0:
+                    # the returned entities end up in the documents' meta, where they may be changed
+                    self.entity_cache[ids[idx]] = self._copy_entities(entities)
+                    if len(self.entity_cache) > self.entity_cache_size:
+                        self.entity_cache.popitem(last=False)  # type: ignore
+        return results  # type: ignore
+
+    @staticmethod
+    def _copy_entities(entities: List[dict]) -> List[dict]:
+        # the values of an entity are strings and numbers, copying the dicts is enough
+        return [dict(entity) for entity in entities]
+
+    def _extract_windows(self, texts: List[str], batch_size: int) -> List[List[dict]]:
+        tokenizer = self.model.tokenizer
+        encodings = tokenizer(texts, truncation=True, max_length=self.max_seq_len, stride=self.stride,
+                              return_overflowing_tokens=True, return_offsets_mapping=True,
+                              return_special_tokens_mask=True)
+        window_text_ids = encodings["overflow_to_sample_mapping"]
+        model_input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in encodings]
+
+        window_entities: List[List[dict]] = [[] for _ in window_text_ids]
+        # sorting by length keeps the padding within a batch low
+        order = sorted(range(len(window_text_ids)), key=lambda i: len(encodings["input_ids"][i]))
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            batch = tokenizer.pad({name: [encodings[name][i] for i in batch_indices] for name in model_input_names},
+                                  return_tensors="pt")
+            with torch.no_grad():
+                logits = self.model.model(**batch.to(self.model.device))[0].cpu()
+            for batch_idx, window_idx in enumerate(batch_indices):
+                seq_len = len(encodings["input_ids"][window_idx])
+                model_outputs = {
+                    "logits": logits[batch_idx:batch_idx + 1, :seq_len],
+                    "sentence": texts[window_text_ids[window_idx]],
+                    "input_ids": torch.tensor([encodings["input_ids"][window_idx]]),
+                    "offset_mapping": torch.tensor([encodings["offset_mapping"][window_idx]]),
+                    "special_tokens_mask": torch.tensor([encodings["special_tokens_mask"][window_idx]]),
+                }
+                # same postprocessing as the "ner" pipeline created in __init__()
+                window_entities[window_idx] = self.model.postprocess(
+                    model_outputs, aggregation_strategy=AggregationStrategy.SIMPLE, ignore_labels=["O"]
+                )
+
+        # merge the entities of the windows of each text
+        entities: List[List[dict]] = [[] for _ in texts]
+        for window_idx, text_id in enumerate(window_text_ids):
+            window_start, window_end = self._get_window_boundaries(encodings, window_idx, window_text_ids)
+            entities[text_id].extend(entity for entity in window_entities[window_idx]
+                                     if window_start <= entity["start"] < window_end)
         return entities
 
+    @staticmethod
+    def _get_window_boundaries(encodings, window_idx: int, window_text_ids: List[int]) -> Tuple[float, float]:
+        """
+        Returns the range of character offsets in which the entities of a window are kept. Consecutive windows of the
+        same text overlap, the entities in an overlap are taken from the window in which they are closer to the middle.
+        """
+        def text_span(idx):
+            offsets = [offset for offset, special in zip(encodings["offset_mapping"][idx],
+                                                         encodings["special_tokens_mask"][idx]) if not special]
+            return (offsets[0][0], offsets[-1][1]) if offsets else (0, 0)
+
+        window_start: float = float("-inf")
+        window_end: float = float("inf")
+        if window_idx > 0 and window_text_ids[window_idx - 1] == window_text_ids[window_idx]:
+            window_start = (text_span(window_idx)[0] + text_span(window_idx - 1)[1]) // 2
+        if window_idx + 1 < len(window_text_ids) and window_text_ids[window_idx + 1] == window_text_ids[window_idx]:
+            window_end = (text_span(window_idx + 1)[0] + text_span(window_idx)[1]) // 2
+        return window_start, window_end
+
+    @staticmethod
+    def _get_document_id(document: Union[Document, dict]) -> str:
+        if isinstance(document, Document):
+            return document.id
+        # documents of indexing pipelines only have an id if it was set explicitly
+        return document.get("id") or Document.from_dict(document).id
+
 
 def simplify_ner_for_qa(output): 
     """
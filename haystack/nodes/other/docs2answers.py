@@ -11,6 +11,7 @@ class Docs2Answers(BaseComponent):
     This ensures that your output is in a compatible format.
     """
     outgoing_edges = 1
+    modifies_inputs = True  # adds the query to the meta data of the input documents
 
     def __init__(self):
         self.set_config()
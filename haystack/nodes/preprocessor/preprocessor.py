@@ -216,8 +216,8 @@ class PreProcessor(BasePreProcessor):
         if clean_empty_lines:
             text = re.sub(r"\n\n+", "\n\n", text)
 
-        document["content"] = text
-        return document
+        # return a new dict so that the caller's document stays untouched (see BaseComponent.modifies_inputs)
+        return {**document, "content": text}
 
     def split(
         self,
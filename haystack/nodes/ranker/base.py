@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import logging
 from abc import abstractmethod
@@ -24,6 +24,13 @@ class BaseRanker(BaseComponent):
 
     @abstractmethod
     def predict_batch(self, query_doc_list: List[dict], top_k: Optional[int] = None, batch_size: Optional[int] = None):
+        """
+        Rank the documents of several queries.
+
+        :param query_doc_list: One dict per query with the keys "query" (the query string) and "docs" (the
+                               documents to rank).
+        :return: One list of ranked documents per query, like the result of `predict()`.
+        """
         pass
 
     def run(self, query: str, documents: List[Document], top_k: Optional[int] = None):  # type: ignore
@@ -40,6 +47,24 @@ class BaseRanker(BaseComponent):
 
         return output, "output_1"
 
+    def _run_queries(self, runs_inputs: List[dict], run_params: dict) -> Optional[List[Tuple[Dict, str]]]:
+        """
+        Rank the documents of the queries of several pipeline runs with one call of `predict_batch()`.
+        """
+        if not all(run_inputs.keys() <= {"query", "documents"} for run_inputs in runs_inputs):
+            return None
+        with_documents = [run_inputs for run_inputs in runs_inputs if run_inputs.get("documents")]
+        query_doc_list = [{"query": run_inputs["query"], "docs": run_inputs["documents"]} for run_inputs in with_documents]
+        try:
+            predict_batch = self.timing(self.predict_batch, "query_time")
+            predictions = predict_batch(query_doc_list=query_doc_list, top_k=run_params.get("top_k")) if query_doc_list else []
+        except NotImplementedError:
+            return None
+        self.query_count += len(runs_inputs)
+
+        documents_by_run = {id(run_inputs): prediction for run_inputs, prediction in zip(with_documents, predictions)}
+        return [({"documents": documents_by_run.get(id(run_inputs), [])}, "output_1") for run_inputs in runs_inputs]
+
     def timing(self, fn, attr_name):
         """Wrapper method used to time functions. """
         @wraps(fn)
@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 import logging
 from pathlib import Path
 
@@ -25,6 +25,7 @@ class SentenceTransformersRanker(BaseRanker):
 
     |  With a SentenceTransformersRanker, you can:
      - directly get predictions via predict()
+     - rank the documents of several queries at once via predict_batch()
 
     Usage example:
     ...
@@ -41,7 +42,8 @@ class SentenceTransformersRanker(BaseRanker):
             model_version: Optional[str] = None,
             top_k: int = 10,
             use_gpu: bool = True,
-            devices: Optional[List[Union[int, str, torch.device]]] = None
+            devices: Optional[List[Union[int, str, torch.device]]] = None,
+            batch_size: int = 16
     ):
         """
         :param model_name_or_path: Directory of a saved model or the name of a public model e.g.
@@ -51,15 +53,18 @@ class SentenceTransformersRanker(BaseRanker):
         :param top_k: The maximum number of documents to return
         :param use_gpu: Whether to use all available GPUs or the CPU. Falls back on CPU if no GPU is available.
         :param devices: List of GPU devices to limit inference to certain GPUs and not use all available ones (e.g. ["cuda:0"]).
+        :param batch_size: Number of (query, document) pairs the model scores in one forward pass. Pairs of similar
+                           length are put in the same batch to keep padding low.
         """
 
         # save init parameters to enable export of component config as YAML
         self.set_config(
             model_name_or_path=model_name_or_path, model_version=model_version,
-            top_k=top_k,
+            top_k=top_k, batch_size=batch_size,
         )
 
         self.top_k = top_k
+        self.batch_size = batch_size
 
         if devices is not None:
             self.devices = devices
@@ -75,18 +80,33 @@ class SentenceTransformersRanker(BaseRanker):
         if len(self.devices) > 1:
             self.model = DataParallel(self.transformer_model, device_ids=self.devices)
 
-    def predict_batch(self, query_doc_list: List[dict], top_k: int = None, batch_size: int = None):
+    def predict_batch(self, query_doc_list: List[dict], top_k: int = None, batch_size: int = None) -> List[List[Document]]:
         """
         Use loaded Ranker model to, for a list of queries, rank each query's supplied list of Document.
+        The (query, document) pairs of all queries are scored together, so that they share the forward passes.
 
-        Returns list of dictionary of query and list of document sorted by (desc.) similarity with query
+        Returns one list of Document per query, sorted by (desc.) similarity with the query.
 
-        :param query_doc_list: List of dictionaries containing queries with their retrieved documents
-        :param top_k: The maximum number of answers to return for each query
-        :param batch_size: Number of samples the model receives in one batch for inference
-        :return: List of dictionaries containing query and ranked list of Document
+        :param query_doc_list: List of dictionaries with the keys "query" (the query string) and "docs" (the list of
+                               Document to be re-ranked)
+        :param top_k: The maximum number of documents to return for each query
+        :param batch_size: Number of (query, document) pairs the model receives in one batch for inference.
+                           Defaults to the batch_size of the ranker.
+        :return: List of lists of Document
         """
-        raise NotImplementedError
+        if top_k is None:
+            top_k = self.top_k
+
+        pairs = [(query_docs["query"], doc.content) for query_docs in query_doc_list for doc in query_docs["docs"]]
+        scores = self._score_pairs(pairs, batch_size=batch_size or self.batch_size)
+
+        results = []
+        start = 0
+        for query_docs in query_doc_list:
+            end = start + len(query_docs["docs"])
+            results.append(self._rank(scores[start:end], query_docs["docs"], top_k))
+            start = end
+        return results
 
     def predict(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> List[Document]:
         """
@@ -102,23 +122,37 @@ class SentenceTransformersRanker(BaseRanker):
         if top_k is None:
             top_k = self.top_k
 
-        features = self.transformer_tokenizer([query for doc in documents], [doc.content for doc in documents],
-                                              padding=True, truncation=True, return_tensors="pt").to(self.devices[0])
+        scores = self._score_pairs([(query, doc.content) for doc in documents], batch_size=self.batch_size)
+        return self._rank(scores, documents, top_k)
 
-        # SentenceTransformerRanker uses:
-        # 1. the logit as similarity score/answerable classification
-        # 2. the logits as answerable classification  (no_answer / has_answer)
-        # https://www.sbert.net/docs/pretrained-models/ce-msmarco.html#usage-with-transformers
-        with torch.no_grad():
-            similarity_scores = self.transformer_model(**features).logits
+    def _score_pairs(self, pairs: List[Tuple[str, str]], batch_size: int) -> torch.Tensor:
+        """
+        Score (query, document) pairs in batches of pairs with similar length.
+
+        :return: 1-D tensor with one similarity score per pair, in the order of the pairs
+        """
+        scores = torch.empty(len(pairs))
+        # sorting by length keeps the padding within a batch low
+        order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][0]) + len(pairs[i][1]))
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            features = self.transformer_tokenizer([pairs[i][0] for i in batch_indices],
+                                                  [pairs[i][1] for i in batch_indices],
+                                                  padding=True, truncation=True, return_tensors="pt").to(self.devices[0])
+
+            # SentenceTransformerRanker uses:
+            # 1. the logit as similarity score/answerable classification
+            # 2. the logits as answerable classification  (no_answer / has_answer)
+            # https://www.sbert.net/docs/pretrained-models/ce-msmarco.html#usage-with-transformers
+            with torch.no_grad():
+                similarity_scores = self.transformer_model(**features).logits
 
-        logits_dim = similarity_scores.shape[1]  # [batch_size, logits_dim]
-        sorted_scores_and_documents = sorted(
-            zip(similarity_scores, documents), key=lambda similarity_document_tuple:
             # assume the last element in logits represents the `has_answer` label
-            similarity_document_tuple[0][-1] if logits_dim >= 2 else similarity_document_tuple[0],
-            reverse=True)
+            scores[batch_indices] = similarity_scores[:, -1].float().cpu()
+        return scores
 
+    @staticmethod
+    def _rank(scores: torch.Tensor, documents: List[Document], top_k: int) -> List[Document]:
         # rank documents according to scores
-        sorted_documents = [doc for _, doc in sorted_scores_and_documents]
-        return sorted_documents[:top_k]
+        top_scores_indices = torch.topk(scores, k=min(top_k, len(documents))).indices
+        return [documents[i] for i in top_scores_indices.tolist()]
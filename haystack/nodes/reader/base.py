@@ -23,6 +23,13 @@ class BaseReader(BaseComponent):
 
     @abstractmethod
     def predict_batch(self, query_doc_list: List[dict], top_k: Optional[int] = None, batch_size: Optional[int] = None):
+        """
+        Find answers for several queries, each in its own list of documents.
+
+        :param query_doc_list: One dict per query with the keys "question" (the query string or a Label) and
+                               "docs" (the documents to search for the answer).
+        :return: One dict per query with the same keys as the result of `predict()`.
+        """
         pass
 
     @staticmethod
@@ -91,6 +98,41 @@ class BaseReader(BaseComponent):
 
         return results, "output_1"
 
+    def _run_queries(self, runs_inputs: List[dict], run_params: dict) -> Optional[List[Tuple[Dict, str]]]:
+        """
+        Answer the queries of several pipeline runs with one call of `predict_batch()`.
+        """
+        if run_params.get("add_isolated_node_eval"):
+            return None
+        if not all(run_inputs.keys() <= {"query", "documents"} for run_inputs in runs_inputs):
+            return None
+        with_documents = [run_inputs for run_inputs in runs_inputs if run_inputs.get("documents")]
+        query_doc_list = [
+            {"question": run_inputs["query"], "docs": run_inputs["documents"]} for run_inputs in with_documents
+        ]
+        try:
+            predict_batch = self.timing(self.predict_batch, "query_time")
+            predictions = predict_batch(query_doc_list=query_doc_list, top_k=run_params.get("top_k")) if query_doc_list else []
+        except NotImplementedError:
+            return None
+        self.query_count += len(runs_inputs)
+
+        predictions_by_run = {id(run_inputs): prediction for run_inputs, prediction in zip(with_documents, predictions)}
+        outputs = []
+        for run_inputs in runs_inputs:
+            prediction = predictions_by_run.get(id(run_inputs))
+            if prediction is None:
+                results: dict = {"answers": []}
+            else:
+                results = {key: value for key, value in prediction.items() if key != "label"}
+                # Add corresponding document_name and more meta data, if an answer contains the document_id
+                results["answers"] = [
+                    BaseReader.add_doc_meta_data_to_answer(documents=run_inputs["documents"], answer=answer)
+                    for answer in results["answers"]
+                ]
+            outputs.append((results, "output_1"))
+        return outputs
+
     def run_batch(self, query_doc_list: List[Dict], top_k: Optional[int] = None):
         """ A unoptimized implementation of running Reader queries in batch """
         self.query_count += len(query_doc_list)
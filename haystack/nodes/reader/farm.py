@@ -604,6 +604,9 @@ class FARMReader(BaseReader):
         if max_seq_len is not None:
             self.inferencer.processor.max_seq_len = max_seq_len
             self.max_seq_len = max_seq_len
+        if doc_stride is not None or max_seq_len is not None:
+            # the worker processes hold a copy of the processor
+            self.inferencer.update_multiprocessing_pool()
 
     def save(self, directory: Path):
         """
@@ -621,9 +624,11 @@ class FARMReader(BaseReader):
 
         Returns list of dictionaries containing answers sorted by (desc.) score
 
-        :param query_doc_list: List of dictionaries containing queries with their retrieved documents
+        :param query_doc_list: List of dictionaries containing queries with their retrieved documents. The query
+                               ("question") is either a string or a Label.
         :param top_k: The maximum number of answers to return for each query
-        :param batch_size: Number of samples the model receives in one batch for inference
+        :param batch_size: Number of samples the model receives in one batch for inference.
+                           None keeps the batch size of the reader.
         :return: List of dictionaries containing query and answers
         """
 
@@ -640,17 +645,19 @@ class FARMReader(BaseReader):
             query = query_with_docs["question"]
             labels.append(query)
             number_of_docs.append(len(documents))
+            query_text = query if isinstance(query, str) else query.query
 
             for doc in documents:
                 cur = QAInput(doc_text=doc.content,
-                              questions=Question(text=query.query,
+                              questions=Question(text=query_text,
                                                  uid=doc.id))
                 inputs.append(cur)
 
-        self.inferencer.batch_size = batch_size
+        if batch_size is not None:
+            self.inferencer.batch_size = batch_size
         # make predictions on all document-query pairs
         predictions = self.inferencer.inference_from_objects(
-            objects=inputs, return_json=False, multiprocessing_chunksize=10
+            objects=inputs, return_json=False, multiprocessing_chunksize=None
         )
 
         # group predictions together
@@ -664,9 +671,13 @@ class FARMReader(BaseReader):
 
         result = []
         for idx, group in enumerate(grouped_predictions):
+            cur_label = labels[idx]
+            if not group:  # no documents for this query
+                result.append({"query": cur_label if isinstance(cur_label, str) else cur_label.query,
+                               "answers": [], "label": cur_label})
+                continue
             answers, max_no_ans_gap = self._extract_answers_of_predictions(group, top_k)
             query = group[0].query
-            cur_label = labels[idx]
             result.append({
                 "query": query,
                 "no_ans_gap": max_no_ans_gap,
@@ -715,7 +726,7 @@ class FARMReader(BaseReader):
         # get answers from QA model
         # TODO: Need fix in FARM's `to_dict` function of `QAInput` class
         predictions = self.inferencer.inference_from_objects(
-            objects=inputs, return_json=False, multiprocessing_chunksize=1
+            objects=inputs, return_json=False, multiprocessing_chunksize=None
         )
         # assemble answers from all the different documents & format them.
         answers, max_no_ans_gap = self._extract_answers_of_predictions(predictions, top_k)
@@ -20,7 +20,8 @@ class TableReader(BaseReader):
     """
     Transformer-based model for extractive Question Answering on Tables with TaPas
     using the HuggingFace's transformers framework (https://github.com/huggingface/transformers).
-    With this reader, you can directly get predictions via predict()
+    With this reader, you can directly get predictions via predict() or, for several queries at once, via
+    predict_batch()
 
     Example:
     ```python
@@ -50,6 +51,7 @@ class TableReader(BaseReader):
             use_gpu: bool = True,
             top_k: int = 10,
             max_seq_len: int = 256,
+            batch_size: int = 16,
     ):
         """
         Load a TableQA model from Transformers.
@@ -70,6 +72,7 @@ class TableReader(BaseReader):
         :param max_seq_len: Max sequence length of one input table for the model. If the number of tokens of
                             query + table exceed max_seq_len, the table will be truncated by removing rows until the
                             input size fits the model.
+        :param batch_size: Number of (query, table) pairs the model receives in one batch for inference.
         """
 
         self.devices, _ = initialize_device_settings(use_cuda=use_gpu, multi_gpu=False)
@@ -81,6 +84,7 @@ class TableReader(BaseReader):
             self.tokenizer = TapasTokenizer.from_pretrained(tokenizer)
         self.top_k = top_k
         self.max_seq_len = max_seq_len
+        self.batch_size = batch_size
         self.return_no_answers = False
 
     def predict(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> Dict:
@@ -98,85 +102,144 @@ class TableReader(BaseReader):
         :param top_k: The maximum number of answers to return
         :return: Dict containing query and answers
         """
-        if top_k is None:
-            top_k = self.top_k
+        result = self.predict_batch(query_doc_list=[{"question": query, "docs": documents}], top_k=top_k)[0]
+        return {"query": result["query"], "answers": result["answers"]}
 
-        answers = []
-        for document in documents:
-            if document.content_type != "table":
-                logger.warning(f"Skipping document with id {document.id} in TableReader, as it is not of type table.")
-                continue
+    def predict_batch(self, query_doc_list: List[dict], top_k: Optional[int] = None, batch_size: Optional[int] = None):
+        """
+        Use loaded TableQA model to find answers for a list of queries in each query's supplied list of Documents
+        of content_type ``'table'``. The (query, table) pairs of all queries are run through the model in shared batches.
 
-            table: pd.DataFrame = document.content
-            # Tokenize query and current table
-            inputs = self.tokenizer(table=table,
-                                    queries=query,
-                                    max_length=self.max_seq_len,
-                                    return_tensors="pt",
-                                    truncation=True)
-            inputs.to(self.devices[0])
-            # Forward query and table through model and convert logits to predictions
-            outputs = self.model(**inputs)
-            inputs.to("cpu")
-            if self.model.config.num_aggregation_labels > 0:
-                aggregation_logits = outputs.logits_aggregation.cpu().detach()
-            else:
-                aggregation_logits = None
+        Returns list of dictionaries containing query and list of Answer objects sorted by (desc.) score.
 
-            predicted_output = self.tokenizer.convert_logits_to_predictions(
-                inputs,
-                outputs.logits.cpu().detach(),
-                aggregation_logits
-            )
-            if len(predicted_output) == 1:
-                predicted_answer_coordinates = predicted_output[0]
-            else:
-                predicted_answer_coordinates, predicted_aggregation_indices = predicted_output
+        :param query_doc_list: List of dictionaries containing queries with their retrieved documents. The query
+                               ("question") is either a string or a Label.
+        :param top_k: The maximum number of answers to return for each query
+        :param batch_size: Number of (query, table) pairs the model receives in one batch for inference.
+                           Defaults to the batch_size of the reader.
+        :return: List of dictionaries containing query and answers
+        """
+        if top_k is None:
+            top_k = self.top_k
+        if batch_size is None:
+            batch_size = self.batch_size
+
+        queries = [query_docs["question"] if isinstance(query_docs["question"], str) else query_docs["question"].query
+                   for query_docs in query_doc_list]
+        pairs = []
+        for query_idx, (query, query_docs) in enumerate(zip(queries, query_doc_list)):
+            for document in query_docs["docs"]:
+                if document.content_type != "table":
+                    logger.warning(f"Skipping document with id {document.id} in TableReader, as it is not of type table.")
+                    continue
+                pairs.append((query_idx, query, document))
+
+        answers: List[List[Answer]] = [[] for _ in query_doc_list]
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            for (query_idx, query, document), answer in zip(batch, self._answer_batch(batch)):
+                answers[query_idx].append(answer)
+
+        results = []
+        for query, query_docs, query_answers in zip(queries, query_doc_list, answers):
+            # Sort answers by score and select top-k answers
+            query_answers = sorted(query_answers, reverse=True)[:top_k]
+            results.append({"query": query, "answers": query_answers, "label": query_docs["question"]})
+        return results
 
-            # Get cell values
-            current_answer_coordinates = predicted_answer_coordinates[0]
-            current_answer_cells = []
-            for coordinate in current_answer_coordinates:
-                current_answer_cells.append(table.iat[coordinate])
+    def _answer_batch(self, batch: List[Tuple[int, str, Document]]) -> List[Answer]:
+        # Tokenize each query and table, the tokenizer can't combine several tables in one call
+        all_inputs = [
+            self.tokenizer(table=document.content,
+                           queries=query,
+                           max_length=self.max_seq_len,
+                           return_tensors="pt",
+                           truncation=True)
+            for _, query, document in batch
+        ]
+        seq_lens = [inputs.input_ids.shape[1] for inputs in all_inputs]
+        batch_inputs = self._pad_inputs(all_inputs, max(seq_lens))
+        # Forward queries and tables through model
+        with torch.no_grad():
+            outputs = self.model(**{name: tensor.to(self.devices[0]) for name, tensor in batch_inputs.items()})
+        logits = outputs.logits.cpu()
+        if self.model.config.num_aggregation_labels > 0:
+            aggregation_logits = outputs.logits_aggregation.cpu()
+        else:
+            aggregation_logits = None
 
-            # Get aggregation operator
-            if self.model.config.aggregation_labels is not None:
-                current_aggregation_operator = self.model.config.aggregation_labels[predicted_aggregation_indices[0]]
-            else:
-                current_aggregation_operator = "NONE"
-            
-            # Calculate answer score
-            current_score = self._calculate_answer_score(outputs.logits.cpu().detach(), inputs, current_answer_coordinates)
+        answers = []
+        for idx, ((_, query, document), inputs, seq_len) in enumerate(zip(batch, all_inputs, seq_lens)):
+            answers.append(self._create_answer(
+                document=document,
+                inputs=inputs,
+                logits=logits[idx:idx + 1, :seq_len],
+                aggregation_logits=aggregation_logits[idx:idx + 1] if aggregation_logits is not None else None,
+            ))
+        return answers
+
+    def _pad_inputs(self, all_inputs: List[BatchEncoding], seq_len: int) -> Dict[str, torch.Tensor]:
+        """
+        Pads the inputs of several (query, table) pairs to the same sequence length and stacks them into one batch.
+        """
+        batch_inputs = {}
+        for name in all_inputs[0].keys():
+            pad_value = self.tokenizer.pad_token_id if name == "input_ids" else 0
+            padded = []
+            for inputs in all_inputs:
+                tensor = inputs[name]
+                padding = torch.full((1, seq_len - tensor.shape[1], *tensor.shape[2:]), pad_value, dtype=tensor.dtype)
+                padded.append(torch.cat([tensor, padding], dim=1))
+            batch_inputs[name] = torch.cat(padded, dim=0)
+        return batch_inputs
+
+    def _create_answer(self, document: Document, inputs: BatchEncoding, logits: torch.Tensor,
+                       aggregation_logits: Optional[torch.Tensor]) -> Answer:
+        table: pd.DataFrame = document.content
+        # Convert logits to predictions
+        predicted_output = self.tokenizer.convert_logits_to_predictions(
+            inputs,
+            logits,
+            aggregation_logits
+        )
+        if len(predicted_output) == 1:
+            predicted_answer_coordinates = predicted_output[0]
+        else:
+            predicted_answer_coordinates, predicted_aggregation_indices = predicted_output
 
-            if current_aggregation_operator == "NONE":
-                answer_str = ", ".join(current_answer_cells)
-            else:
-                answer_str = self._aggregate_answers(current_aggregation_operator, current_answer_cells)
-
-            answer_offsets = self._calculate_answer_offsets(current_answer_coordinates, table)
-
-            answers.append(
-                Answer(
-                    answer=answer_str,
-                    type="extractive",
-                    score=current_score,
-                    context=table,
-                    offsets_in_document=answer_offsets,
-                    offsets_in_context=answer_offsets,
-                    document_id=document.id,
-                    meta={"aggregation_operator": current_aggregation_operator,
-                          "answer_cells": current_answer_cells}
-                )
-            )
+        # Get cell values
+        current_answer_coordinates = predicted_answer_coordinates[0]
+        current_answer_cells = []
+        for coordinate in current_answer_coordinates:
+            current_answer_cells.append(table.iat[coordinate])
 
-        # Sort answers by score and select top-k answers
-        answers = sorted(answers, reverse=True)
-        answers = answers[:top_k]
+        # Get aggregation operator
+        if self.model.config.aggregation_labels is not None:
+            current_aggregation_operator = self.model.config.aggregation_labels[predicted_aggregation_indices[0]]
+        else:
+            current_aggregation_operator = "NONE"
 
-        results = {"query": query,
-                   "answers": answers}
+        # Calculate answer score
+        current_score = self._calculate_answer_score(logits.clone(), inputs, current_answer_coordinates)
 
-        return results
+        if current_aggregation_operator == "NONE":
+            answer_str = ", ".join(current_answer_cells)
+        else:
+            answer_str = self._aggregate_answers(current_aggregation_operator, current_answer_cells)
+
+        answer_offsets = self._calculate_answer_offsets(current_answer_coordinates, table)
+
+        return Answer(
+            answer=answer_str,
+            type="extractive",
+            score=current_score,
+            context=table,
+            offsets_in_document=answer_offsets,
+            offsets_in_context=answer_offsets,
+            document_id=document.id,
+            meta={"aggregation_operator": current_aggregation_operator,
+                  "answer_cells": current_answer_cells}
+        )
     
     def _calculate_answer_score(self, logits: torch.Tensor, inputs: BatchEncoding,
                                 answer_coordinates: List[Tuple[int, int]]) -> float:
@@ -250,9 +313,6 @@ class TableReader(BaseReader):
             
         return answer_offsets
 
-    def predict_batch(self, query_doc_list: List[dict], top_k: Optional[int] = None, batch_size: Optional[int] = None):
-        raise NotImplementedError("Batch prediction not yet available in TableReader.")
-
 
 class RCIReader(BaseReader):
     """
@@ -282,6 +342,7 @@ class RCIReader(BaseReader):
                  use_gpu: bool = True,
                  top_k: int = 10,
                  max_seq_len: int = 256,
+                 batch_size: int = 64,
     ):
         """
         Load an RCI model from Transformers.
@@ -305,12 +366,14 @@ class RCIReader(BaseReader):
         :param max_seq_len: Max sequence length of one input table for the model. If the number of tokens of
                             query + table exceed max_seq_len, the table will be truncated by removing rows until the
                             input size fits the model.
+        :param batch_size: Number of (query, row) or (query, column) pairs the models receive in one batch for inference.
         """
         # Save init parameters to enable export of component config as YAML
         self.set_config(row_model_name_or_path=row_model_name_or_path,
                         column_model_name_or_path=column_model_name_or_path, row_model_version=row_model_version,
                         column_model_version=column_model_version, row_tokenizer=row_tokenizer,
-                        column_tokenizer=column_tokenizer, use_gpu=use_gpu, top_k=top_k, max_seq_len=max_seq_len)
+                        column_tokenizer=column_tokenizer, use_gpu=use_gpu, top_k=top_k, max_seq_len=max_seq_len,
+                        batch_size=batch_size)
 
         self.devices, _ = initialize_device_settings(use_cuda=use_gpu, multi_gpu=False)
         self.row_model = AutoModelForSequenceClassification.from_pretrained(row_model_name_or_path,
@@ -340,6 +403,7 @@ class RCIReader(BaseReader):
 
         self.top_k = top_k
         self.max_seq_len = max_seq_len
+        self.batch_size = batch_size
         self.return_no_answers = False
 
     def predict(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> Dict:
@@ -357,80 +421,112 @@ class RCIReader(BaseReader):
         :param top_k: The maximum number of answers to return
         :return: Dict containing query and answers
         """
-        if top_k is None:
-            top_k = self.top_k
+        result = self.predict_batch(query_doc_list=[{"question": query, "docs": documents}], top_k=top_k)[0]
+        return {"query": result["query"], "answers": result["answers"]}
 
-        answers = []
-        for document in documents:
-            if document.content_type != "table":
-                logger.warning(f"Skipping document with id {document.id} in RCIReader, as it is not of type table.")
-                continue
+    def predict_batch(self, query_doc_list: List[dict], top_k: Optional[int] = None, batch_size: Optional[int] = None):
+        """
+        Use loaded RCI models to find answers for a list of queries in each query's supplied list of Documents
+        of content_type ``'table'``. The rows and columns of all queries and tables are scored in shared batches.
 
-            table: pd.DataFrame = document.content
-            table = table.astype(str)
-            # Create row and column representations
-            row_reps, column_reps = self._create_row_column_representations(table)
+        Returns list of dictionaries containing query and list of Answer objects sorted by (desc.) score.
 
-            # Get row logits
-            row_inputs = self.row_tokenizer.batch_encode_plus(
-                batch_text_or_text_pairs=[(query, row_rep) for row_rep in row_reps],
-                max_length=self.max_seq_len,
-                return_tensors="pt",
-                add_special_tokens=True,
-                truncation=True,
-                padding=True
-            )
-            row_inputs.to(self.devices[0])
-            row_logits = self.row_model(**row_inputs)[0].detach().cpu().numpy()[:, 1]
+        :param query_doc_list: List of dictionaries containing queries with their retrieved documents. The query
+                               ("question") is either a string or a Label.
+        :param top_k: The maximum number of answers to return for each query
+        :param batch_size: Number of (query, row) or (query, column) pairs the models receive in one batch for
+                           inference. Defaults to the batch_size of the reader.
+        :return: List of dictionaries containing query and answers
+        """
+        if top_k is None:
+            top_k = self.top_k
+        if batch_size is None:
+            batch_size = self.batch_size
+
+        queries = [query_docs["question"] if isinstance(query_docs["question"], str) else query_docs["question"].query
+                   for query_docs in query_doc_list]
+        # (query index, document, table) of every table that is searched
+        tables: List[Tuple[int, Document, pd.DataFrame]] = []
+        row_pairs: List[Tuple[str, str]] = []
+        column_pairs: List[Tuple[str, str]] = []
+        for query_idx, (query, query_docs) in enumerate(zip(queries, query_doc_list)):
+            for document in query_docs["docs"]:
+                if document.content_type != "table":
+                    logger.warning(f"Skipping document with id {document.id} in RCIReader, as it is not of type table.")
+                    continue
+                table = document.content.astype(str)
+                # Create row and column representations
+                row_reps, column_reps = self._create_row_column_representations(table)
+                row_pairs.extend((query, row_rep) for row_rep in row_reps)
+                column_pairs.extend((query, column_rep) for column_rep in column_reps)
+                tables.append((query_idx, document, table))
+
+        # Get row and column logits
+        row_logits = self._get_logits(self.row_model, self.row_tokenizer, row_pairs, batch_size)
+        column_logits = self._get_logits(self.column_model, self.column_tokenizer, column_pairs, batch_size)
+
+        # Calculate cell scores as sum of row score and column score, keep the top_k cells of each table
+        candidates: List[List[Tuple[float, Document, pd.DataFrame, np.ndarray, int, int]]] = [[] for _ in query_doc_list]
+        row_start = column_start = 0
+        for query_idx, document, table in tables:
+            n_rows, n_columns = table.shape
+            cell_scores = np.add.outer(row_logits[row_start:row_start + n_rows],
+                                       column_logits[column_start:column_start + n_columns])
+            row_start += n_rows
+            column_start += n_columns
+            flat_scores = cell_scores.ravel()
+            k = min(top_k, flat_scores.size)
+            if k == 0:
+                continue
+            for flat_idx in np.argpartition(-flat_scores, k - 1)[:k]:
+                row_idx, col_idx = divmod(int(flat_idx), n_columns)
+                candidates[query_idx].append((float(flat_scores[flat_idx]), document, table, cell_scores,
+                                              row_idx, col_idx))
+
+        results = []
+        for query, query_docs, query_candidates in zip(queries, query_doc_list, candidates):
+            # Sort answers by score and select top-k answers
+            query_candidates = sorted(query_candidates, key=lambda candidate: candidate[0], reverse=True)[:top_k]
+            answers = [self._create_answer(*candidate) for candidate in query_candidates]
+            results.append({"query": query, "answers": answers, "label": query_docs["question"]})
+        return results
 
-            # Get column logits
-            column_inputs = self.column_tokenizer.batch_encode_plus(
-                batch_text_or_text_pairs=[(query, column_rep) for column_rep in column_reps],
+    def _get_logits(self, model, tokenizer, pairs: List[Tuple[str, str]], batch_size: int) -> np.ndarray:
+        """
+        Scores (query, row) or (query, column) pairs in batches of pairs with similar length.
+        """
+        logits = np.empty(len(pairs), dtype=np.float32)
+        # sorting by length keeps the padding within a batch low
+        order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][1]))
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            inputs = tokenizer.batch_encode_plus(
+                batch_text_or_text_pairs=[pairs[i] for i in batch_indices],
                 max_length=self.max_seq_len,
                 return_tensors="pt",
                 add_special_tokens=True,
                 truncation=True,
                 padding=True
             )
-            column_inputs.to(self.devices[0])
-            column_logits = self.column_model(**column_inputs)[0].detach().cpu().numpy()[:, 1]
-
-            # Calculate cell scores
-            current_answers: List[Answer] = []
-            cell_scores_table: List[List[float]] = []
-            for row_idx, row_score in enumerate(row_logits):
-                cell_scores_table.append([])
-                for col_idx, col_score in enumerate(column_logits):
-                    current_cell_score = float(row_score + col_score)
-                    cell_scores_table[-1].append(current_cell_score)
-
-                    answer_str = table.iloc[row_idx, col_idx]
-                    answer_offsets = self._calculate_answer_offsets(row_idx, col_idx, table)
-                    current_answers.append(
-                        Answer(
-                            answer=answer_str,
-                            type="extractive",
-                            score=current_cell_score,
-                            context=table,
-                            offsets_in_document=[answer_offsets],
-                            offsets_in_context=[answer_offsets],
-                            document_id=document.id,
-                        )
-                    )
-
+            inputs.to(self.devices[0])
+            with torch.no_grad():
+                logits[batch_indices] = model(**inputs)[0].cpu().numpy()[:, 1]
+        return logits
+
+    def _create_answer(self, score: float, document: Document, table: pd.DataFrame, cell_scores: np.ndarray,
+                       row_idx: int, col_idx: int) -> Answer:
+        answer_offsets = self._calculate_answer_offsets(row_idx, col_idx, table)
+        return Answer(
+            answer=table.iloc[row_idx, col_idx],
+            type="extractive",
+            score=score,
+            context=table,
+            offsets_in_document=[answer_offsets],
+            offsets_in_context=[answer_offsets],
+            document_id=document.id,
             # Add cell scores to Answers' meta to be able to use as heatmap
-            for answer in current_answers:
-                answer.meta = {"table_scores": cell_scores_table}
-            answers.extend(current_answers)
-
-        # Sort answers by score and select top-k answers
-        answers = sorted(answers, reverse=True)
-        answers = answers[:top_k]
-
-        results = {"query": query,
-                   "answers": answers}
-
-        return results
+            meta={"table_scores": cell_scores.tolist()},
+        )
 
     @staticmethod
     def _create_row_column_representations(table: pd.DataFrame) -> Tuple[List[str], List[str]]:
@@ -455,6 +551,3 @@ class RCIReader(BaseReader):
         answer_cell_offset = (row_idx * n_columns) + column_index
 
         return Span(start=answer_cell_offset, end=answer_cell_offset + 1)
-
-    def predict_batch(self, query_doc_list: List[dict], top_k: Optional[int] = None, batch_size: Optional[int] = None):
-        raise NotImplementedError("Batch prediction not yet available in RCIReader.")
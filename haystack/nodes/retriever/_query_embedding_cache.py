@@ -0,0 +1,142 @@
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingCache:
+    """
+    Size-bounded LRU cache for query embeddings with an optional time to live, used by the dense retrievers
+    to skip the forward pass of the query encoder for repeated queries.
+
+    Entries are keyed on the normalized query text and an identifier of the model that created the embedding,
+    so retrievers with different models can share the same on-disk cache.
+    If `path` is given, embeddings are additionally stored in a sqlite database. It survives restarts and can be
+    shared by several processes (e.g. the workers of the REST API).
+    """
+    def __init__(self, model_id: str, max_size: int = 10_000, ttl: Optional[float] = None,
+                 path: Optional[Union[str, Path]] = None):
+        """
+        :param model_id: Identifier of the model (and its settings) the cached embeddings are created with.
+        :param max_size: Maximum number of embeddings kept in memory. The least recently used ones are evicted first.
+        :param ttl: Number of seconds after which a cached embedding expires. None keeps embeddings until evicted.
+        :param path: Path of a sqlite database to store the embeddings in, in addition to the in-memory cache.
+        """
+        self.model_id = model_id
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # normalized query -> (creation time, embedding)
+        self._entries: "OrderedDict[str, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._connection = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "model_id TEXT, query TEXT, created REAL, dtype TEXT, embedding BLOB, PRIMARY KEY (model_id, query))"
+            )
+            if self.ttl is not None:
+                self._connection.execute(
+                    "DELETE FROM query_embeddings WHERE model_id = ? AND created < ?", (self.model_id, time.time() - self.ttl)
+                )
+            self._connection.commit()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(unicodedata.normalize("NFC", query).split())
+
+    def _is_expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _get(self, query: str) -> Optional[np.ndarray]:
+        entry = self._entries.get(query)
+        if entry is not None:
+            if not self._is_expired(entry[0]):
+                self._entries.move_to_end(query)
+                return entry[1]
+            del self._entries[query]
+        if self._connection is not None:
+            row = self._connection.execute(
+                "SELECT created, dtype, embedding FROM query_embeddings WHERE model_id = ? AND query = ?",
+                (self.model_id, query)
+            ).fetchone()
+            if row is not None and not self._is_expired(row[0]):
+                embedding = np.frombuffer(row[2], dtype=row[1])
+                self._put_in_memory(query, embedding, created=row[0])
+                return embedding
+        return None
+
+    def _put_in_memory(self, query: str, embedding: np.ndarray, created: float):
+        self._entries[query] = (created, embedding)
+        self._entries.move_to_end(query)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_or_embed(self, queries: List[str], embed: Callable[[List[str]], Sequence[np.ndarray]]) -> List[np.ndarray]:
+        """
+        Return the embeddings of `queries`, calling `embed` only for the queries that are not cached (once per
+        distinct query).
+
+        :param queries: The queries to embed.
+        :param embed: Function creating the embeddings of a list of queries.
+        :return: Embeddings, one per query. They are copies, so callers are free to modify them.
+        """
+        normalized_queries = [self.normalize_query(query) for query in queries]
+        embeddings: List[Optional[np.ndarray]] = []
+        missing: "OrderedDict[str, str]" = OrderedDict()
+        with self._lock:
+            for query, normalized_query in zip(queries, normalized_queries):
+                embedding = self._get(normalized_query)
+                embeddings.append(embedding)
+                if embedding is None:
+                    self.misses += 1
+                    missing.setdefault(normalized_query, query)
+                else:
+                    self.hits += 1
+
+        if missing:
+            new_embeddings = dict(zip(missing.keys(), embed(list(missing.values()))))
+            created = time.time()
+            with self._lock:
+                for normalized_query, embedding in new_embeddings.items():
+                    self._put_in_memory(normalized_query, embedding, created=created)
+                if self._connection is not None:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO query_embeddings (model_id, query, created, dtype, embedding) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [(self.model_id, normalized_query, created, embedding.dtype.str, np.ascontiguousarray(embedding).tobytes())
+                         for normalized_query, embedding in new_embeddings.items()]
+                    )
+                    self._connection.commit()
+            embeddings = [
+                new_embeddings[normalized_query] if embedding is None else embedding
+                for embedding, normalized_query in zip(embeddings, normalized_queries)
+            ]
+        return [np.array(embedding, copy=True) for embedding in embeddings]
+
+    def clear(self):
+        """
+        Remove all embeddings of this model from the cache and reset the hit and miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM query_embeddings WHERE model_id = ?", (self.model_id,))
+                self._connection.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import logging
 from abc import abstractmethod
@@ -67,6 +67,31 @@ class BaseRetriever(BaseComponent):
         """
         pass
 
+    def retrieve_batch(
+        self,
+        queries: List[str],
+        filters: dict = None,
+        top_k: Optional[int] = None,
+        index: str = None,
+        headers: Optional[Dict[str, str]] = None) -> List[List[Document]]:
+        """
+        Scan through documents in DocumentStore and return a small number documents
+        that are most relevant to each of the queries.
+        This default implementation calls `retrieve()` once per query. Retrievers that can process several
+        queries at once override it.
+
+        :param queries: The queries
+        :param filters: A dictionary where the keys specify a metadata field and the value is a list of accepted values for that field
+        :param top_k: How many documents to return per query.
+        :param index: The name of the index in the DocumentStore from which to retrieve documents
+        :param headers: Custom HTTP headers to pass to document store client if supported (e.g. {'Authorization': 'Basic YWRtaW46cm9vdA=='} for basic authentication)
+        :return: One list of documents per query, in the same order as `queries`.
+        """
+        return [
+            self.retrieve(query=query, filters=filters, top_k=top_k, index=index, headers=headers)
+            for query in queries
+        ]
+
     def timing(self, fn, attr_name):
         """Wrapper method used to time functions. """
         @wraps(fn)
@@ -121,7 +146,7 @@ class BaseRetriever(BaseComponent):
         # Extract all questions for evaluation
         filters = {"origin": [label_origin]}
 
-        timed_retrieve = self.timing(self.retrieve, "retrieve_time")
+        timed_retrieve_batch = self.timing(self.retrieve_batch, "retrieve_time")
 
         labels: List[MultiLabel] = self.document_store.get_all_labels_aggregated(index=label_index, filters=filters,
                                                                                  open_domain=open_domain,
@@ -148,11 +173,14 @@ class BaseRetriever(BaseComponent):
 
         predictions = []
 
-        # Option 1: Open-domain evaluation by checking if the answer string is in the retrieved docs
         logger.info("Performing eval queries...")
+        questions = [question for (_, question) in question_label_dict.keys()]
+        all_retrieved_docs = timed_retrieve_batch(questions, top_k=top_k, index=doc_index, headers=headers)
+
+        # Option 1: Open-domain evaluation by checking if the answer string is in the retrieved docs
         if open_domain:
-            for (_, question), gold_answers in tqdm(question_label_dict.items()):
-                retrieved_docs = timed_retrieve(question, top_k=top_k, index=doc_index, headers=headers)
+            for ((_, question), gold_answers), retrieved_docs in tqdm(zip(question_label_dict.items(), all_retrieved_docs),
+                                                                      total=len(questions)):
                 if return_preds:
                     predictions.append({"question": question, "retrieved_docs": retrieved_docs})
                 # check if correct doc in retrieved docs
@@ -173,8 +201,8 @@ class BaseRetriever(BaseComponent):
                     summed_avg_precision += current_avg_precision / relevant_docs_found
         # Option 2: Strict evaluation by document ids that are listed in the labels
         else:
-            for (_, question), gold_ids in tqdm(question_label_dict.items()):
-                retrieved_docs = timed_retrieve(question, top_k=top_k, index=doc_index, headers=headers)
+            for ((_, question), gold_ids), retrieved_docs in tqdm(zip(question_label_dict.items(), all_retrieved_docs),
+                                                                  total=len(questions)):
                 if return_preds:
                     predictions.append({"question": question, "retrieved_docs": retrieved_docs})
                 # check if correct doc in retrieved docs
@@ -254,6 +282,25 @@ class BaseRetriever(BaseComponent):
 
         return output, "output_1"
 
+    def _run_queries(self, runs_inputs: List[dict], run_params: dict) -> Optional[List[Tuple[Dict, str]]]:
+        """
+        Retrieve the documents of the queries of several pipeline runs with one call of `retrieve_batch()`.
+        """
+        if not all(run_inputs.get("root_node") == "Query" and run_inputs.get("query") for run_inputs in runs_inputs):
+            return None
+        if not {key for run_inputs in runs_inputs for key in run_inputs} <= {"root_node", "query", "documents"}:
+            return None
+        self.query_count += len(runs_inputs)
+        retrieve_batch_timed = self.timing(self.retrieve_batch, "query_time")
+        documents_per_query = retrieve_batch_timed(
+            queries=[run_inputs["query"] for run_inputs in runs_inputs],
+            filters=run_params.get("filters"),
+            top_k=run_params.get("top_k"),
+            index=run_params.get("index"),
+            headers=run_params.get("headers")
+        )
+        return [({"documents": documents}, "output_1") for documents in documents_per_query]
+
     def run_indexing(self, documents: List[dict]):
         if self.__class__.__name__ in ["DensePassageRetriever", "EmbeddingRetriever"]:
             documents = deepcopy(documents)
@@ -1,6 +1,7 @@
 from typing import List, Dict, Union, Optional
 
 import logging
+import threading
 import numpy as np
 from pathlib import Path
 from tqdm.auto import tqdm
@@ -13,6 +14,7 @@ from haystack.schema import Document
 from haystack.document_stores import BaseDocumentStore
 from haystack.nodes.retriever.base import BaseRetriever
 from haystack.nodes.retriever._embedding_encoder import _EMBEDDING_ENCODERS
+from haystack.nodes.retriever._query_embedding_cache import QueryEmbeddingCache
 from haystack.modeling.model.tokenization import Tokenizer
 from haystack.modeling.model.language_model import LanguageModel
 from haystack.modeling.model.biadaptive_model import BiAdaptiveModel
@@ -20,7 +22,9 @@ from haystack.modeling.model.triadaptive_model import TriAdaptiveModel
 from haystack.modeling.model.prediction_head import TextSimilarityHead
 from haystack.modeling.data_handler.processor import TextSimilarityProcessor, TableTextSimilarityProcessor
 from haystack.modeling.data_handler.data_silo import DataSilo
-from haystack.modeling.data_handler.dataloader import NamedDataLoader
+from haystack.modeling.data_handler.dataloader import (
+    NamedDataLoader, LengthBucketBatchSampler, get_padded_length, get_sequence_lengths, remove_padding
+)
 from haystack.modeling.model.optimization import initialize_optimizer
 from haystack.modeling.training.base import Trainer
 from haystack.modeling.utils import initialize_device_settings
@@ -54,6 +58,9 @@ class DensePassageRetriever(BaseRetriever):
                  progress_bar: bool = True,
                  devices: Optional[List[Union[int, str, torch.device]]] = None,
                  use_auth_token: Optional[Union[str,bool]] = None,
+                 query_cache_size: int = 0,
+                 query_cache_ttl: Optional[float] = None,
+                 query_cache_path: Optional[Union[str, Path]] = None,
                  ):
         """
         Init the Retriever incl. the two encoder models from a local or remote model checkpoint.
@@ -105,6 +112,12 @@ class DensePassageRetriever(BaseRetriever):
         :param use_auth_token:  API token used to download private models from Huggingface. If this parameter is set to `True`, 
                                 the local token will be used, which must be previously created via `transformer-cli login`. 
                                 Additional information can be found here https://huggingface.co/transformers/main_classes/model.html#transformers.PreTrainedModel.from_pretrained
+        :param query_cache_size: Number of query embeddings to cache in memory, so that repeated queries skip the
+                                 query encoder. Default: 0 (no caching).
+        :param query_cache_ttl: Number of seconds after which cached query embeddings expire. Default: None (never).
+        :param query_cache_path: Path of a sqlite database in which query embeddings are cached in addition to the
+                                 memory. It survives restarts and can be shared by several processes.
+                                 Only used if `query_cache_size` > 0.
         """
         # save init parameters to enable export of component config as YAML
         self.set_config(
@@ -113,7 +126,8 @@ class DensePassageRetriever(BaseRetriever):
             model_version=model_version, max_seq_len_query=max_seq_len_query, max_seq_len_passage=max_seq_len_passage,
             top_k=top_k, use_gpu=use_gpu, batch_size=batch_size, embed_title=embed_title,
             use_fast_tokenizers=use_fast_tokenizers, infer_tokenizer_classes=infer_tokenizer_classes,
-            similarity_function=similarity_function, progress_bar=progress_bar, devices=devices, use_auth_token=use_auth_token
+            similarity_function=similarity_function, progress_bar=progress_bar, devices=devices, use_auth_token=use_auth_token,
+            query_cache_size=query_cache_size, query_cache_ttl=query_cache_ttl, query_cache_path=query_cache_path
         )
 
         if devices is not None:
@@ -129,6 +143,13 @@ class DensePassageRetriever(BaseRetriever):
         self.progress_bar = progress_bar
         self.top_k = top_k
 
+        self.query_embedding_cache: Optional[QueryEmbeddingCache] = None
+        if query_cache_size > 0:
+            self.query_embedding_cache = QueryEmbeddingCache(
+                model_id=f"{type(self).__name__}:{query_embedding_model}:{model_version}:{max_seq_len_query}",
+                max_size=query_cache_size, ttl=query_cache_ttl, path=query_cache_path
+            )
+
         if document_store is None:
            logger.warning("DensePassageRetriever initialized without a document store. "
                           "This is fine if you are performing DPR training. "
@@ -194,6 +215,9 @@ class DensePassageRetriever(BaseRetriever):
         if len(self.devices) > 1:
             self.model = DataParallel(self.model, device_ids=self.devices)
 
+        # thread id -> preallocated input tensors of the query encoder, see _encode_queries()
+        self._query_input_buffers: Dict[int, Dict[str, torch.Tensor]] = {}
+
     def retrieve(self, query: str, filters: dict = None, top_k: Optional[int] = None, index: str = None, headers: Optional[Dict[str, str]] = None) -> List[Document]:
         """
         Scan through documents in DocumentStore and return a small number documents
@@ -215,6 +239,32 @@ class DensePassageRetriever(BaseRetriever):
         documents = self.document_store.query_by_embedding(query_emb=query_emb[0], top_k=top_k, filters=filters, index=index, headers=headers)
         return documents
 
+    def retrieve_batch(self, queries: List[str], filters: dict = None, top_k: Optional[int] = None, index: str = None, headers: Optional[Dict[str, str]] = None) -> List[List[Document]]:
+        """
+        Scan through documents in DocumentStore and return a small number documents
+        that are most relevant to each of the queries.
+        All queries are embedded together and searched with a single call to the DocumentStore.
+
+        :param queries: The queries
+        :param filters: A dictionary where the keys specify a metadata field and the value is a list of accepted values for that field
+        :param top_k: How many documents to return per query.
+        :param index: The name of the index in the DocumentStore from which to retrieve documents
+        :return: One list of documents per query, in the same order as `queries`.
+        """
+        if top_k is None:
+            top_k = self.top_k
+        if not self.document_store:
+            logger.error("Cannot perform retrieve_batch() since DensePassageRetriever initialized with document_store=None")
+            return [[] for _ in queries]
+        if not queries:
+            return []
+        if index is None:
+            index = self.document_store.index
+        query_embs = self.embed_queries(texts=queries)
+        documents = self.document_store.query_by_embedding_batch(query_embs=np.array(query_embs), top_k=top_k,
+                                                                 filters=filters, index=index, headers=headers)
+        return documents
+
     def _get_predictions(self, dicts):
         """
         Feed a preprocessed dataset to the model and get the actual predictions (forward pass + formatting).
@@ -236,9 +286,13 @@ class DensePassageRetriever(BaseRetriever):
             dicts, indices=[i for i in range(len(dicts))], return_baskets=True
         )
 
-        data_loader = NamedDataLoader(
-            dataset=dataset, sampler=SequentialSampler(dataset), batch_size=self.batch_size, tensor_names=tensor_names
+        # Batch texts of similar length together and only pad them to the longest text of their batch.
+        # The token budget of a batch equals a batch of batch_size texts padded to max_seq_len.
+        batch_sampler = LengthBucketBatchSampler(
+            lengths=get_sequence_lengths(dataset, tensor_names),
+            max_tokens=self.batch_size * get_padded_length(dataset, tensor_names)
         )
+        data_loader = NamedDataLoader(dataset=dataset, batch_sampler=batch_sampler, tensor_names=tensor_names)
         all_embeddings = {"query": [], "passages": []}
         self.model.eval()
 
@@ -248,10 +302,10 @@ class DensePassageRetriever(BaseRetriever):
         else:
             disable_tqdm = not self.progress_bar
 
-        with tqdm(total=len(data_loader)*self.batch_size, unit=" Docs", desc=f"Create embeddings", position=1,
+        with tqdm(total=len(dataset), unit=" Docs", desc=f"Create embeddings", position=1,
                   leave=False, disable=disable_tqdm) as progress_bar:
             for batch in data_loader:
-                batch = {key: batch[key].to(self.devices[0]) for key in batch}
+                batch = {key: tensor.to(self.devices[0]) for key, tensor in remove_padding(batch).items()}
 
                 # get logits
                 with torch.no_grad():
@@ -260,12 +314,12 @@ class DensePassageRetriever(BaseRetriever):
                         all_embeddings["query"].append(query_embeddings.cpu().numpy())
                     if passage_embeddings is not None:
                         all_embeddings["passages"].append(passage_embeddings.cpu().numpy())
-                progress_bar.update(self.batch_size)
+                progress_bar.update(len(batch[tensor_names[0]]))
 
         if all_embeddings["passages"]:
-            all_embeddings["passages"] = np.concatenate(all_embeddings["passages"])
+            all_embeddings["passages"] = batch_sampler.restore_order(np.concatenate(all_embeddings["passages"]))
         if all_embeddings["query"]:
-            all_embeddings["query"] = np.concatenate(all_embeddings["query"])
+            all_embeddings["query"] = batch_sampler.restore_order(np.concatenate(all_embeddings["query"]))
         return all_embeddings
 
     def embed_queries(self, texts: List[str]) -> List[np.ndarray]:
@@ -275,10 +329,77 @@ class DensePassageRetriever(BaseRetriever):
         :param texts: Queries to embed
         :return: Embeddings, one per input queries
         """
+        if self.query_embedding_cache is not None:
+            return self.query_embedding_cache.get_or_embed(texts, self._embed_queries)
+        return self._embed_queries(texts)
+
+    def _embed_queries(self, texts: List[str]) -> List[np.ndarray]:
+        # empty queries can't be normalized, they are handled (skipped) by the Processor
+        if all(texts):
+            return self._encode_queries(texts)
         queries = [{'query': q} for q in texts]
         result = self._get_predictions(queries)["query"]
         return result
 
+    def _encode_queries(self, texts: List[str]) -> np.ndarray:
+        """
+        Low latency path to embed queries: the queries are tokenized with a direct call to the query tokenizer and
+        fed to the query encoder in preallocated input tensors. This skips the baskets, Dataset, DataLoader and
+        progress bar of `_get_predictions()`, which dominate the time needed to embed a single short query.
+        The featurization follows `TextSimilarityProcessor._convert_queries()`, so the embeddings are expected to match
+        the ones of `_get_predictions()` (see `test_dpr_query_embedding_without_processor`).
+
+        :param texts: Queries to embed
+        :return: Embeddings of shape (len(texts), embedding_dim)
+        """
+        model = self.model.module if isinstance(self.model, DataParallel) else self.model
+        model.eval()
+        input_buffers = self._get_query_input_buffers()
+        all_embeddings = []
+        for batch_start in range(0, len(texts), self.batch_size):
+            queries = [TextSimilarityProcessor._normalize_question(q) for q in texts[batch_start:batch_start + self.batch_size]]
+            # same featurization as TextSimilarityProcessor._convert_queries()
+            query_inputs = self.query_tokenizer(
+                queries,
+                max_length=self.processor.max_seq_len_query,
+                add_special_tokens=True,
+                truncation=True,
+                padding="max_length",
+                return_token_type_ids=True,
+                return_attention_mask=True,
+                return_tensors="np",
+            )
+            batch = {}
+            for tensor_name, input_name in (("query_input_ids", "input_ids"),
+                                            ("query_segment_ids", "token_type_ids"),
+                                            ("query_attention_mask", "attention_mask")):
+                batch[tensor_name] = input_buffers[tensor_name][:len(queries)]
+                batch[tensor_name].copy_(torch.from_numpy(query_inputs[input_name]))
+
+            with torch.no_grad():
+                query_embeddings, _ = model.language_model1(**batch)
+            all_embeddings.append(query_embeddings.cpu().numpy())
+        return np.concatenate(all_embeddings)
+
+    def _get_query_input_buffers(self) -> Dict[str, torch.Tensor]:
+        # one set of buffers per thread, since retrieve() may be called from several threads at once
+        thread_id = threading.get_ident()
+        input_buffers = self._query_input_buffers.get(thread_id)
+        if input_buffers is None:
+            # drop the buffers of threads that have finished, so that they don't pile up with short-lived threads
+            # (a dict is used instead of threading.local() to keep the retriever picklable)
+            live_thread_ids = {thread.ident for thread in threading.enumerate()}
+            for buffered_thread_id in list(self._query_input_buffers):
+                if buffered_thread_id not in live_thread_ids:
+                    self._query_input_buffers.pop(buffered_thread_id, None)
+            input_buffers = {
+                tensor_name: torch.zeros((self.batch_size, self.processor.max_seq_len_query), dtype=torch.long,
+                                         device=self.devices[0])
+                for tensor_name in ("query_input_ids", "query_segment_ids", "query_attention_mask")
+            }
+            self._query_input_buffers[thread_id] = input_buffers
+        return input_buffers
+
     def embed_documents(self, docs: List[Document]) -> List[np.ndarray]:
         """
         Create embeddings for a list of documents using the passage encoder
@@ -371,6 +492,10 @@ class DensePassageRetriever(BaseRetriever):
         self.processor.train_filename = train_filename
         self.processor.dev_filename = dev_filename
         self.processor.test_filename = test_filename
+        if self.query_embedding_cache is not None:
+            logger.info("Disabling the query embedding cache since training changes the query encoder.")
+            self.query_embedding_cache = None
+
         self.processor.max_samples = max_samples
         self.processor.dev_split = dev_split
         self.processor.num_hard_negatives = num_hard_negatives
@@ -507,7 +632,10 @@ class TableTextRetriever(BaseRetriever):
                  global_loss_buffer_size: int = 150000,
                  progress_bar: bool = True,
                  devices: Optional[List[Union[int, str, torch.device]]] = None,
-                 use_auth_token: Optional[Union[str,bool]] = None
+                 use_auth_token: Optional[Union[str,bool]] = None,
+                 query_cache_size: int = 0,
+                 query_cache_ttl: Optional[float] = None,
+                 query_cache_path: Optional[Union[str, Path]] = None
                  ):
         """
         Init the Retriever incl. the two encoder models from a local or remote model checkpoint.
@@ -545,6 +673,12 @@ class TableTextRetriever(BaseRetriever):
         :param use_auth_token:  API token used to download private models from Huggingface. If this parameter is set to `True`, 
                                 the local token will be used, which must be previously created via `transformer-cli login`. 
                                 Additional information can be found here https://huggingface.co/transformers/main_classes/model.html#transformers.PreTrainedModel.from_pretrained
+        :param query_cache_size: Number of query embeddings to cache in memory, so that repeated queries skip the
+                                 query encoder. Default: 0 (no caching).
+        :param query_cache_ttl: Number of seconds after which cached query embeddings expire. Default: None (never).
+        :param query_cache_path: Path of a sqlite database in which query embeddings are cached in addition to the
+                                 memory. It survives restarts and can be shared by several processes.
+                                 Only used if `query_cache_size` > 0.
         """
         # save init parameters to enable export of component config as YAML
         self.set_config(
@@ -554,7 +688,8 @@ class TableTextRetriever(BaseRetriever):
             max_seq_len_table=max_seq_len_table, top_k=top_k, use_gpu=use_gpu, batch_size=batch_size,
             embed_meta_fields=embed_meta_fields, use_fast_tokenizers=use_fast_tokenizers,
             infer_tokenizer_classes=infer_tokenizer_classes, similarity_function=similarity_function,
-            progress_bar=progress_bar, devices=devices, use_auth_token=use_auth_token
+            progress_bar=progress_bar, devices=devices, use_auth_token=use_auth_token,
+            query_cache_size=query_cache_size, query_cache_ttl=query_cache_ttl, query_cache_path=query_cache_path
         )
 
         if devices is not None:
@@ -569,6 +704,13 @@ class TableTextRetriever(BaseRetriever):
         self.batch_size = batch_size
         self.progress_bar = progress_bar
         self.top_k = top_k
+
+        self.query_embedding_cache: Optional[QueryEmbeddingCache] = None
+        if query_cache_size > 0:
+            self.query_embedding_cache = QueryEmbeddingCache(
+                model_id=f"{type(self).__name__}:{query_embedding_model}:{model_version}:{max_seq_len_query}",
+                max_size=query_cache_size, ttl=query_cache_ttl, path=query_cache_path
+            )
         self.embed_meta_fields = embed_meta_fields
 
         if document_store is None:
@@ -666,6 +808,21 @@ class TableTextRetriever(BaseRetriever):
                                                            index=index, headers=headers)
         return documents
 
+    def retrieve_batch(self, queries: List[str], filters: dict = None, top_k: Optional[int] = None, index: str = None, headers: Optional[Dict[str, str]] = None) -> List[List[Document]]:
+        if top_k is None:
+            top_k = self.top_k
+        if not self.document_store:
+            logger.error("Cannot perform retrieve_batch() since TableTextRetriever initialized with document_store=None")
+            return [[] for _ in queries]
+        if not queries:
+            return []
+        if index is None:
+            index = self.document_store.index
+        query_embs = self.embed_queries(texts=queries)
+        documents = self.document_store.query_by_embedding_batch(query_embs=np.array(query_embs), top_k=top_k,
+                                                                 filters=filters, index=index, headers=headers)
+        return documents
+
     def _get_predictions(self, dicts: List[Dict]) -> Dict[str, List[np.ndarray]]:
         """
         Feed a preprocessed dataset to the model and get the actual predictions (forward pass + formatting).
@@ -727,9 +884,14 @@ class TableTextRetriever(BaseRetriever):
             :param texts: Queries to embed
             :return: Embeddings, one per input queries
             """
-            queries = [{'query': q} for q in texts]
-            result = self._get_predictions(queries)["query"]
-            return result
+            if self.query_embedding_cache is not None:
+                return self.query_embedding_cache.get_or_embed(texts, self._embed_queries)
+            return self._embed_queries(texts)
+
+    def _embed_queries(self, texts: List[str]) -> List[np.ndarray]:
+        queries = [{'query': q} for q in texts]
+        result = self._get_predictions(queries)["query"]
+        return result
 
     def embed_documents(self, docs: List[Document]) -> List[np.ndarray]:
         """
@@ -847,6 +1009,10 @@ class TableTextRetriever(BaseRetriever):
         self.processor.train_filename = train_filename
         self.processor.dev_filename = dev_filename
         self.processor.test_filename = test_filename
+        if self.query_embedding_cache is not None:
+            logger.info("Disabling the query embedding cache since training changes the query encoder.")
+            self.query_embedding_cache = None
+
         self.processor.max_samples = max_samples
         self.processor.dev_split = dev_split
         self.processor.num_hard_negatives = num_hard_negatives
@@ -974,7 +1140,10 @@ class EmbeddingRetriever(BaseRetriever):
         top_k: int = 10,
         progress_bar: bool = True,
         devices: Optional[List[Union[int, str, torch.device]]] = None,
-        use_auth_token: Optional[Union[str,bool]] = None
+        use_auth_token: Optional[Union[str,bool]] = None,
+        query_cache_size: int = 0,
+        query_cache_ttl: Optional[float] = None,
+        query_cache_path: Optional[Union[str, Path]] = None
     ):
         """
         :param document_store: An instance of DocumentStore from which to retrieve documents.
@@ -1004,12 +1173,19 @@ class EmbeddingRetriever(BaseRetriever):
         :param use_auth_token:  API token used to download private models from Huggingface. If this parameter is set to `True`, 
                                 the local token will be used, which must be previously created via `transformer-cli login`. 
                                 Additional information can be found here https://huggingface.co/transformers/main_classes/model.html#transformers.PreTrainedModel.from_pretrained
+        :param query_cache_size: Number of query embeddings to cache in memory, so that repeated queries skip the
+                                 query encoder. Default: 0 (no caching).
+        :param query_cache_ttl: Number of seconds after which cached query embeddings expire. Default: None (never).
+        :param query_cache_path: Path of a sqlite database in which query embeddings are cached in addition to the
+                                 memory. It survives restarts and can be shared by several processes.
+                                 Only used if `query_cache_size` > 0.
         """
         # save init parameters to enable export of component config as YAML
         self.set_config(
             document_store=document_store, embedding_model=embedding_model, model_version=model_version,
             use_gpu=use_gpu, batch_size=batch_size, max_seq_len=max_seq_len, model_format=model_format, pooling_strategy=pooling_strategy,
-            emb_extraction_layer=emb_extraction_layer, top_k=top_k,
+            emb_extraction_layer=emb_extraction_layer, top_k=top_k, query_cache_size=query_cache_size,
+            query_cache_ttl=query_cache_ttl, query_cache_path=query_cache_path
         )
 
         if devices is not None:
@@ -1033,6 +1209,14 @@ class EmbeddingRetriever(BaseRetriever):
         self.progress_bar = progress_bar
         self.use_auth_token = use_auth_token
 
+        self.query_embedding_cache: Optional[QueryEmbeddingCache] = None
+        if query_cache_size > 0:
+            self.query_embedding_cache = QueryEmbeddingCache(
+                model_id=f"{type(self).__name__}:{embedding_model}:{model_version}:{model_format}:{pooling_strategy}:"
+                         f"{emb_extraction_layer}:{max_seq_len}",
+                max_size=query_cache_size, ttl=query_cache_ttl, path=query_cache_path
+            )
+
         logger.info(f"Init retriever using embeddings of model {embedding_model}")
 
         if not model_format in _EMBEDDING_ENCODERS.keys():
@@ -1058,6 +1242,29 @@ class EmbeddingRetriever(BaseRetriever):
                                                            top_k=top_k, index=index, headers=headers)
         return documents
 
+    def retrieve_batch(self, queries: List[str], filters: dict = None, top_k: Optional[int] = None, index: str = None, headers: Optional[Dict[str, str]] = None) -> List[List[Document]]:
+        """
+        Scan through documents in DocumentStore and return a small number documents
+        that are most relevant to each of the queries.
+        All queries are embedded together and searched with a single call to the DocumentStore.
+
+        :param queries: The queries
+        :param filters: A dictionary where the keys specify a metadata field and the value is a list of accepted values for that field
+        :param top_k: How many documents to return per query.
+        :param index: The name of the index in the DocumentStore from which to retrieve documents
+        :return: One list of documents per query, in the same order as `queries`.
+        """
+        if top_k is None:
+            top_k = self.top_k
+        if not queries:
+            return []
+        if index is None:
+            index = self.document_store.index
+        query_embs = self.embed_queries(texts=queries)
+        documents = self.document_store.query_by_embedding_batch(query_embs=np.array(query_embs), filters=filters,
+                                                                 top_k=top_k, index=index, headers=headers)
+        return documents
+
     def embed_queries(self, texts: List[str]) -> List[np.ndarray]:
         """
         Create embeddings for a list of queries.
@@ -1069,6 +1276,8 @@ class EmbeddingRetriever(BaseRetriever):
         if isinstance(texts, str):
             texts = [texts]
         assert isinstance(texts, list), "Expecting a list of texts, i.e. create_embeddings(texts=['text1',...])"
+        if self.query_embedding_cache is not None:
+            return self.query_embedding_cache.get_or_embed(texts, self.embedding_encoder.embed_queries)
         return self.embedding_encoder.embed_queries(texts)
 
     def embed_documents(self, docs: List[Document]) -> List[np.ndarray]:
@@ -1,9 +1,15 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
+import copy
+import json
 import logging
-import pandas as pd
-from collections import OrderedDict, namedtuple
-from sklearn.feature_extraction.text import TfidfVectorizer
+from pathlib import Path
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix, diags, vstack
+from scipy.special import expit
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
 
 from haystack.schema import Document
 from haystack.document_stores import BaseDocumentStore, KeywordDocumentStore
@@ -152,8 +158,65 @@ class ElasticsearchFilterOnlyRetriever(ElasticsearchRetriever):
                                               headers=headers)
         return documents
 
-# TODO make Paragraph generic for configurable units of text eg, pages, paragraphs, or split by a char_limit
-Paragraph = namedtuple("Paragraph", ["paragraph_id", "document_id", "content", "meta"])
+def _select_top_k(indices: np.ndarray, scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the `top_k` entries with the highest scores, sorted by descending score and ties broken by index.
+    """
+    if len(scores) > top_k:
+        # only sort the candidates that can make it into the top_k, including all ties of the k-th best score
+        top_k_candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        candidates = scores >= scores[top_k_candidates].min()
+        indices, scores = indices[candidates], scores[candidates]
+    order = np.lexsort((indices, -scores))[:top_k]
+    return indices[order], scores[order]
+
+
+class _MetaFilter:
+    """
+    Match filters against the metas of the indexed documents, without a round trip to the document store.
+    The values of a meta field are factorized into integer codes the first time the field is filtered on.
+    """
+    def __init__(self, metas: List[dict]):
+        self.metas = metas
+        # meta field -> (value code per document, code per value, unhashable values per document)
+        self._columns: Dict[str, Tuple[np.ndarray, Dict[Any, int], Dict[int, Any]]] = {}
+
+    def _get_column(self, key: str) -> Tuple[np.ndarray, Dict[Any, int], Dict[int, Any]]:
+        column = self._columns.get(key)
+        if column is None:
+            codes = np.full(len(self.metas), -1, dtype=np.int64)
+            value_codes: Dict[Any, int] = {}
+            unhashable_values: Dict[int, Any] = {}
+            for document_idx, meta in enumerate(self.metas):
+                if key not in meta:
+                    continue
+                value = meta[key]
+                try:
+                    codes[document_idx] = value_codes.setdefault(value, len(value_codes))
+                except TypeError:
+                    unhashable_values[document_idx] = value
+            column = self._columns[key] = (codes, value_codes, unhashable_values)
+        return column
+
+    def match(self, filters: Dict[str, List[str]]) -> np.ndarray:
+        """
+        Return a boolean mask over the documents that have one of the accepted values for every key in `filters`.
+        """
+        mask = np.ones(len(self.metas), dtype=bool)
+        for key, values in filters.items():
+            codes, value_codes, unhashable_values = self._get_column(key)
+            accepted_codes = []
+            for value in values:
+                try:
+                    if value in value_codes:
+                        accepted_codes.append(value_codes[value])
+                except TypeError:
+                    pass
+            key_mask = np.isin(codes, accepted_codes)
+            for document_idx, value in unhashable_values.items():
+                key_mask[document_idx] = value in values
+            mask &= key_mask
+        return mask
 
 
 class TfidfRetriever(BaseRetriever):
@@ -163,13 +226,23 @@ class TfidfRetriever(BaseRetriever):
     Split documents into smaller units (eg, paragraphs or pages) to reduce the
     computations when text is passed on to a Reader for QA.
 
-    It uses sklearn's TfidfVectorizer to compute a tf-idf matrix.
+    It uses the analyzer of sklearn's TfidfVectorizer to compute a sparse tf-idf matrix. The matrix can be
+    extended with new documents via partial_fit() without re-vectorizing the documents that are already indexed.
     """
     def __init__(self, document_store: BaseDocumentStore, top_k: int = 10, auto_fit=True):
         """
         :param document_store: an instance of a DocumentStore to retrieve documents from.
         :param top_k: How many documents to return per query.
-        :param auto_fit: Whether to automatically update tf-idf matrix by calling fit() after new documents have been added
+        :param auto_fit: Whether to automatically update tf-idf matrix after documents have been added or deleted.
+                         Changes are detected by comparing the document count of the document store (which is
+                         requested on every query) with the number of indexed documents. Changes that keep the
+                         count (overwritten documents, or as many documents deleted as added) are not detected,
+                         call fit() after those.
+                         Note that auto_fit is a full rescan of the document store: if the count has grown, all
+                         documents are read to find the new ones (only those are vectorized), if it has shrunk,
+                         the matrix is rebuilt with fit(). For large document stores, set auto_fit to False and
+                         pass the documents you write to partial_fit(documents) instead, which neither reads the
+                         document store nor requests the document count per query.
         """
         # save init parameters to enable export of component config as YAML
         self.set_config(document_store=document_store, top_k=top_k,auto_fit=auto_fit)
@@ -180,43 +253,97 @@ class TfidfRetriever(BaseRetriever):
             token_pattern=r"(?u)\b\w\w+\b",
             ngram_range=(1, 1),
         )
+        self._analyzer = self.vectorizer.build_analyzer()
 
         self.document_store = document_store
-        self.paragraphs = self._get_all_paragraphs()
-        self.df = None
         self.top_k = top_k
         self.auto_fit = auto_fit
-        self.document_count = 0
+        self._reset_index()
         self.fit()
 
-    def _get_all_paragraphs(self) -> List[Paragraph]:
+    def _reset_index(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0)
+        self.tfidf_matrix: Optional[csr_matrix] = None
+        self.document_count = 0
+        # one entry per indexed document
+        self._document_ids: List[str] = []
+        self._document_metas: List[dict] = []
+        self._indexed_document_ids: Set[str] = set()
+        # one entry per paragraph, i.e. per row of the tf-idf matrix
+        self._paragraph_contents: List[str] = []
+        self._paragraph_document_idx = np.zeros(0, dtype=np.int64)
+        self._term_counts = csr_matrix((0, 0), dtype=np.float64)
+        self._meta_filter: Optional[_MetaFilter] = None
+
+    @staticmethod
+    def _split_paragraphs(document: Document) -> List[str]:
+        # TODO: this assumes paragraphs are separated by "\n\n". Can be switched to paragraph tokenizer or made
+        #  configurable for other units of text (eg, pages or split by a char_limit).
+        return [p for p in document.content.split("\n\n") if p.strip()]  # skip empty paragraphs
+
+    def _count_terms(self, texts: List[str]) -> csr_matrix:
         """
-        Split the list of documents in paragraphs
+        Build the term count matrix of `texts`, adding unknown terms to the vocabulary.
         """
-        documents = self.document_store.get_all_documents()
-
-        paragraphs = []
-        p_id = 0
-        for doc in documents:
-            for p in doc.content.split("\n\n"):  # TODO: this assumes paragraphs are separated by "\n\n". Can be switched to paragraph tokenizer.
-                if not p.strip():  # skip empty paragraphs
-                    continue
-                paragraphs.append(
-                    Paragraph(document_id=doc.id, paragraph_id=p_id, content=(p,), meta=doc.meta)
-                )
-                p_id += 1
-        logger.info(f"Found {len(paragraphs)} candidate paragraphs from {len(documents)} docs in DB")
-        return paragraphs
-
-    def _calc_scores(self, query: str) -> dict:
-        question_vector = self.vectorizer.transform([query])
-
-        scores = self.tfidf_matrix.dot(question_vector.T).toarray()
-        idx_scores = [(idx, score) for idx, score in enumerate(scores)]
-        indices_and_scores = OrderedDict(
-            sorted(idx_scores, key=(lambda tup: tup[1]), reverse=True)
-        )
-        return indices_and_scores
+        indices: List[int] = []
+        data: List[int] = []
+        indptr = [0]
+        for text in texts:
+            term_counts: Dict[int, int] = {}
+            for term in self._analyzer(text):
+                term_idx = self.vocabulary.setdefault(term, len(self.vocabulary))
+                term_counts[term_idx] = term_counts.get(term_idx, 0) + 1
+            indices.extend(term_counts.keys())
+            data.extend(term_counts.values())
+            indptr.append(len(indices))
+        return csr_matrix((data, indices, indptr), shape=(len(texts), len(self.vocabulary)), dtype=np.float64)
+
+    def _update_tfidf_matrix(self):
+        # same weighting as TfidfVectorizer's defaults: smoothed idf and l2 normalized rows
+        paragraph_count = self._term_counts.shape[0]
+        document_frequency = np.bincount(self._term_counts.indices, minlength=len(self.vocabulary))
+        self.idf = np.log((1 + paragraph_count) / (1 + document_frequency)) + 1
+        self.tfidf_matrix = normalize(self._term_counts @ diags(self.idf)).tocsr()
+
+    def _vectorize_query(self, query: str) -> csr_matrix:
+        term_counts: Dict[int, int] = {}
+        for term in self._analyzer(query):
+            term_idx = self.vocabulary.get(term)
+            if term_idx is not None:
+                term_counts[term_idx] = term_counts.get(term_idx, 0) + 1
+        term_indices = np.fromiter(term_counts.keys(), dtype=np.int64, count=len(term_counts))
+        weights = np.fromiter(term_counts.values(), dtype=np.float64, count=len(term_counts)) * self.idf[term_indices]
+        query_vector = csr_matrix((weights, term_indices, [0, len(term_indices)]), shape=(1, len(self.vocabulary)))
+        return normalize(query_vector)
+
+    def _get_paragraph_mask(self, filters: Dict[str, List[str]]) -> np.ndarray:
+        if self._meta_filter is None:
+            self._meta_filter = _MetaFilter(self._document_metas)
+        return self._meta_filter.match(filters)[self._paragraph_document_idx]
+
+    def _calc_scores(self, query: str, top_k: int, paragraph_mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the indices and scores of the `top_k` best matching paragraphs, sorted by descending score.
+        Ties are broken by the position of the paragraph. If less than `top_k` paragraphs share a term with the
+        query, the result is filled up with (allowed) paragraphs that have a score of zero.
+        """
+        scores = (self.tfidf_matrix @ self._vectorize_query(query).T).tocoo()
+        paragraph_indices, paragraph_scores = scores.row, scores.data
+        if paragraph_mask is not None:
+            allowed = paragraph_mask[paragraph_indices]
+            paragraph_indices, paragraph_scores = paragraph_indices[allowed], paragraph_scores[allowed]
+
+        paragraph_indices, paragraph_scores = _select_top_k(paragraph_indices, paragraph_scores, top_k)
+
+        missing = top_k - len(paragraph_indices)
+        if missing > 0:
+            fillers = np.ones(self.tfidf_matrix.shape[0], dtype=bool) if paragraph_mask is None else paragraph_mask.copy()
+            fillers[paragraph_indices] = False
+            filler_indices = np.flatnonzero(fillers)[:missing]
+            paragraph_indices = np.concatenate([paragraph_indices, filler_indices])
+            paragraph_scores = np.concatenate([paragraph_scores, np.zeros(len(filler_indices))])
+        return paragraph_indices, paragraph_scores
 
     def retrieve(self, query: str, filters: dict = None, top_k: Optional[int] = None, index: str = None, headers: Optional[Dict[str, str]] = None) -> List[Document]:
         """
@@ -229,43 +356,38 @@ class TfidfRetriever(BaseRetriever):
         :param index: The name of the index in the DocumentStore from which to retrieve documents
         """
         if self.auto_fit:
-            if self.document_store.get_document_count(headers=headers) != self.document_count:
-                # run fit() to update self.df, self.tfidf_matrix and self.document_count
+            document_count = self.document_store.get_document_count(headers=headers)
+            if document_count < self.document_count:
+                # documents have been deleted, run fit() to rebuild the tf-idf matrix
                 logger.warning("Indexed documents have been updated and fit() method needs to be run before retrieval. Running it now.")
                 self.fit()
-        if self.df is None:
-            raise Exception("Retrieval requires dataframe df and tf-idf matrix but fit() did not calculate them probably due to an empty document store.")
+            elif document_count > self.document_count:
+                logger.info("New documents have been indexed. Scanning the document store to add them to the tf-idf matrix.")
+                self.partial_fit()
+                if self.document_count > document_count:
+                    # more documents were added than the count shows, some indexed documents have been deleted
+                    logger.warning("Indexed documents have been deleted and fit() method needs to be run before retrieval. Running it now.")
+                    self.fit()
+        if self.tfidf_matrix is None:
+            raise Exception("Retrieval requires a tf-idf matrix but fit() did not calculate it probably due to an empty document store.")
 
-        if filters:
-            raise NotImplementedError("Filters are not implemented in TfidfRetriever.")
         if index:
             raise NotImplementedError("Switching index is not supported in TfidfRetriever.")
 
         if top_k is None:
             top_k = self.top_k
-        # get scores
-        indices_and_scores = self._calc_scores(query)
-
-        # rank paragraphs
-        df_sliced = self.df.loc[indices_and_scores.keys()]
-        df_sliced = df_sliced[:top_k]
-
-        logger.debug(
-            f"Identified {df_sliced.shape[0]} candidates via retriever:\n {df_sliced.to_string(col_space=10, index=False)}"
-        )
-
-        # get actual content for the top candidates
-        paragraphs = list(df_sliced.content.values)
-        meta_data = [{"document_id": row["document_id"], "paragraph_id": row["paragraph_id"],  "meta": row.get("meta", {})}
-                     for idx, row in df_sliced.iterrows()]
+        paragraph_mask = self._get_paragraph_mask(filters) if filters else None
+        paragraph_indices, _ = self._calc_scores(query, top_k=top_k, paragraph_mask=paragraph_mask)
+        logger.debug(f"Identified {len(paragraph_indices)} candidates via retriever")
 
         documents = []
-        for para, meta in zip(paragraphs, meta_data):
+        for paragraph_idx in paragraph_indices:
+            document_idx = self._paragraph_document_idx[paragraph_idx]
             documents.append(
                 Document(
-                    id=meta["document_id"],
-                    content=para,
-                    meta=meta.get("meta", {})
+                    id=self._document_ids[document_idx],
+                    content=self._paragraph_contents[paragraph_idx],
+                    meta=self._document_metas[document_idx]
                 ))
 
         return documents
@@ -273,14 +395,287 @@ class TfidfRetriever(BaseRetriever):
     def fit(self):
         """
         Performing training on this class according to the TF-IDF algorithm.
+        Reads all documents from the document store and rebuilds the tf-idf matrix from scratch.
+        """
+        self._reset_index()
+        self.partial_fit()
+        if self.tfidf_matrix is None:
+            logger.warning("Fit method called with empty document store")
+
+    def partial_fit(self, documents: Optional[List[Document]] = None):
+        """
+        Add documents to the tf-idf matrix without re-vectorizing the documents that are already indexed.
+        The idf weights and the normalization of the matrix are updated to account for the new paragraphs,
+        which is a single pass over the sparse matrix.
+
+        :param documents: The documents to add. Documents that are already indexed are skipped.
+                          If None, all documents of the document store are read to find the ones that are
+                          not indexed yet. Pass the new documents explicitly to avoid this scan on large
+                          document stores.
+        """
+        if documents is None:
+            documents = self.document_store.get_all_documents_generator()
+
+        paragraphs: List[str] = []
+        paragraph_document_idx: List[int] = []
+        for doc in documents:
+            if doc.id in self._indexed_document_ids:
+                continue
+            self._indexed_document_ids.add(doc.id)
+            document_idx = len(self._document_ids)
+            self._document_ids.append(doc.id)
+            self._document_metas.append(doc.meta)
+            for paragraph in self._split_paragraphs(doc):
+                paragraphs.append(paragraph)
+                paragraph_document_idx.append(document_idx)
+        self.document_count = len(self._indexed_document_ids)
+        self._meta_filter = None
+        if not paragraphs:
+            return
+
+        new_term_counts = self._count_terms(paragraphs)
+        self._term_counts.resize((self._term_counts.shape[0], len(self.vocabulary)))
+        self._term_counts = vstack([self._term_counts, new_term_counts], format="csr")
+        self._paragraph_contents.extend(paragraphs)
+        self._paragraph_document_idx = np.concatenate(
+            [self._paragraph_document_idx, np.array(paragraph_document_idx, dtype=np.int64)]
+        )
+        logger.info(f"Found {len(paragraphs)} new candidate paragraphs, {len(self._paragraph_contents)} in total from {self.document_count} docs in DB")
+        self._update_tfidf_matrix()
+
+
+class BM25Retriever(BaseRetriever):
+    """
+    Keyword retrieval with Okapi BM25 for document stores that don't support it natively (e.g. InMemory, SQL or FAISS).
+
+    The documents of the document store are tokenized into an inverted index held in numpy arrays:
+    the postings (document positions and term frequencies) of all terms are stored contiguously and the
+    postings of a term are located via an offsets array, like the rows of a CSR matrix.
+    The index can be saved to disk and is memory mapped when it is loaded again.
+    Scores are scaled to [0, 1] like the ones of the ElasticsearchRetriever, so that both can be used in the same
+    (hybrid) pipelines.
+    """
+    def __init__(
+        self,
+        document_store: BaseDocumentStore,
+        top_k: int = 10,
+        k1: float = 1.2,
+        b: float = 0.75,
+        index: Optional[str] = None,
+        index_path: Optional[Union[str, Path]] = None,
+        auto_fit: bool = True,
+    ):
+        """
+        :param document_store: an instance of a DocumentStore to retrieve documents from.
+        :param top_k: How many documents to return per query.
+        :param k1: BM25 parameter controlling the term frequency saturation.
+        :param b: BM25 parameter controlling the document length normalization.
+        :param index: The index of the DocumentStore to build the BM25 index from. Defaults to the DocumentStore's index.
+        :param index_path: Directory of a BM25 index created via `save()`. If given, the index is memory mapped from
+                           there instead of being built from the documents in the DocumentStore.
+        :param auto_fit: Whether to automatically rebuild the BM25 index by calling fit() after documents have been
+                         added to or deleted from the DocumentStore. Changes are detected by comparing the document
+                         count of the DocumentStore (which is requested on every query) with the number of indexed
+                         documents. Note that fit() is a full rebuild that reads all documents and holds the index
+                         in memory. An index loaded from `index_path` is therefore never rebuilt automatically,
+                         only a warning is logged; call fit() and save() yourself to update it.
         """
-        if not self.paragraphs or len(self.paragraphs) == 0:
-            self.paragraphs = self._get_all_paragraphs()
-            if not self.paragraphs or len(self.paragraphs) == 0:
-                logger.warning("Fit method called with empty document store")
-                return
+        # save init parameters to enable export of component config as YAML
+        self.set_config(
+            document_store=document_store, top_k=top_k, k1=k1, b=b, index=index, index_path=index_path, auto_fit=auto_fit
+        )
+
+        self.document_store = document_store
+        self.top_k = top_k
+        self.k1 = k1
+        self.b = b
+        self.index = index or document_store.index
+        self.auto_fit = auto_fit
+        self._analyzer = CountVectorizer(lowercase=True, token_pattern=r"(?u)\b\w\w+\b").build_analyzer()
+
+        self.vocabulary: Dict[str, int] = {}
+        self.document_ids: List[str] = []
+        self.term_offsets = np.zeros(1, dtype=np.int64)
+        self.posting_document_idx = np.zeros(0, dtype=np.int32)
+        self.posting_term_frequencies = np.zeros(0, dtype=np.float32)
+        self.document_lengths = np.zeros(0, dtype=np.float32)
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.average_document_length = 0.0
+        self._meta_filter: Optional[_MetaFilter] = None
+        self._loaded_from_path = False
+
+        if index_path:
+            self._load_index(index_path)
+        else:
+            self.fit()
+
+    def fit(self):
+        """
+        Build the BM25 index from all documents of the DocumentStore.
+        """
+        document_ids: List[str] = []
+        metas: List[dict] = []
+
+        def contents():
+            for doc in self.document_store.get_all_documents_generator(index=self.index, return_embedding=False):
+                document_ids.append(doc.id)
+                metas.append(doc.meta)
+                yield doc.content if isinstance(doc.content, str) else ""
+
+        vectorizer = CountVectorizer(lowercase=True, token_pattern=r"(?u)\b\w\w+\b", dtype=np.float32)
+        try:
+            # documents x terms; in CSC format the columns are the postings lists of the terms
+            term_frequencies = vectorizer.fit_transform(contents()).tocsc()
+        except ValueError:
+            # empty document store or no tokens at all
+            logger.warning("Fit method called with empty document store")
+            term_frequencies = csc_matrix((len(document_ids), 0), dtype=np.float32)
+            vectorizer.vocabulary_ = {}
+        term_frequencies.sort_indices()
+
+        self.vocabulary = {term: int(term_idx) for term, term_idx in vectorizer.vocabulary_.items()}
+        self.document_ids = document_ids
+        self.term_offsets = term_frequencies.indptr.astype(np.int64)
+        self.posting_document_idx = term_frequencies.indices.astype(np.int32)
+        self.posting_term_frequencies = term_frequencies.data
+        self.document_lengths = np.asarray(term_frequencies.sum(axis=1), dtype=np.float32).ravel()
+        self._update_statistics()
+        self._meta_filter = _MetaFilter(metas)
+        self._loaded_from_path = False
+        logger.info(f"Built BM25 index of {len(self.vocabulary)} terms over {len(self.document_ids)} documents")
+
+    def _update_statistics(self):
+        document_count = len(self.document_ids)
+        document_frequency = np.diff(self.term_offsets)
+        # Lucene's variant of the idf that is always positive
+        self.idf = np.log1p((document_count - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+        self.average_document_length = float(self.document_lengths.mean()) if document_count else 0.0
+
+    def save(self, index_path: Union[str, Path]):
+        """
+        Save the BM25 index to a directory. It can be loaded again by passing the directory as `index_path`
+        or via `BM25Retriever.load()`.
+
+        :param index_path: Directory to save the index to. It will be created if it does not exist yet.
+        """
+        index_path = Path(index_path)
+        index_path.mkdir(parents=True, exist_ok=True)
+        np.save(index_path / "term_offsets.npy", self.term_offsets)
+        np.save(index_path / "posting_document_idx.npy", self.posting_document_idx)
+        np.save(index_path / "posting_term_frequencies.npy", self.posting_term_frequencies)
+        np.save(index_path / "document_lengths.npy", self.document_lengths)
+        with open(index_path / "bm25_index.json", "w") as index_file:
+            json.dump({"index": self.index, "vocabulary": self.vocabulary, "document_ids": self.document_ids}, index_file)
+
+    @classmethod
+    def load(cls, index_path: Union[str, Path], document_store: BaseDocumentStore, **kwargs):
+        """
+        Load a BM25 index saved via `save()`. The postings are memory mapped instead of being read into memory.
+        Note: make sure to use the same DocumentStore that the index was built from.
+
+        :param index_path: Directory the index was saved to.
+        :param document_store: an instance of a DocumentStore to retrieve documents from.
+        :param kwargs: Further init parameters of the BM25Retriever, e.g. `top_k`.
+        """
+        return cls(document_store=document_store, index_path=index_path, **kwargs)
+
+    def _load_index(self, index_path: Union[str, Path]):
+        index_path = Path(index_path)
+        with open(index_path / "bm25_index.json", "r") as index_file:
+            index_data = json.load(index_file)
+        self.index = index_data["index"]
+        self.vocabulary = index_data["vocabulary"]
+        self.document_ids = index_data["document_ids"]
+        self.term_offsets = np.load(index_path / "term_offsets.npy", mmap_mode="r")
+        self.posting_document_idx = np.load(index_path / "posting_document_idx.npy", mmap_mode="r")
+        self.posting_term_frequencies = np.load(index_path / "posting_term_frequencies.npy", mmap_mode="r")
+        self.document_lengths = np.load(index_path / "document_lengths.npy", mmap_mode="r")
+        self._update_statistics()
+        # the metas are only fetched from the document store once a query uses filters
+        self._meta_filter = None
+        self._loaded_from_path = True
+
+    def _get_document_mask(self, filters: Dict[str, List[str]]) -> np.ndarray:
+        if self._meta_filter is None:
+            documents = self.document_store.get_documents_by_id(self.document_ids, index=self.index)
+            metas_by_id = {doc.id: doc.meta for doc in documents}
+            self._meta_filter = _MetaFilter([metas_by_id.get(id, {}) for id in self.document_ids])
+        return self._meta_filter.match(filters)
+
+    def _calc_scores(self, query: str, top_k: int, document_mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the indices and BM25 scores of the `top_k` best matching documents, sorted by descending score.
+        Only documents that contain at least one of the query terms are returned.
+        """
+        query_term_counts: Dict[int, int] = {}
+        for term in self._analyzer(query):
+            term_idx = self.vocabulary.get(term)
+            if term_idx is not None:
+                query_term_counts[term_idx] = query_term_counts.get(term_idx, 0) + 1
+        if not query_term_counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        # gather the postings of all query terms and score them at once
+        document_indices_per_term = []
+        term_frequencies_per_term = []
+        term_weights = []
+        for term_idx, count in query_term_counts.items():
+            start, end = self.term_offsets[term_idx], self.term_offsets[term_idx + 1]
+            document_indices_per_term.append(self.posting_document_idx[start:end])
+            term_frequencies_per_term.append(self.posting_term_frequencies[start:end])
+            term_weights.append(np.full(end - start, self.idf[term_idx] * count, dtype=np.float32))
+        document_indices = np.concatenate(document_indices_per_term)
+        term_frequencies = np.concatenate(term_frequencies_per_term)
+        length_norm = self.k1 * (1 - self.b + self.b * self.document_lengths[document_indices] / self.average_document_length)
+        posting_scores = np.concatenate(term_weights) * term_frequencies * (self.k1 + 1) / (term_frequencies + length_norm)
+
+        # sum the scores of the postings per document
+        candidates, posting_candidates = np.unique(document_indices, return_inverse=True)
+        scores = np.bincount(posting_candidates, weights=posting_scores)
+        if document_mask is not None:
+            allowed = document_mask[candidates]
+            candidates, scores = candidates[allowed], scores[allowed]
+        return _select_top_k(candidates, scores, top_k)
+
+    def retrieve(self, query: str, filters: dict = None, top_k: Optional[int] = None, index: str = None, headers: Optional[Dict[str, str]] = None) -> List[Document]:
+        """
+        Scan through documents in DocumentStore and return a small number documents
+        that are most relevant to the query.
+
+        :param query: The query
+        :param filters: A dictionary where the keys specify a metadata field and the value is a list of accepted values for that field.
+                        The first filtered query after a fit() loads all documents of the index from the
+                        DocumentStore to collect their meta data, which can take a while and memory for large indexes.
+        :param top_k: How many documents to return per query.
+        :param index: The name of the index in the DocumentStore from which to retrieve documents
+        :param headers: Custom HTTP headers to pass to document store client if supported (e.g. {'Authorization': 'Basic YWRtaW46cm9vdA=='} for basic authentication)
+        """
+        if index and index != self.index:
+            raise NotImplementedError("Switching index is not supported in BM25Retriever. Create one BM25Retriever per index instead.")
+        if self.auto_fit and self.document_store.get_document_count(index=self.index, headers=headers) != len(self.document_ids):
+            if self._loaded_from_path:
+                # don't silently replace the memory mapped index by an in-memory rebuild
+                logger.warning("Indexed documents have been updated since the BM25 index was saved. "
+                               "Run fit() and save() to update the index. Retrieving from the loaded index for now.")
+            else:
+                logger.warning("Indexed documents have been updated and fit() method needs to be run before retrieval. Running it now.")
+                self.fit()
 
-        self.df = pd.DataFrame.from_dict(self.paragraphs)
-        self.df["content"] = self.df["content"].apply(lambda x: " ".join(x))
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.df["content"])
-        self.document_count = self.document_store.get_document_count()
+        if top_k is None:
+            top_k = self.top_k
+        document_mask = self._get_document_mask(filters) if filters else None
+        document_indices, scores = self._calc_scores(query, top_k=top_k, document_mask=document_mask)
+        if len(document_indices) == 0:
+            return []
+
+        ids = [self.document_ids[document_idx] for document_idx in document_indices]
+        documents_by_id = {doc.id: doc for doc in self.document_store.get_documents_by_id(ids, index=self.index)}
+        documents = []
+        for id, score in zip(ids, scores):
+            if id not in documents_by_id:
+                continue
+            # copy the document so that neither the score nor later changes of the caller end up in the document store
+            document = copy.deepcopy(documents_by_id[id])
+            document.score = float(expit(score / 8))  # scaling probability from BM25, like in Elasticsearch
+            documents.append(document)
+        return documents
@@ -11,6 +11,7 @@ class BaseTranslator(BaseComponent):
     Abstract class for a Translator component that translates either a query or a doc from language A to language B.
     """
     outgoing_edges = 1
+    modifies_inputs = True  # replaces the content of the input documents and answers
 
     @abstractmethod
     def translate(
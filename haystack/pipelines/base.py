@@ -5,6 +5,8 @@ import inspect
 import logging
 import os
 import traceback
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -233,10 +235,19 @@ class Pipeline(BasePipeline):
     Reader from multiple Retrievers, or re-ranking of candidate documents.
     """
 
-    def __init__(self):
+    def __init__(self, max_workers: int = 1):
+        """
+        :param max_workers: The maximum number of nodes that run at the same time. By default, the nodes run one
+                            after another. With more workers, nodes run in a thread pool as soon as all of their
+                            predecessors are done, so that independent branches (e.g. an ElasticsearchRetriever and a
+                            DensePassageRetriever before a JoinDocuments node) run concurrently. Only use this if
+                            the nodes of the pipeline can run in parallel threads.
+        """
         self.graph = DiGraph()
         self.root_node = None
         self.components: dict = {}
+        self.max_workers = max_workers
+        self._execution_plan: Optional[_ExecutionPlan] = None
 
     def add_node(self, component, name: str, inputs: List[str]):
         """
@@ -261,6 +272,7 @@ class Pipeline(BasePipeline):
             else:
                 raise KeyError(f"Root node '{root_node}' is invalid. Available options are 'Query' and 'File'.")
         component.name = name
+        self._execution_plan = None
         self.graph.add_node(name, component=component, inputs=inputs)
 
         if len(self.graph.nodes) == 2:  # first node added; connect with Root
@@ -307,6 +319,7 @@ class Pipeline(BasePipeline):
         :param component: The component object to be set at the node.
         """
         self.graph.nodes[name]["component"] = component
+        self._execution_plan = None
 
     def run(  # type: ignore
         self,
@@ -335,86 +348,214 @@ class Pipeline(BasePipeline):
                           they received and the output they generated. All debug information can 
                           then be found in the dict returned by this method under the key "_debug"
         """
+        execution_plan = self._get_execution_plan()
+
         # validate the node names
         if params:
-            if not all(node_id in self.graph.nodes for node_id in params.keys()):
-
-                # Might be a non-targeted param. Verify that too
-                not_a_node = set(params.keys()) - set(self.graph.nodes)
-                valid_global_params = set()
-                for node_id in self.graph.nodes:
-                    run_signature_args = inspect.signature(self.graph.nodes[node_id]["component"].run).parameters.keys()
-                    valid_global_params |= set(run_signature_args)
-                invalid_keys = [key for key in not_a_node if key not in valid_global_params]
+            not_a_node = set(params.keys()) - execution_plan.node_ids
+            # Might be a non-targeted param. Verify that too
+            invalid_keys = [key for key in not_a_node if key not in execution_plan.valid_global_params]
+            if invalid_keys:
+                raise ValueError(f"No node(s) or global parameter(s) named {', '.join(invalid_keys)} found in pipeline.")
 
-                if invalid_keys:
-                    raise ValueError(f"No node(s) or global parameter(s) named {', '.join(invalid_keys)} found in pipeline.")
+        if debug is not None:
+            params = self._add_debug_params(params, execution_plan, debug)
 
-        node_output = None
-        queue = {
-            self.root_node: {"root_node": self.root_node, "params": params}
-        }  # ordered dict with "node_id" -> "input" mapping that acts as a FIFO queue
+        root_input: dict = {"root_node": self.root_node, "params": params}
         if query:
-            queue[self.root_node]["query"] = query
+            root_input["query"] = query
         if file_paths:
-            queue[self.root_node]["file_paths"] = file_paths
+            root_input["file_paths"] = file_paths
         if labels:
-            queue[self.root_node]["labels"] = labels
+            root_input["labels"] = labels
         if documents:
-            queue[self.root_node]["documents"] = documents
+            root_input["documents"] = documents
         if meta:
-            queue[self.root_node]["meta"] = meta
+            root_input["meta"] = meta
+        # join nodes receive the outputs of their predecessors as "inputs", together with the pipeline's input
+        join_input = {key: value for key, value in root_input.items() if key != "root_node"}
 
-        i = 0  # the first item is popped off the queue unless it is a "join" node with unprocessed predecessors
-        while queue:
-            node_id = list(queue.keys())[i]
-            node_input = queue[node_id]
-            node_input["node_id"] = node_id
-
-            # Apply debug attributes to the node input params
-            # NOTE: global debug attributes will override the value specified
-            # in each node's params dictionary.
-            if debug is not None:
-                if node_id not in node_input["params"].keys():
-                    node_input["params"][node_id] = {}
-                node_input["params"][node_id]["debug"] = debug
-
-            predecessors = set(nx.ancestors(self.graph, node_id))
-            if predecessors.isdisjoint(set(queue.keys())):  # only execute if predecessor nodes are executed
-                try:
-                    logger.debug(f"Running node `{node_id}` with input `{node_input}`")
-                    node_output, stream_id = self.graph.nodes[node_id]["component"]._dispatch_run(**node_input)
-                except Exception as e:
-                    tb = traceback.format_exc()
-                    raise Exception(f"Exception while running node `{node_id}` with input `{node_input}`: {e}, full stack trace: {tb}")
-                queue.pop(node_id)
-                next_nodes = self.get_next_nodes(node_id, stream_id)
-                for n in next_nodes:  # add successor nodes with corresponding inputs to the queue
-                    if queue.get(n):  # concatenate inputs if it's a join node
-                        existing_input = queue[n]
-                        if "inputs" not in existing_input.keys():
-                            updated_input: dict = {"inputs": [existing_input, node_output], "params": params}
-                            if query:
-                                updated_input["query"] = query
-                            if file_paths:
-                                updated_input["file_paths"] = file_paths
-                            if labels:
-                                updated_input["labels"] = labels
-                            if documents:
-                                updated_input["documents"] = documents
-                            if meta:
-                                updated_input["meta"] = meta
-                        else:
-                            existing_input["inputs"].append(node_output)
-                            updated_input = existing_input
-                        queue[n] = updated_input
-                    else:
-                        queue[n] = node_output
-                i = 0
-            else:
-                i += 1  # attempt executing next node in the queue as current `node_id` has unprocessed predecessors
+        # dict with "node_id" -> list of the outputs sent to the node, for the nodes that were not executed yet
+        received_outputs: Dict[str, List[dict]] = {self.root_node: [root_input]}
+        if self.max_workers > 1:
+            return self._run_nodes_concurrently(execution_plan, received_outputs, join_input)
+
+        node_output = None
+        # all predecessors of a node come before it in the schedule, so its input is complete when it is reached
+        for node_id in execution_plan.schedule:
+            if node_id not in received_outputs:  # the node is not on the path taken by this query
+                continue
+            node_input = self._get_node_input(node_id, received_outputs.pop(node_id), join_input)
+            node_output, stream_id = self._run_node(node_id, node_input)
+            for next_node in execution_plan.get_next_nodes(node_id, stream_id):
+                received_outputs.setdefault(next_node, []).append(node_output)
         return node_output
 
+    def run_batch(  # type: ignore
+        self,
+        queries: List[str],
+        params: Optional[dict] = None,
+        debug: Optional[bool] = None
+    ) -> List[dict]:
+        """
+        Runs the pipeline for several queries, with the same params for all of them.
+
+        The nodes run one after another as in `run()`, but each node receives the inputs of all queries at once.
+        Nodes that can process several queries together (e.g. retrievers, the FARMReader) do so in batches, the others
+        run once per query.
+
+        :param queries: The search queries.
+        :param params: Dictionary of parameters to be dispatched to the nodes, see `run()`.
+        :param debug: Whether the pipeline should instruct nodes to collect debug information, see `run()`.
+        :return: The output of the pipeline for each query, as returned by `run()`.
+        """
+        execution_plan = self._get_execution_plan()
+
+        # validate the node names
+        if params:
+            not_a_node = set(params.keys()) - execution_plan.node_ids
+            # Might be a non-targeted param. Verify that too
+            invalid_keys = [key for key in not_a_node if key not in execution_plan.valid_global_params]
+            if invalid_keys:
+                raise ValueError(f"No node(s) or global parameter(s) named {', '.join(invalid_keys)} found in pipeline.")
+
+        if debug is not None:
+            params = self._add_debug_params(params, execution_plan, debug)
+        elif params is None:
+            params = {}
+
+        # the same params object is passed to all queries, which lets the nodes process them together
+        root_inputs = [{"root_node": self.root_node, "params": params, "query": query} for query in queries]
+        join_inputs = [{"params": params, "query": query} for query in queries]
+        received_outputs: List[Dict[str, List[dict]]] = [{self.root_node: [root_input]} for root_input in root_inputs]
+        node_outputs: List[Optional[dict]] = [None] * len(queries)
+        for node_id in execution_plan.schedule:
+            query_indices = [i for i, outputs in enumerate(received_outputs) if node_id in outputs]
+            if not query_indices:  # the node is not on the path taken by any of the queries
+                continue
+            node_inputs = [
+                self._get_node_input(node_id, received_outputs[i].pop(node_id), join_inputs[i])
+                for i in query_indices
+            ]
+            for i, (node_output, stream_id) in zip(query_indices, self._run_node_batch(node_id, node_inputs)):
+                node_outputs[i] = node_output
+                for next_node in execution_plan.get_next_nodes(node_id, stream_id):
+                    received_outputs[i].setdefault(next_node, []).append(node_output)
+        return node_outputs  # type: ignore
+
+    def _run_node_batch(self, node_id: str, node_inputs: List[dict]):
+        try:
+            logger.debug(f"Running node `{node_id}` with {len(node_inputs)} inputs")
+            return self.graph.nodes[node_id]["component"]._dispatch_run_batch(node_inputs)
+        except Exception as e:
+            tb = traceback.format_exc()
+            raise Exception(f"Exception while running node `{node_id}` with {len(node_inputs)} inputs: {e}, full stack trace: {tb}")
+
+    def _run_nodes_concurrently(
+        self, execution_plan: "_ExecutionPlan", received_outputs: Dict[str, List[dict]], join_input: dict
+    ):
+        """
+        Run the nodes in a thread pool, each node as soon as all of its predecessors are done.
+        Independent branches (e.g. two retrievers before a JoinDocuments node) run at the same time. The outputs of
+        the predecessors of a join node are ordered as in a sequential run, so the result doesn't depend on which
+        branch finishes first. The thread pool only lives for the duration of the run, so no threads are left behind
+        when the pipeline is discarded.
+        """
+        # predecessors that may still send an output to each node
+        pending_predecessors = {
+            node_id: len(predecessors) for node_id, predecessors in execution_plan.predecessors.items()
+        }
+        outputs_by_predecessor: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        node_outputs: Dict[str, dict] = {}
+        running: Dict[Future, str] = {}
+        ready = deque([self.root_node])
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline") as executor:
+            try:
+                while ready or running:
+                    while ready:
+                        node_id = ready.popleft()
+                        if node_id == self.root_node:
+                            node_outputs_for_input = received_outputs[node_id]
+                        else:
+                            node_outputs_for_input = [
+                                outputs_by_predecessor[node_id][predecessor]
+                                for predecessor in execution_plan.predecessors[node_id]
+                                if predecessor in outputs_by_predecessor[node_id]
+                            ]
+                        if node_outputs_for_input:
+                            node_input = self._get_node_input(node_id, node_outputs_for_input, join_input)
+                            running[executor.submit(self._run_node, node_id, node_input)] = node_id
+                        else:  # the node is not on the path taken by this query, neither are the nodes after it
+                            for next_node, _ in execution_plan.edges[node_id]:
+                                pending_predecessors[next_node] -= 1
+                                if pending_predecessors[next_node] == 0:
+                                    ready.append(next_node)
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        node_id = running.pop(future)
+                        node_output, stream_id = future.result()
+                        node_outputs[node_id] = node_output
+                        next_nodes = execution_plan.get_next_nodes(node_id, stream_id)
+                        for next_node, _ in execution_plan.edges[node_id]:
+                            if next_node in next_nodes:
+                                outputs_by_predecessor[next_node][node_id] = node_output
+                            pending_predecessors[next_node] -= 1
+                            if pending_predecessors[next_node] == 0:
+                                ready.append(next_node)
+            finally:
+                for future in running:
+                    future.cancel()
+
+        # same return value as a sequential run: the output of the last node in the schedule that was executed
+        last_node_id = next((node_id for node_id in reversed(execution_plan.schedule) if node_id in node_outputs), None)
+        return node_outputs.get(last_node_id) if last_node_id else None
+
+    def _get_node_input(self, node_id: str, outputs: List[dict], join_input: dict) -> dict:
+        """
+        Build the input of a node from the outputs it received from its predecessors.
+
+        The output of a predecessor may be sent to several nodes (which can run at the same time), so a new dict is
+        built for each node instead of adding the node id to the output.
+        """
+        if len(outputs) == 1:
+            return {**outputs[0], "node_id": node_id}
+        # concatenate inputs if it's a join node
+        return {"inputs": outputs, **join_input, "node_id": node_id}
+
+    @staticmethod
+    def _add_debug_params(params: Optional[dict], execution_plan: "_ExecutionPlan", debug: bool) -> dict:
+        """
+        Return a copy of the params with the debug flag of every node set to `debug`. The params are updated once per
+        run, before any node runs, so that the caller's params and the params shared by the running nodes are never
+        modified.
+
+        NOTE: global debug attributes will override the value specified in each node's params dictionary.
+        """
+        params = dict(params or {})
+        for node_id in execution_plan.node_ids:
+            node_params = params.get(node_id)
+            params[node_id] = {**(node_params if isinstance(node_params, dict) else {}), "debug": debug}
+        return params
+
+    def _run_node(self, node_id: str, node_input: dict):
+        try:
+            logger.debug(f"Running node `{node_id}` with input `{node_input}`")
+            return self.graph.nodes[node_id]["component"]._dispatch_run(**node_input)
+        except Exception as e:
+            tb = traceback.format_exc()
+            raise Exception(f"Exception while running node `{node_id}` with input `{node_input}`: {e}, full stack trace: {tb}")
+
+    def _get_execution_plan(self) -> "_ExecutionPlan":
+        """
+        Return the execution plan of the pipeline, compiling it if nodes were added or replaced since the last run.
+        """
+        execution_plan = self._execution_plan
+        if execution_plan is None or not execution_plan.matches(self.graph):
+            execution_plan = _ExecutionPlan(self.graph, self.root_node)
+            self._execution_plan = execution_plan
+        return execution_plan
+
     def eval(
         self,
         labels: List[MultiLabel],
@@ -917,6 +1058,66 @@ class Pipeline(BasePipeline):
             f"{wrong_samples_report}")
 
 
+class _ExecutionPlan:
+    """
+    Everything `Pipeline.run()` needs to know about the graph, computed once instead of on every run:
+
+    - `schedule`: the order in which nodes are executed. It is the order in which the nodes would run if every node
+      sent its output to all of its successors, i.e. a node runs once all of its ancestors have run, and among the
+      nodes that are ready the one that received its input first runs first. This keeps the order of the inputs of
+      join nodes stable. Nodes that don't receive an input in a run (e.g. after a decision node) are skipped.
+    - `edges`: the outgoing edges of each node as `(next_node, label)` pairs.
+    - `predecessors`: the direct predecessors of each node, in the order of the schedule.
+    - `node_ids` and `valid_global_params`: the names accepted as keys of the `params` passed to `run()`.
+    """
+    def __init__(self, graph: DiGraph, root_node: Optional[str]):
+        self._graph_size = (graph.number_of_nodes(), graph.number_of_edges())
+        self._components = {node_id: graph.nodes[node_id]["component"] for node_id in graph.nodes}
+        self.node_ids = set(graph.nodes)
+        self.edges = {
+            node_id: [(next_node, data["label"]) for _, next_node, data in graph.edges(node_id, data=True)]
+            for node_id in graph.nodes
+        }
+        self.valid_global_params: set = set()
+        for component in self._components.values():
+            self.valid_global_params |= component._get_run_signature_args()
+
+        ancestors = {node_id: nx.ancestors(graph, node_id) for node_id in graph.nodes}
+        self.schedule: List[str] = []
+        queue: List[str] = [root_node] if root_node is not None else []
+        while queue:
+            node_id = next(n for n in queue if ancestors[n].isdisjoint(queue))
+            queue.remove(node_id)
+            self.schedule.append(node_id)
+            for next_node, _ in self.edges[node_id]:
+                if next_node not in queue:
+                    queue.append(next_node)
+
+        self.predecessors: Dict[str, List[str]] = {node_id: [] for node_id in self.schedule}
+        for node_id in self.schedule:
+            for next_node, _ in self.edges[node_id]:
+                if node_id not in self.predecessors[next_node]:
+                    self.predecessors[next_node].append(node_id)
+
+    def get_next_nodes(self, node_id: str, stream_id: Optional[str]) -> List[str]:
+        """
+        Return the nodes that receive the output of `node_id` sent to the edge `stream_id`.
+        """
+        return [
+            next_node
+            for next_node, label in self.edges[node_id]
+            if not stream_id or label == stream_id or stream_id == "output_all"
+        ]
+
+    def matches(self, graph: DiGraph) -> bool:
+        """
+        Cheap check that the graph was not modified without going through `Pipeline.add_node()`/`set_node()`.
+        """
+        return (graph.number_of_nodes(), graph.number_of_edges()) == self._graph_size and all(
+            graph.nodes[node_id]["component"] is component for node_id, component in self._components.items()
+        )
+
+
 class RayPipeline(Pipeline):
     """
     Ray (https://ray.io) is a framework for distributed computing.
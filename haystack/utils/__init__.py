@@ -1,5 +1,6 @@
 from haystack.utils.preprocessing import (
     convert_files_to_dicts, 
+    parallel_convert_files_to_dicts,
     tika_convert_files_to_dicts
 )
 from haystack.utils.import_utils import fetch_archive_from_http
@@ -1,7 +1,14 @@
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import re
+import json
+import signal
+import hashlib
 import logging
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 from haystack.nodes.file_converter import (
@@ -60,27 +67,217 @@ def convert_files_to_dicts(
             if encoding is None and suffix == '.pdf':
                 encoding = "Latin1"
             logger.info('Converting {}'.format(path))
-            document = suffix2converter[suffix].convert(
-                    file_path=path,
-                    meta=None,
-                    encoding=encoding,
-            )[0]  # PDFToTextConverter, TextConverter, and DocxToTextConverter return a list containing a single dict
-            text = document["content"]
+            documents.extend(_convert_file_to_dicts(
+                path=path,
+                converter=suffix2converter[suffix],
+                clean_func=clean_func,
+                split_paragraphs=split_paragraphs,
+                encoding=encoding
+            ))
 
-            if clean_func:
-                text = clean_func(text)
+    return documents
 
-            if split_paragraphs:
-                for para in text.split("\n\n"):
-                    if not para.strip():  # skip empty paragraphs
-                        continue
-                    documents.append({"content": para, "meta": {"name": path.name}})
-            else:
-                documents.append({"content": text, "meta": {"name": path.name}})
 
+def _convert_file_to_dicts(
+        path: Path,
+        converter: BaseConverter,
+        clean_func: Optional[Callable],
+        split_paragraphs: bool,
+        encoding: Optional[str]
+) -> List[dict]:
+    document = converter.convert(
+            file_path=path,
+            meta=None,
+            encoding=encoding,
+    )[0]  # PDFToTextConverter, TextConverter, and DocxToTextConverter return a list containing a single dict
+    text = document["content"]
+
+    if clean_func:
+        text = clean_func(text)
+
+    documents = []
+    if split_paragraphs:
+        for para in text.split("\n\n"):
+            if not para.strip():  # skip empty paragraphs
+                continue
+            documents.append({"content": para, "meta": {"name": path.name}})
+    else:
+        documents.append({"content": text, "meta": {"name": path.name}})
     return documents
 
 
+def parallel_convert_files_to_dicts(
+        dir_path: str,
+        clean_func: Optional[Callable] = None,
+        split_paragraphs: bool = False,
+        encoding: Optional[str] = None,
+        num_processes: Optional[int] = None,
+        timeout: Optional[float] = None,
+        manifest_path: Optional[Union[str, Path]] = None
+) -> Iterator[dict]:
+    """
+    Convert all files(.txt, .pdf, .docx) in the sub-directories of the given path to Python dicts that can be written to a
+    Document Store, like `convert_files_to_dicts()`, but with a pool of processes.
+
+    The dicts are yielded as soon as their file is converted, so the order of the files is not kept. A file that can't
+    be converted, takes longer than `timeout` or crashes its worker process is logged and skipped. If a
+    `manifest_path` is given, the content hash of each converted file is appended to it, and files whose content is
+    already in the manifest are skipped. This allows resuming a conversion that was interrupted.
+
+    :param dir_path: path for the documents to be written to the DocumentStore
+    :param clean_func: a custom cleaning function that gets applied to each doc (input: str, output:str). It's sent to
+                       the worker processes, so it must be picklable (e.g. a function defined at module level).
+    :param split_paragraphs: split text in paragraphs.
+    :param encoding: character encoding to use when converting pdf documents.
+    :param num_processes: number of worker processes. None uses all CPU cores.
+    :param timeout: maximum number of seconds to convert a single file. Only supported on platforms with `SIGALRM`.
+    :param manifest_path: path of a file that records the content hashes of the converted files.
+    """
+    if timeout is not None and not hasattr(signal, "SIGALRM"):
+        logger.warning("Timeouts for the conversion of single files are not supported on this platform.")
+        timeout = None
+    num_processes = num_processes or mp.cpu_count()
+
+    converted_hashes: Set[str] = set()
+    if manifest_path is not None and Path(manifest_path).exists():
+        with open(manifest_path, "r") as manifest:
+            converted_hashes = {json.loads(line)["hash"] for line in manifest if line.strip()}
+        logger.info(f"Skipping files with {len(converted_hashes)} contents that are listed in {manifest_path}.")
+
+    allowed_suffixes = [".pdf", ".txt", ".docx"]
+
+    def file_paths():
+        for path in Path(dir_path).glob("**/*"):
+            if path.suffix.lower() in allowed_suffixes:
+                yield path
+            elif not path.is_dir():
+                logger.warning('Skipped file {0} as type {1} is not supported here. '
+                               'See haystack.file_converter for support of more file types'.format(path, path.suffix))
+
+    def start_executor():
+        return ProcessPoolExecutor(
+            max_workers=num_processes,
+            initializer=_init_conversion_worker,
+            initargs=(converted_hashes, clean_func, split_paragraphs, encoding, timeout)
+        )
+
+    paths = file_paths()
+    # keep a few files per process in flight, so that the directory is listed and converted lazily
+    max_pending = num_processes * 4
+    manifest = open(manifest_path, "a") if manifest_path is not None else None
+    executor = start_executor()
+    pending: Dict = {}
+    # files that were in flight when a worker process died, they are converted one at a time to find the culprit
+    suspects: Deque[Path] = deque()
+    try:
+        while True:
+            if suspects:
+                path = suspects.popleft()
+                pending[executor.submit(_convert_file_in_worker, path)] = path
+            else:
+                for path in paths:
+                    pending[executor.submit(_convert_file_in_worker, path)] = path
+                    if len(pending) >= max_pending:
+                        break
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    file_hash, documents = future.result()
+                except BrokenProcessPool:
+                    # a worker died (e.g. a segfault in a native library) and took the files in flight with it
+                    if pending:
+                        logger.warning(f"A worker process died while converting one of {len(pending) + 1} files, "
+                                       f"converting them one at a time to find the file that caused it.")
+                        suspects.extend([path, *pending.values()])
+                    else:
+                        logger.error(f"A worker process died while converting {path}, skipping it.")
+                    executor.shutdown(wait=False)
+                    executor = start_executor()
+                    pending = {}
+                    break
+                except Exception as e:
+                    logger.error(f"Could not convert {path}: {e}")
+                    continue
+
+                if documents is None:  # content is already in the manifest
+                    continue
+                yield from documents
+                converted_hashes.add(file_hash)
+                if manifest is not None:
+                    manifest.write(json.dumps({"hash": file_hash, "path": str(path)}) + "\n")
+                    manifest.flush()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+        if manifest is not None:
+            manifest.close()
+
+
+# state of the worker processes of parallel_convert_files_to_dicts(), set once by _init_conversion_worker()
+_conversion_worker_state: dict = {}
+
+
+def _init_conversion_worker(
+        converted_hashes: Set[str],
+        clean_func: Optional[Callable],
+        split_paragraphs: bool,
+        encoding: Optional[str],
+        timeout: Optional[float]
+):
+    _conversion_worker_state.update(
+        converted_hashes=converted_hashes,
+        clean_func=clean_func,
+        split_paragraphs=split_paragraphs,
+        encoding=encoding,
+        timeout=timeout,
+        converters={}
+    )
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("Conversion timed out.")
+
+
+def _convert_file_in_worker(path: Path) -> Tuple[str, Optional[List[dict]]]:
+    state = _conversion_worker_state
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    file_hash = hasher.hexdigest()
+    if file_hash in state["converted_hashes"]:
+        return file_hash, None
+
+    suffix = path.suffix.lower()
+    if suffix not in state["converters"]:
+        state["converters"][suffix] = {".pdf": PDFToTextConverter, ".txt": TextConverter, ".docx": DocxToTextConverter}[suffix]()
+    encoding = state["encoding"]
+    if encoding is None and suffix == ".pdf":
+        encoding = "Latin1"
+
+    if state["timeout"] is not None:
+        # a running pdftotext subprocess is killed by subprocess.run() when the TimeoutError is raised
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, state["timeout"])
+    try:
+        documents = _convert_file_to_dicts(
+            path=path,
+            converter=state["converters"][suffix],
+            clean_func=state["clean_func"],
+            split_paragraphs=state["split_paragraphs"],
+            encoding=encoding
+        )
+    finally:
+        if state["timeout"] is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return file_hash, documents
+
+
 def tika_convert_files_to_dicts(
         dir_path: str,
         clean_func: Optional[Callable] = None,
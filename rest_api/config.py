@@ -7,8 +7,21 @@ QUERY_PIPELINE_NAME = os.getenv("QUERY_PIPELINE_NAME", "query")
 INDEXING_PIPELINE_NAME = os.getenv("INDEXING_PIPELINE_NAME", "indexing")
 
 FILE_UPLOAD_PATH = os.getenv("FILE_UPLOAD_PATH", str((Path(__file__).parent / "file-upload").absolute()))
+# uploaded files are indexed in the background by FILE_UPLOAD_WORKERS threads, FILE_UPLOAD_BATCH_SIZE files per pipeline run
+FILE_UPLOAD_WORKERS = int(os.getenv("FILE_UPLOAD_WORKERS", 1))
+FILE_UPLOAD_BATCH_SIZE = int(os.getenv("FILE_UPLOAD_BATCH_SIZE", 16))
+# number of uploaded files waiting to be indexed before /file-upload answers with 503
+FILE_UPLOAD_QUEUE_SIZE = int(os.getenv("FILE_UPLOAD_QUEUE_SIZE", 1000))
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 ROOT_PATH = os.getenv("ROOT_PATH", "/")
 
+# number of query batches (see QUERY_BATCH_SIZE) a worker runs through the pipeline at the same time.
+# The name is kept for compatibility, before query batching it was the number of concurrent requests.
 CONCURRENT_REQUEST_PER_WORKER = int(os.getenv("CONCURRENT_REQUEST_PER_WORKER", 4))
+
+# concurrent /query requests are collected for up to QUERY_BATCH_WAIT_MS and run through the pipeline together
+QUERY_BATCH_SIZE = int(os.getenv("QUERY_BATCH_SIZE", 16))
+QUERY_BATCH_WAIT_MS = float(os.getenv("QUERY_BATCH_WAIT_MS", 5))
+# number of /query requests a worker accepts before it answers with 503, including the requests that are processed
+QUERY_QUEUE_SIZE = int(os.getenv("QUERY_QUEUE_SIZE", 256))
@@ -2,15 +2,19 @@ import json
 import logging
 import os
 import shutil
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 from pydantic import BaseModel
 
 from haystack.pipelines.base import Pipeline
 from rest_api.config import PIPELINE_YAML_PATH, FILE_UPLOAD_PATH, INDEXING_PIPELINE_NAME
+from rest_api.config import FILE_UPLOAD_WORKERS, FILE_UPLOAD_BATCH_SIZE, FILE_UPLOAD_QUEUE_SIZE
 from rest_api.controller.utils import as_form
 
 
@@ -65,7 +69,95 @@ class Response(BaseModel):
     file_id: str
 
 
-@router.post("/file-upload")
+class IndexingJob(BaseModel):
+    job_id: str
+    status: str  # one of "queued", "running", "done" or "failed"
+    files: int
+    files_indexed: int = 0
+    error: Optional[str] = None
+
+
+class IndexingJobQueue:
+    """
+    Indexes uploaded files in background threads, so that large uploads don't block the workers of the REST API.
+
+    Each job runs the indexing pipeline on batches of `batch_size` files. New jobs are rejected with a 503 once
+    `max_queued_files` files are waiting to be indexed. The status of the last `max_finished_jobs` finished jobs is kept.
+    """
+    def __init__(self, pipeline: Pipeline, num_workers: int = 1, batch_size: int = 16, max_queued_files: int = 1000,
+                 max_finished_jobs: int = 1000):
+        self.pipeline = pipeline
+        self.batch_size = batch_size
+        self.max_queued_files = max_queued_files
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="indexing")
+        self._jobs: Dict[str, IndexingJob] = OrderedDict()
+        self._finished_job_ids: List[str] = []
+        self._num_queued_files = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, num_files: int) -> IndexingJob:
+        """
+        Create a job for `num_files` files, or raise a 503 if the queue is full.
+        """
+        with self._lock:
+            if self._num_queued_files + num_files > self.max_queued_files and self._num_queued_files > 0:
+                raise HTTPException(status_code=503, detail="The server is busy indexing files, try again later.")
+            self._num_queued_files += num_files
+            job = IndexingJob(job_id=uuid.uuid4().hex, status="queued", files=num_files)
+            self._jobs[job.job_id] = job
+            return job
+
+    def submit(self, job: IndexingJob, file_paths: List[Path], file_metas: List[dict], params: dict) -> IndexingJob:
+        """
+        Index the uploaded files of a reserved job in the background.
+        """
+        self._executor.submit(self._run, job, file_paths, file_metas, params)
+        return self.get(job.job_id)
+
+    def cancel(self, job: IndexingJob, error: str):
+        self._finish(job, status="failed", error=error)
+
+    def get(self, job_id: str) -> Optional[IndexingJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.copy() if job else None
+
+    def _run(self, job: IndexingJob, file_paths: List[Path], file_metas: List[dict], params: dict):
+        with self._lock:
+            job.status = "running"
+        try:
+            for start in range(0, len(file_paths), self.batch_size):
+                end = start + self.batch_size
+                self.pipeline.run(file_paths=file_paths[start:end], meta=file_metas[start:end], params=params)
+                with self._lock:
+                    job.files_indexed += len(file_paths[start:end])
+                    self._num_queued_files -= len(file_paths[start:end])
+        except Exception as e:
+            logger.exception(f"Indexing job {job.job_id} failed.")
+            self._finish(job, status="failed", error=str(e))
+        else:
+            self._finish(job, status="done")
+
+    def _finish(self, job: IndexingJob, status: str, error: Optional[str] = None):
+        with self._lock:
+            self._num_queued_files -= job.files - job.files_indexed
+            job.status = status
+            job.error = error
+            self._finished_job_ids.append(job.job_id)
+            while len(self._finished_job_ids) > self.max_finished_jobs:
+                self._jobs.pop(self._finished_job_ids.pop(0), None)
+
+
+INDEXING_JOBS = IndexingJobQueue(
+    pipeline=INDEXING_PIPELINE,
+    num_workers=FILE_UPLOAD_WORKERS,
+    batch_size=FILE_UPLOAD_BATCH_SIZE,
+    max_queued_files=FILE_UPLOAD_QUEUE_SIZE,
+) if INDEXING_PIPELINE else None
+
+
+@router.post("/file-upload", response_model=IndexingJob)
 def upload_file(
     files: List[UploadFile] = File(...),
     meta: Optional[str] = Form("null"),  # JSON serialized string
@@ -73,34 +165,59 @@ def upload_file(
     preprocessor_params: PreprocessorParams = Depends(PreprocessorParams.as_form)
 ):
     """
-    You can use this endpoint to upload a file for indexing 
+    You can use this endpoint to upload files for indexing 
     (see [http://localhost:3000/guides/rest-api#indexing-documents-in-the-haystack-rest-api-document-store]).
+    The files are indexed in the background. The response contains the id of the indexing job, use
+    `GET /file-upload/{job_id}` to check when the files are indexed.
     """
-    if not INDEXING_PIPELINE:
+    if not INDEXING_PIPELINE or not INDEXING_JOBS:
         raise HTTPException(status_code=501, detail="Indexing Pipeline is not configured.")
 
+    # validate the meta before reserving a place in the queue, so that a bad request doesn't leave a queued job behind
+    try:
+        meta = json.loads(meta) or {}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid meta, it must be a JSON object: {e}")
+    if not isinstance(meta, dict):
+        raise HTTPException(status_code=400, detail="Invalid meta, it must be a JSON object.")
+
+    job = INDEXING_JOBS.reserve(num_files=len(files))
     file_paths: list = []
     file_metas: list = []
-    meta = json.loads(meta) or {}
 
-    for file in files:
-        try:
-            file_path = Path(FILE_UPLOAD_PATH) / f"{uuid.uuid4().hex}_{file.filename}"
-            with file_path.open("wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-
-            file_paths.append(file_path)
-            meta["name"] = file.filename
-            file_metas.append(meta)
-        finally:
-            file.file.close()
-
-    INDEXING_PIPELINE.run(
-            file_paths=file_paths,
-            meta=file_metas,
-            params={
-                "TextFileConverter": fileconverter_params.dict(), 
-                "PDFFileConverter": fileconverter_params.dict(),
-                "Preprocessor": preprocessor_params.dict()
-            },
+    try:
+        for file in files:
+            try:
+                file_path = Path(FILE_UPLOAD_PATH) / f"{uuid.uuid4().hex}_{file.filename}"
+                with file_path.open("wb") as buffer:
+                    shutil.copyfileobj(file.file, buffer)
+
+                file_paths.append(file_path)
+                file_metas.append({**meta, "name": file.filename})
+            finally:
+                file.file.close()
+    except Exception as e:
+        INDEXING_JOBS.cancel(job, error=f"Upload failed: {e}")
+        raise
+
+    return INDEXING_JOBS.submit(
+        job,
+        file_paths=file_paths,
+        file_metas=file_metas,
+        params={
+            "TextFileConverter": fileconverter_params.dict(), 
+            "PDFFileConverter": fileconverter_params.dict(),
+            "Preprocessor": preprocessor_params.dict()
+        },
     )
+
+
+@router.get("/file-upload/{job_id}", response_model=IndexingJob)
+def get_indexing_job(job_id: str):
+    """
+    This endpoint returns the status of an indexing job started with `POST /file-upload`.
+    """
+    job = INDEXING_JOBS.get(job_id) if INDEXING_JOBS else None
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Indexing job '{job_id}' not found.")
+    return job
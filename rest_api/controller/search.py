@@ -1,6 +1,10 @@
+from typing import List, Union
+
 import logging
 import time
 import json
+from collections import defaultdict
+from copy import deepcopy
 from pathlib import Path
 from numpy import ndarray
 
@@ -10,8 +14,9 @@ import haystack
 from haystack.pipelines.base import Pipeline
 from rest_api.config import PIPELINE_YAML_PATH, QUERY_PIPELINE_NAME
 from rest_api.config import LOG_LEVEL, CONCURRENT_REQUEST_PER_WORKER
+from rest_api.config import QUERY_BATCH_SIZE, QUERY_BATCH_WAIT_MS, QUERY_QUEUE_SIZE
 from rest_api.schema import QueryRequest, QueryResponse
-from rest_api.controller.utils import RequestLimiter
+from rest_api.controller.utils import QueryBatcher
 
 
 logging.getLogger("haystack").setLevel(LOG_LEVEL)
@@ -30,8 +35,7 @@ RETRIEVER = PIPELINE.get_node(name="Retriever")
 DOCUMENT_STORE = RETRIEVER.document_store if RETRIEVER else None
 logging.info(f"Loaded pipeline nodes: {PIPELINE.graph.nodes.keys()}")
 
-concurrency_limiter = RequestLimiter(CONCURRENT_REQUEST_PER_WORKER)
-logging.info("Concurrent requests per worker: {CONCURRENT_REQUEST_PER_WORKER}")
+logging.info(f"Concurrent query batches per worker: {CONCURRENT_REQUEST_PER_WORKER}")
 
 
 @router.get("/initialized")
@@ -55,20 +59,70 @@ def haystack_version():
 
 
 @router.post("/query", response_model=QueryResponse, response_model_exclude_none=True)
-def query(request: QueryRequest):
+async def query(request: QueryRequest):
     """
     This endpoint receives the question as a string and allows the requester to set 
     additional parameters that will be passed on to the Haystack pipeline.
     """
-    with concurrency_limiter.run():
-        result = _process_request(PIPELINE, request)
-        return result
+    return await query_batcher.submit(request)
 
 
 def _process_request(pipeline, request) -> QueryResponse:
     start_time = time.time()
     
-    params = request.params or {}
+    params = _format_params(request.params)
+
+    result = pipeline.run(query=request.query, params=params,debug=request.debug)
+    _format_result(result)
+    
+    end_time = time.time()
+    logger.info(json.dumps({"request": request, "response": result, "time": f"{(end_time - start_time):.2f}"}, default=str))
+
+    return result
+
+
+def _process_requests(pipeline, requests: List[QueryRequest]) -> List[Union[QueryResponse, Exception]]:
+    """
+    Run the queries of several requests through the pipeline. Requests with the same params are run together with
+    `Pipeline.run_batch()`. If that fails, the requests are run one by one, so that each request gets its own error.
+    """
+    requests_by_params = defaultdict(list)
+    for index, request in enumerate(requests):
+        key = json.dumps([request.params, request.debug], sort_keys=True, default=str)
+        requests_by_params[key].append(index)
+
+    results: List[Union[QueryResponse, Exception]] = [None] * len(requests)  # type: ignore
+    for indices in requests_by_params.values():
+        if len(indices) > 1:
+            start_time = time.time()
+            request = requests[indices[0]]
+            try:
+                batch_results = pipeline.run_batch(
+                    queries=[requests[index].query for index in indices],
+                    params=_format_params(request.params),
+                    debug=request.debug
+                )
+            except Exception as e:
+                logger.warning(f"Running {len(indices)} queries together failed ({e}), running them one by one.")
+            else:
+                end_time = time.time()
+                for index, result in zip(indices, batch_results):
+                    _format_result(result)
+                    logger.info(json.dumps({"request": requests[index], "response": result, "batch_size": len(indices),
+                                            "time": f"{(end_time - start_time):.2f}"}, default=str))
+                    results[index] = result
+                continue
+        for index in indices:
+            try:
+                results[index] = _process_request(pipeline, requests[index])
+            except Exception as e:
+                results[index] = e
+    return results
+
+
+def _format_params(params) -> dict:
+    # the params of a request may be shared by several queries, the formatted params are a copy
+    params = deepcopy(params) or {}
 
     # format global, top-level filters (e.g. "params": {"filters": {"name": ["some"]}})
     if "filters" in params.keys():
@@ -78,18 +132,23 @@ def _process_request(pipeline, request) -> QueryResponse:
     for key, value in params.items():
         if "filters" in params[key].keys():
             params[key]["filters"] = _format_filters(params[key]["filters"])
+    return params
 
-    result = pipeline.run(query=request.query, params=params,debug=request.debug)
-    
+
+def _format_result(result: dict):
     # if any of the documents contains an embedding as an ndarray the latter needs to be converted to list of float
-    for document in result['documents'] or []:
+    for document in result.get('documents') or []:
         if isinstance(document.embedding, ndarray):
             document.embedding = document.embedding.tolist()
-    
-    end_time = time.time()
-    logger.info(json.dumps({"request": request, "response": result, "time": f"{(end_time - start_time):.2f}"}, default=str))
 
-    return result
+
+query_batcher = QueryBatcher(
+    process_batch=lambda requests: _process_requests(PIPELINE, requests),
+    max_batch_size=QUERY_BATCH_SIZE,
+    max_wait_time=QUERY_BATCH_WAIT_MS / 1000,
+    max_queue_size=QUERY_QUEUE_SIZE,
+    max_concurrent_batches=CONCURRENT_REQUEST_PER_WORKER,
+)
 
 
 def _format_filters(filters):
@@ -1,25 +1,106 @@
+from typing import Any, Callable, List, Optional, Set, Type, NewType
+
+import asyncio
 import inspect
-from contextlib import contextmanager
-from threading import Semaphore
-from typing import Type, NewType
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import Form, HTTPException
 from pydantic import BaseModel
 
 
-class RequestLimiter:
-    def __init__(self, limit):
-        self.semaphore = Semaphore(limit - 1)
+class QueryBatcher:
+    """
+    Collects the requests that arrive within a short time window and processes them together in a thread, so that
+    the pipeline can run its models on batches of queries instead of one query at a time.
 
-    @contextmanager
-    def run(self):
-        acquired = self.semaphore.acquire(blocking=False)
-        if not acquired:
+    Requests are only rejected (with a 503) once the queue is full, instead of as soon as all threads are busy.
+    """
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait_time: float = 0.005,
+        max_queue_size: int = 256,
+        max_concurrent_batches: int = 1,
+    ):
+        """
+        :param process_batch: Function that processes a list of requests in a thread. It returns one result per
+                              request, or an Exception for each request that failed.
+        :param max_batch_size: Maximum number of requests per batch.
+        :param max_wait_time: Seconds to wait for more requests after the first request of a batch arrived.
+        :param max_queue_size: Maximum number of requests that are waiting or being processed.
+        :param max_concurrent_batches: Maximum number of batches that are processed at the same time.
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_time = max_wait_time
+        self.max_queue_size = max_queue_size
+        self.max_concurrent_batches = max_concurrent_batches
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix="query_batch")
+        # created in the event loop of the first request
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._running_batches: Set[asyncio.Task] = set()
+        self._num_requests = 0
+
+    async def submit(self, request: Any) -> Any:
+        """
+        Add a request to the next batch and wait for its result.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._num_requests = 0
+            self._collector = loop.create_task(self._collect_batches(self._queue))
+        if self._num_requests >= self.max_queue_size:
             raise HTTPException(status_code=503, detail="The server is busy processing requests.")
+
+        self._num_requests += 1
+        try:
+            future = loop.create_future()
+            self._queue.put_nowait((request, future))  # type: ignore
+            return await future
+        finally:
+            self._num_requests -= 1
+
+    async def _collect_batches(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        batch_slots = asyncio.Semaphore(self.max_concurrent_batches)
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait_time
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await batch_slots.acquire()
+            task = loop.create_task(self._run_batch(batch, batch_slots))
+            # keep a reference to the task until it is done
+            self._running_batches.add(task)
+            task.add_done_callback(self._running_batches.discard)
+
+    async def _run_batch(self, batch: List[tuple], batch_slots: asyncio.Semaphore):
         try:
-            yield acquired
+            requests = [request for request, _ in batch]
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(self._executor, self.process_batch, requests)
+            except Exception as e:
+                results = [e] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():  # the client went away
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
         finally:
-            self.semaphore.release()
+            batch_slots.release()
 
 
 StringId = NewType('StringId', str)
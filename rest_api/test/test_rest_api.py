@@ -1,11 +1,18 @@
 import os
+import time
+import asyncio
+import threading
 from pathlib import Path
 
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 
 from rest_api.application import app
+from rest_api.controller.search import _process_requests
+from rest_api.controller.utils import QueryBatcher
+from rest_api.schema import QueryRequest
 
 
 FEEDBACK={
@@ -43,6 +50,18 @@ def exclude_no_answer(responses):
     return responses
 
 
+def wait_for_indexing(client: TestClient, upload_response, timeout: float = 60):
+    assert 200 == upload_response.status_code
+    job_id = upload_response.json()["job_id"]
+    start = time.time()
+    while time.time() - start < timeout:
+        job = client.get(url=f"/file-upload/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.1)
+    raise TimeoutError(f"Indexing job {job_id} did not finish within {timeout} seconds.")
+
+
 @pytest.mark.elasticsearch
 @pytest.fixture(scope="session")
 def client() -> TestClient:
@@ -64,7 +83,7 @@ def populated_client(client: TestClient) -> TestClient:
     ]
     for index, fi in enumerate(files_to_upload):
         response = client.post(url="/file-upload", files=fi, data={"meta": f'{{"meta_key": "meta_value", "meta_index": "{index}"}}'})
-        assert 200 == response.status_code
+        assert wait_for_indexing(client, response)["status"] == "done"
     yield client
     client.post(url="/documents/delete_by_filters", data='{"filters": {}}')
 
@@ -84,7 +103,7 @@ def test_get_documents():
     ]
     for index, fi in enumerate(files_to_upload):
         response = client.post(url="/file-upload", files=fi, data={"meta": f'{{"meta_key": "meta_value_get"}}'})
-        assert 200 == response.status_code
+        assert wait_for_indexing(client, response)["status"] == "done"
 
     # Get the documents
     response = client.post(url="/documents/get_by_filters", data='{"filters": {"meta_key": ["meta_value_get"]}}')
@@ -115,7 +134,7 @@ def test_delete_documents():
     ]
     for index, fi in enumerate(files_to_upload):
         response = client.post(url="/file-upload", files=fi, data={"meta": f'{{"meta_key": "meta_value_del", "meta_index": "{index}"}}'})
-        assert 200 == response.status_code
+        assert wait_for_indexing(client, response)["status"] == "done"
 
     # Make sure there are two docs
     response = client.post(url="/documents/get_by_filters", data='{"filters": {"meta_key": ["meta_value_del"]}}')
@@ -148,6 +167,35 @@ def test_file_upload(client: TestClient):
     file_to_upload = {'files': (Path(__file__).parent / "samples"/"pdf"/"sample_pdf_1.pdf").open('rb')}
     response = client.post(url="/file-upload", files=file_to_upload, data={"meta": '{"meta_key": "meta_value", "non-existing-field": "wrong-value"}'})
     assert 200 == response.status_code
+    job = wait_for_indexing(client, response)
+    assert job["status"] == "done"
+    assert job["files"] == job["files_indexed"] == 1
+
+
+def test_file_upload_sets_name_per_file(client: TestClient):
+    client.post(url="/documents/delete_by_filters", data='{"filters": {"meta_key": ["meta_value_names"]}}')
+    files_to_upload = [
+        ('files', (Path(__file__).parent / "samples"/"docs"/"doc_1.txt").open('rb')),
+        ('files', (Path(__file__).parent / "samples"/"docs"/"doc_2.txt").open('rb'))
+    ]
+    response = client.post(url="/file-upload", files=files_to_upload, data={"meta": '{"meta_key": "meta_value_names"}'})
+    assert wait_for_indexing(client, response)["status"] == "done"
+
+    response = client.post(url="/documents/get_by_filters", data='{"filters": {"meta_key": ["meta_value_names"]}}')
+    names = sorted(doc["meta"]["name"] for doc in response.json())
+    assert names == ["doc_1.txt", "doc_2.txt"]
+
+
+def test_file_upload_with_invalid_meta(client: TestClient):
+    for meta in ['{"meta_key": ', '["meta_value"]']:
+        file_to_upload = {'files': (Path(__file__).parent / "samples"/"docs"/"doc_1.txt").open('rb')}
+        response = client.post(url="/file-upload", files=file_to_upload, data={"meta": meta})
+        assert 400 == response.status_code
+
+
+def test_get_unknown_indexing_job(client: TestClient):
+    response = client.get(url="/file-upload/unknown")
+    assert 404 == response.status_code
 
 
 def test_query_with_no_filter(populated_client: TestClient):
@@ -238,3 +286,73 @@ def test_get_feedback_malformed_query(client: TestClient):
     feedback["unexpected_field"] = "misplaced-value"
     response = client.post(url="/feedback", json=feedback)
     assert response.status_code == 422
+
+
+def test_query_batcher_forms_batches():
+    batches = []
+
+    def process_batch(requests):
+        batches.append(requests)
+        return [request.upper() for request in requests]
+
+    async def submit_all():
+        batcher = QueryBatcher(process_batch=process_batch, max_batch_size=4, max_wait_time=0.1)
+        return await asyncio.gather(*[batcher.submit(request) for request in ["a", "b", "c", "d", "e"]])
+
+    assert asyncio.run(submit_all()) == ["A", "B", "C", "D", "E"]
+    assert batches == [["a", "b", "c", "d"], ["e"]]
+
+
+def test_query_batcher_rejects_requests_when_queue_is_full():
+    processing = threading.Event()
+
+    def process_batch(requests):
+        processing.wait(timeout=10)
+        return requests
+
+    async def submit_too_many():
+        batcher = QueryBatcher(process_batch=process_batch, max_batch_size=1, max_wait_time=0, max_queue_size=2)
+        accepted = [asyncio.ensure_future(batcher.submit(request)) for request in ["a", "b"]]
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as exc_info:
+            await batcher.submit("c")
+        processing.set()
+        return exc_info.value.status_code, await asyncio.gather(*accepted)
+
+    assert asyncio.run(submit_too_many()) == (503, ["a", "b"])
+
+
+def test_query_batcher_raises_exceptions_per_request():
+    def process_batch(requests):
+        if "fail batch" in requests:
+            raise RuntimeError("batch failed")
+        return [ValueError(request) if request.startswith("fail") else request for request in requests]
+
+    async def submit(batcher, requests):
+        return await asyncio.gather(*[batcher.submit(request) for request in requests], return_exceptions=True)
+
+    batcher = QueryBatcher(process_batch=process_batch, max_batch_size=4, max_wait_time=0.1)
+    results = asyncio.run(submit(batcher, ["a", "fail b", "c"]))
+    assert results[0] == "a" and results[2] == "c"
+    assert isinstance(results[1], ValueError) and str(results[1]) == "fail b"
+
+    # if the whole batch fails, every caller gets the exception
+    batcher = QueryBatcher(process_batch=process_batch, max_batch_size=4, max_wait_time=0.1)
+    results = asyncio.run(submit(batcher, ["a", "fail batch"]))
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_process_requests_runs_queries_one_by_one_after_a_failed_batch():
+    class Pipeline:
+        def run_batch(self, queries, params, debug):
+            raise RuntimeError("batch failed")
+
+        def run(self, query, params, debug):
+            if query == "bad query":
+                raise ValueError(query)
+            return {"query": query, "answers": []}
+
+    requests = [QueryRequest(query="good query"), QueryRequest(query="bad query")]
+    results = _process_requests(Pipeline(), requests)
+    assert results[0] == {"query": "good query", "answers": []}
+    assert isinstance(results[1], ValueError)
@@ -0,0 +1,57 @@
+"""
+This script benchmarks the latency of embedding single queries with the DensePassageRetriever.
+It compares the direct query encoding path used by `embed_queries()` with the generic `_get_predictions()` path
+(Processor, Dataset, DataLoader) and checks that both produce the same embeddings.
+"""
+
+import time
+
+import numpy as np
+
+from haystack.document_stores import InMemoryDocumentStore
+from haystack.nodes import DensePassageRetriever
+
+
+QUERIES = [
+    "who is the father of arya stark?",
+    "where is the great barrier reef located?",
+    "when was the first iphone released",
+    "what is the capital of australia?",
+    "how many episodes are in season 7 of game of thrones",
+]
+
+
+def benchmark_query_encoding(use_gpu: bool = False, n_runs: int = 100):
+    retriever = DensePassageRetriever(
+        document_store=InMemoryDocumentStore(),
+        query_embedding_model="facebook/dpr-question_encoder-single-nq-base",
+        passage_embedding_model="facebook/dpr-ctx_encoder-single-nq-base",
+        use_gpu=use_gpu,
+        progress_bar=False,
+    )
+
+    # the embeddings of both paths need to match
+    for query in QUERIES:
+        direct_embedding = retriever.embed_queries(texts=[query])
+        processor_embedding = retriever._get_predictions([{"query": query}])["query"]
+        assert np.allclose(direct_embedding, processor_embedding, atol=1e-5), query
+    direct_embeddings = retriever.embed_queries(texts=QUERIES)
+    processor_embeddings = retriever._get_predictions([{"query": query} for query in QUERIES])["query"]
+    assert np.allclose(direct_embeddings, processor_embeddings, atol=1e-5)
+
+    timings = {}
+    for path, embed in [
+        ("processor", lambda query: retriever._get_predictions([{"query": query}])["query"]),
+        ("direct", lambda query: retriever.embed_queries(texts=[query])),
+    ]:
+        embed(QUERIES[0])  # warm up
+        start = time.perf_counter()
+        for i in range(n_runs):
+            embed(QUERIES[i % len(QUERIES)])
+        timings[path] = (time.perf_counter() - start) / n_runs * 1000
+        print(f"{path:>10}: {timings[path]:.2f} ms per query")
+    print(f"overhead removed: {timings['processor'] - timings['direct']:.2f} ms per query")
+
+
+if __name__ == "__main__":
+    benchmark_query_encoding(use_gpu=False)
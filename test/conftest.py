@@ -38,7 +38,7 @@ from haystack.nodes.answer_generator.transformers import RAGenerator, RAGenerato
 from haystack.modeling.infer import Inferencer, QAInferencer
 from haystack.nodes.ranker import SentenceTransformersRanker
 from haystack.nodes.document_classifier.transformers import TransformersDocumentClassifier
-from haystack.nodes.retriever.sparse import ElasticsearchFilterOnlyRetriever, ElasticsearchRetriever, TfidfRetriever
+from haystack.nodes.retriever.sparse import ElasticsearchFilterOnlyRetriever, ElasticsearchRetriever, TfidfRetriever, BM25Retriever
 from haystack.nodes.retriever.dense import DensePassageRetriever, EmbeddingRetriever, TableTextRetriever
 from haystack.schema import Document
 
@@ -499,6 +499,8 @@ def get_retriever(retriever_type, document_store):
     elif retriever_type == "tfidf":
         retriever = TfidfRetriever(document_store=document_store)
         retriever.fit()
+    elif retriever_type == "bm25":
+        retriever = BM25Retriever(document_store=document_store)
     elif retriever_type == "embedding":
         retriever = EmbeddingRetriever(
             document_store=document_store,
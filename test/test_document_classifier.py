@@ -70,6 +70,19 @@ def test_document_classifier_batch_size(batched_document_classifier):
         assert doc.to_dict()["meta"]["classification"]["label"] == expected_labels[i]
 
 
+@pytest.mark.slow
+def test_document_classifier_predict_stream(batched_document_classifier):
+    texts = ["""That's good. I like it.""", """That's bad. I don't like it.""", """That's good. I like it."""*700]
+    docs = (Document(content=texts[i % 3], id=str(i)) for i in range(7))
+
+    results = list(batched_document_classifier.predict_stream(docs, buffer_size=3))
+    assert [doc.id for doc in results] == [str(i) for i in range(7)]
+    expected_labels = ["joy", "sadness", "joy"]
+    for i, doc in enumerate(results):
+        assert doc.meta["classification"]["label"] == expected_labels[i % 3]
+    assert batched_document_classifier.document_count == 7
+
+
 @pytest.mark.slow
 def test_document_classifier_as_index_node(indexing_document_classifier):
     assert isinstance(indexing_document_classifier, BaseDocumentClassifier)
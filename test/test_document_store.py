@@ -2,7 +2,9 @@ import numpy as np
 import pandas as pd
 import pytest
 import json
+import os
 import responses
+from datetime import datetime
 from responses import matchers
 from unittest.mock import Mock
 from elasticsearch import Elasticsearch
@@ -15,6 +17,7 @@ from haystack.errors import DuplicateDocumentError
 from haystack.schema import Document, Label, Answer, Span
 from haystack.document_stores.elasticsearch import ElasticsearchDocumentStore
 from haystack.document_stores.faiss import FAISSDocumentStore
+from haystack.document_stores.sql import DocumentORM
 from haystack.nodes import EmbeddingRetriever
 from haystack.pipelines import DocumentSearchPipeline
 
@@ -263,6 +266,37 @@ def test_update_existing_documents(document_store, update_existing_documents):
         assert stored_docs[0].content == original_docs[0]["content"]
 
 
+@pytest.mark.parametrize("document_store", ["sql"], indirect=True)
+def test_sql_overwrite_documents_in_batches(document_store):
+    document_store.write_documents(
+        [{"content": f"text{i}", "id": str(i), "meta_field": "orig"} for i in range(5)], batch_size=2
+    )
+    created_at = datetime(2020, 1, 1)
+    document_store.session.query(DocumentORM).filter_by(id="1").update({"created_at": created_at})
+    document_store.session.commit()
+    updated_docs = [
+        {"content": "text1_first", "id": "1", "meta_field": "first"},
+        {"content": "text1_new", "id": "1", "other_field": "new"},
+        {"content": "text5", "id": "5", "meta_field": "new"},
+    ]
+    document_store.write_documents(updated_docs, duplicate_documents="overwrite", batch_size=2)
+
+    assert document_store.get_document_count() == 6
+    updated_doc = document_store.get_document_by_id("1")
+    assert updated_doc.content == "text1_new"
+    assert updated_doc.meta == {"other_field": "new"}
+    assert document_store.get_document_count(filters={"meta_field": ["orig"]}) == 4
+    # overwritten documents keep their creation time
+    assert document_store.session.query(DocumentORM.created_at).filter_by(id="1").scalar() == created_at
+    assert document_store.session.query(DocumentORM.created_at).filter_by(id="5").scalar() is not None
+
+    # overwriting a document in another index leaves this one untouched
+    document_store.write_documents([{"content": "text1_other_index", "id": "1", "meta_field": "other"}],
+                                   index="haystack_test_other", duplicate_documents="overwrite")
+    assert document_store.get_document_by_id("1").content == "text1_new"
+    assert document_store.get_document_count(filters={"other_field": ["new"]}) == 1
+
+
 def test_write_document_meta(document_store):
     documents = [
         {"content": "dict_without_meta", "id": "1"},
@@ -546,6 +580,111 @@ def test_delete_documents_by_id_with_filters(document_store_with_docs):
     assert all(doc.id in all_ids_left for doc in docs_not_to_delete)
 
 
+@pytest.mark.parametrize("similarity", ["dot_product", "cosine"])
+def test_memory_query_by_embedding_after_write_and_delete(similarity, tmp_path):
+    document_store = get_document_store(document_store_type="memory", tmp_path=tmp_path, similarity=similarity)
+    embeddings = np.random.rand(21, 768).astype(np.float32)
+    documents = [
+        Document(content=f"text_{i}", id=str(i), meta={"meta_field": str(i % 2)}, embedding=embeddings[i])
+        for i in range(20)
+    ]
+    document_store.write_documents(documents)
+    document_store.delete_documents(ids=["3", "8"])
+    document_store.write_documents([Document(content="text_5", id="5", meta={"meta_field": "1"}, embedding=embeddings[20])])
+    document_store.write_documents([Document(content="text_6", id="6", meta={"meta_field": "0"})])
+
+    query_emb = np.random.rand(768).astype(np.float32)
+    expected = {}
+    for doc in document_store.get_all_documents(return_embedding=True):
+        if doc.embedding is None:
+            continue
+        if similarity == "dot_product":
+            expected[doc.id] = np.dot(query_emb, doc.embedding)
+        else:
+            expected[doc.id] = np.dot(query_emb, doc.embedding) / (np.linalg.norm(query_emb) * np.linalg.norm(doc.embedding))
+    expected_ids = sorted(expected, key=expected.get, reverse=True)
+
+    results = document_store.query_by_embedding(query_emb, top_k=5)
+    assert [doc.id for doc in results] == expected_ids[:5]
+    assert all(doc.embedding is not None for doc in results)
+
+    results = document_store.query_by_embedding(query_emb, top_k=5, filters={"meta_field": ["1"]})
+    assert [doc.id for doc in results] == [id for id in expected_ids if int(id) % 2 == 1][:5]
+
+    results[0].meta["meta_field"] = "changed"
+    assert document_store.get_document_by_id(results[0].id).meta["meta_field"] == "1"
+
+
+@pytest.mark.parametrize("document_store", ["memory", "faiss", "elasticsearch"], indirect=True)
+def test_query_by_embedding_batch(document_store):
+    documents = [
+        Document(content=f"text_{i}", id=str(i), meta={"meta_field": str(i % 2)}, embedding=np.random.rand(768).astype(np.float32))
+        for i in range(10)
+    ]
+    document_store.write_documents(documents)
+
+    query_embs = np.random.rand(4, 768).astype(np.float32)
+    results = document_store.query_by_embedding_batch(query_embs, top_k=3)
+    assert len(results) == 4
+    for query_emb, result in zip(query_embs, results):
+        expected = document_store.query_by_embedding(query_emb, top_k=3)
+        assert [doc.id for doc in result] == [doc.id for doc in expected]
+        assert [doc.score for doc in result] == pytest.approx([doc.score for doc in expected], abs=1e-5)
+
+    # the same document retrieved by two queries gets a separate object per query
+    results = document_store.query_by_embedding_batch(np.stack([query_embs[0], query_embs[0]]), top_k=3)
+    assert [doc.id for doc in results[0]] == [doc.id for doc in results[1]]
+    assert results[0][0] is not results[1][0]
+
+
+class _ProcessIdRetriever:
+    """
+    Embeds a document as its integer id, followed by the id of the process that created the embedding.
+    Defined on module level so that the worker processes of update_embeddings() can unpickle it.
+    """
+    def embed_documents(self, docs):
+        return [np.array([int(doc.id), os.getpid()], dtype=np.float32) for doc in docs]
+
+
+@pytest.mark.parametrize("document_store_type", ["memory", "faiss"])
+def test_update_embeddings_with_multiple_workers(document_store_type, tmp_path):
+    document_store = get_document_store(document_store_type, tmp_path, embedding_dim=2, similarity="dot_product")
+    document_store.write_documents([Document(content=f"text_{i}", id=str(i)) for i in range(25)])
+
+    document_store.update_embeddings(_ProcessIdRetriever(), batch_size=10, num_workers=2, threads_per_worker=1)
+
+    documents = document_store.get_all_documents(return_embedding=True)
+    assert len(documents) == 25
+    assert all(doc.embedding[0] == int(doc.id) for doc in documents)
+    assert os.getpid() not in {int(doc.embedding[1]) for doc in documents}
+
+
+@pytest.mark.parametrize("document_store", ["memory"], indirect=True)
+def test_memory_filters_after_overwrite_and_delete(document_store):
+    documents = [
+        Document(content=f"text_{i}", id=str(i), meta={"meta_field": str(i % 3), "year": "2020" if i < 5 else "2021"})
+        for i in range(10)
+    ]
+    document_store.write_documents(documents)
+    document_store.write_documents([Document(content="text_0", id="0", meta={"meta_field": "2", "year": "2021"})])
+    document_store.delete_documents(ids=["5"])
+    document_store.delete_documents(filters={"meta_field": ["1"], "year": ["2020"]})
+
+    documents = document_store.get_all_documents(filters={"meta_field": ["2"]})
+    assert [doc.id for doc in documents] == ["0", "2", "8"]
+    assert document_store.get_document_count(filters={"meta_field": ["2"], "year": ["2021"]}) == 2
+    assert document_store.get_document_count(filters={"meta_field": ["0"]}) == 3
+    assert document_store.get_document_count(filters={"meta_field": ["0", "1"], "year": ["2020"]}) == 1
+    assert document_store.get_document_count(filters={"unknown_field": ["0"]}) == 0
+    assert document_store.get_document_count() == 7
+
+    # changing a fetched document doesn't change the stored one, which would desync the meta index
+    document = document_store.get_documents_by_id(["2"])[0]
+    document.meta["meta_field"] = "0"
+    assert document_store.get_document_by_id("2").meta["meta_field"] == "2"
+    assert document_store.get_document_count(filters={"meta_field": ["2"]}) == 3
+
+
 # exclude weaviate because it does not support storing labels
 @pytest.mark.parametrize("document_store", ["elasticsearch", "faiss", "memory", "milvus"], indirect=True)
 def test_labels(document_store):
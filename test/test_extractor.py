@@ -1,5 +1,6 @@
 import pytest
 
+from haystack.schema import Document
 from haystack.nodes.retriever.sparse import ElasticsearchRetriever
 from haystack.nodes.reader import FARMReader
 from haystack.pipelines import Pipeline
@@ -54,4 +55,28 @@ def test_extractor_output_simplifier(document_store_with_docs):
     assert simplified[0] == {
         "answer": "Carla",
         "entities": ["Carla"]
-    }
\ No newline at end of file
+    }
+
+def test_extractor_batch_with_long_texts():
+    ner = EntityExtractor(max_seq_len=32, stride=8, entity_cache_size=10)
+    short_text = "My name is Carla and I live in Berlin."
+    long_text = "This sentence makes the text longer than one window. " * 10 + short_text
+    documents = [Document(content=short_text), Document(content=long_text)]
+
+    output, _ = ner.run(documents=documents)
+    for document in output["documents"]:
+        entities = {entity["word"]: entity for entity in document.meta["entities"]}
+        assert "Carla" in entities and "Berlin" in entities
+        # the offsets of entities in later windows refer to the whole text
+        assert document.content[entities["Berlin"]["start"]:entities["Berlin"]["end"]] == "Berlin"
+    assert len(ner.entity_cache) == 2
+
+    # entities of unchanged documents are taken from the cache
+    ner.model = None
+    output, _ = ner.run(documents=[Document(content=long_text)])
+    assert "Berlin" in [entity["word"] for entity in output["documents"][0].meta["entities"]]
+
+    # changing the entities of a document doesn't change the cached ones
+    output["documents"][0].meta["entities"][0]["word"] = "changed"
+    output, _ = ner.run(documents=[Document(content=long_text)])
+    assert "changed" not in [entity["word"] for entity in output["documents"][0].meta["entities"]]
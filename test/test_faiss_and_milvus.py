@@ -217,6 +217,58 @@ def test_update_existing_docs(document_store, retriever):
     assert not np.allclose(old_documents_indexed[0].embedding, new_documents_indexed[0].embedding, rtol=0.01)
 
 
+def test_faiss_stable_vector_ids(tmp_path):
+    document_store = FAISSDocumentStore(
+        sql_url=f"sqlite:////{tmp_path/'test_faiss_stable_vector_ids.db'}",
+        stable_vector_ids=True,
+        isolation_level="AUTOCOMMIT"
+    )
+    document_store.write_documents(DOCUMENTS, batch_size=4)
+    vector_ids = {doc.content: doc.meta["vector_id"] for doc in document_store.get_all_documents()}
+
+    # an overwritten document keeps its vector id, only its vector gets replaced
+    new_embedding = np.random.rand(768).astype(np.float32)
+    document_store.write_documents([{**DOCUMENTS[0], "embedding": new_embedding}], duplicate_documents="overwrite")
+    assert document_store.get_embedding_count() == len(DOCUMENTS)
+    stored_doc = document_store.get_all_documents(filters={"name": ["name_1"]}, return_embedding=True)[0]
+    assert stored_doc.meta["vector_id"] == vector_ids["text_1"]
+    assert np.allclose(stored_doc.embedding, new_embedding, rtol=0.01)
+
+    # deleting documents leaves the vectors of the other documents untouched
+    document_store.delete_documents(filters={"year": ["2020"]})
+    assert document_store.get_embedding_count() == 3
+    for doc in document_store.get_all_documents(return_embedding=True):
+        original_doc = [d for d in DOCUMENTS if d["content"] == doc.content][0]
+        assert doc.meta["vector_id"] == vector_ids[doc.content]
+        assert np.allclose(original_doc["embedding"], doc.embedding, rtol=0.01)
+
+    result = document_store.query_by_embedding(query_emb=DOCUMENTS[4]["embedding"], top_k=1)
+    assert result[0].content == "text_5"
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("retriever", ["dpr"], indirect=True)
+def test_faiss_update_embeddings_with_filters(retriever, tmp_path):
+    document_store = FAISSDocumentStore(
+        sql_url=f"sqlite:////{tmp_path/'test_faiss_update_embeddings_with_filters.db'}",
+        stable_vector_ids=True,
+        isolation_level="AUTOCOMMIT"
+    )
+    document_store.write_documents(DOCUMENTS)
+    documents_before = {doc.content: doc for doc in document_store.get_all_documents(return_embedding=True)}
+
+    document_store.update_embeddings(retriever=retriever, filters={"year": ["2021"]}, batch_size=2)
+    assert document_store.get_embedding_count() == len(DOCUMENTS)
+
+    for doc in document_store.get_all_documents(return_embedding=True):
+        assert doc.meta["vector_id"] == documents_before[doc.content].meta["vector_id"]
+        if doc.meta["year"] == "2021":
+            updated_embedding = retriever.embed_documents([doc])[0]
+            assert np.allclose(updated_embedding, doc.embedding, rtol=0.01)
+        else:
+            assert np.allclose(documents_before[doc.content].embedding, doc.embedding, rtol=0.01)
+
+
 @pytest.mark.parametrize("retriever", ["dpr"], indirect=True)
 @pytest.mark.parametrize("document_store", ["faiss", "milvus"], indirect=True)
 def test_update_with_empty_store(document_store, retriever):
@@ -259,6 +311,68 @@ def test_faiss_retrieving(index_factory, tmp_path):
     document_store.faiss_indexes[document_store.index].reset()
 
 
+@pytest.mark.skipif(sys.platform in ['win32', 'cygwin'], reason="Test with tmp_path not working on windows runner")
+@pytest.mark.parametrize("index_factory", ["Flat", "HNSW", "IVF1,Flat"])
+def test_faiss_query_by_embedding_with_filters(index_factory, tmp_path):
+    document_store = FAISSDocumentStore(
+        sql_url=f"sqlite:////{tmp_path/'test_faiss_query_by_embedding_with_filters.db'}",
+        faiss_index_factory_str=index_factory,
+        embedding_dim=8,
+        similarity="dot_product",
+        isolation_level="AUTOCOMMIT"
+    )
+    documents = [
+        {"content": f"text_{i}", "meta": {"name": f"name_{i}", "even": str(i % 2 == 0)},
+         "embedding": np.random.rand(8).astype(np.float32)}
+        for i in range(100)
+    ]
+    if "ivf" in index_factory.lower():
+        document_store.train_index(documents)
+    document_store.write_documents(documents)
+    query_emb = np.random.rand(8).astype(np.float32)
+
+    # few and many matching documents (scored directly or post-filtered if the IDSelector search is not supported)
+    for filters in [{"name": ["name_3", "name_4", "name_7"]}, {"even": ["True"]}]:
+        matching = [doc for doc in documents if all(doc["meta"][key] in values for key, values in filters.items())]
+        expected = sorted(matching, key=lambda doc: -np.dot(doc["embedding"], query_emb))[:5]
+
+        result = document_store.query_by_embedding(query_emb=query_emb, filters=filters, top_k=5)
+        assert [doc.content for doc in result] == [doc["content"] for doc in expected]
+
+    assert document_store.query_by_embedding(query_emb=query_emb, filters={"name": ["unknown"]}) == []
+
+
+@pytest.mark.skipif(sys.platform in ['win32', 'cygwin'], reason="Test with tmp_path not working on windows runner")
+@pytest.mark.parametrize("index_factory", ["HNSW", "IVF4,Flat"])
+def test_faiss_query_by_embedding_with_filters_in_approximate_index(index_factory, tmp_path):
+    document_store = FAISSDocumentStore(
+        sql_url=f"sqlite:////{tmp_path/'test_faiss_query_by_embedding_with_filters_in_approximate_index.db'}",
+        faiss_index_factory_str=index_factory,
+        embedding_dim=8,
+        similarity="dot_product",
+        isolation_level="AUTOCOMMIT"
+    )
+    documents = [
+        {"content": f"text_{i}", "meta": {"name": f"name_{i}"}, "embedding": np.random.rand(8).astype(np.float32)}
+        for i in range(400)
+    ]
+    if "ivf" in index_factory.lower():
+        document_store.train_index(documents)
+    document_store.write_documents(documents)
+    # search only a small part of the index, which misses most of the matching documents
+    faiss_index = document_store.faiss_indexes[document_store.index]
+    if "ivf" in index_factory.lower():
+        faiss_index.nprobe = 1
+    else:
+        faiss_index.hnsw.efSearch = 1
+
+    filters = {"name": ["name_3", "name_150", "name_399"]}
+    for query_emb in np.random.rand(5, 8).astype(np.float32):
+        result = document_store.query_by_embedding(query_emb=query_emb, filters=filters, top_k=5)
+        assert sorted(doc.content for doc in result) == ["text_150", "text_3", "text_399"]
+        assert [doc.score for doc in result] == sorted([doc.score for doc in result], reverse=True)
+
+
 @pytest.mark.parametrize("retriever", ["embedding"], indirect=True)
 @pytest.mark.parametrize("document_store", ["faiss", "milvus"], indirect=True)
 def test_finding(document_store, retriever):
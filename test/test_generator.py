@@ -51,6 +51,25 @@ def test_rag_token_generator(rag_generator):
     assert "berlin" in answers[0].answer
 
 
+@pytest.mark.slow
+@pytest.mark.generator
+def test_rag_token_generator_batch(rag_generator):
+    query_doc_list = [
+        {"query": "What is capital of the Germany?", "docs": DOCS_WITH_EMBEDDINGS},
+        {"query": "What is capital of the Germany?", "docs": DOCS_WITH_EMBEDDINGS[:2]},
+        {"query": "What is the capital of the Germany?", "docs": DOCS_WITH_EMBEDDINGS},
+    ]
+    results = rag_generator.predict_batch(query_doc_list=query_doc_list, top_k=1, batch_size=2)
+    assert len(results) == 3
+    for query_docs, result in zip(query_doc_list, results):
+        assert result["query"] == query_docs["query"]
+        assert len(result["answers"]) == 1
+        assert result["answers"][0].meta["doc_ids"] == [doc.id for doc in query_docs["docs"]]
+    assert "berlin" in results[0]["answers"][0].answer
+    assert results[0]["answers"][0].answer == rag_generator.predict(
+        query=query_doc_list[0]["query"], documents=DOCS_WITH_EMBEDDINGS, top_k=1)["answers"][0].answer
+
+
 @pytest.mark.slow
 @pytest.mark.generator
 @pytest.mark.parametrize("document_store", ["memory"], indirect=True)
@@ -1,4 +1,13 @@
 import pytest
+import numpy as np
+import torch
+from torch.utils.data import TensorDataset
+
+from haystack.modeling.data_handler.dataloader import (
+    NamedDataLoader, LengthBucketBatchSampler, get_padded_length, get_sequence_lengths, remove_padding
+)
+from haystack.modeling.data_handler.processor_pool import ProcessorPool
+from haystack.modeling.data_handler.samples import Sample, SampleBasket
 
 
 @pytest.mark.parametrize("multiprocessing_chunksize", [None, 2])
@@ -68,5 +77,81 @@ def test_qa_format_and_results(adaptive_model_qa, multiprocessing_chunksize):
         )
 
 
+class _WordLengthProcessor:
+    """
+    Turns every dict into one sample with the lengths of its words as input ids, padded to max_seq_len.
+    """
+    def __init__(self, max_seq_len: int):
+        self.max_seq_len = max_seq_len
+
+    def dataset_from_dicts(self, dicts, indices, return_baskets=False):
+        baskets = []
+        for index, d in zip(indices, dicts):
+            input_ids = [len(word) for word in d["text"].split()][:self.max_seq_len]
+            input_ids += [0] * (self.max_seq_len - len(input_ids))
+            sample = Sample(id=str(index), clear_text=d, features=[{"input_ids": input_ids, "sample_id": index}])
+            baskets.append(SampleBasket(id_internal=index, raw=d, samples=[sample]))
+        dataset = TensorDataset(
+            torch.tensor([basket.samples[0].features[0]["input_ids"] for basket in baskets]), torch.tensor(indices)
+        )
+        return dataset, ["input_ids", "sample_id"], set(), baskets
+
+
+def test_processor_pool():
+    dicts = [{"text": " ".join(["a" * (i % 3 + 1)] * (i % 5 + 1))} for i in range(20)]
+    pool = ProcessorPool(_WordLengthProcessor(max_seq_len=4), num_processes=2)
+    try:
+        # every process gets four chunks
+        assert pool.calc_chunksize(len(dicts)) == 3
+        assert pool.calc_chunksize(1) == 1
+
+        results = list(pool.dataset_from_dicts(dicts))
+        assert len(results) == 7
+        assert torch.cat([dataset.tensors[1] for dataset, _, _, _ in results]).tolist() == list(range(20))
+        for dataset, tensor_names, problematic_sample_ids, baskets in results:
+            assert dataset.tensors[0].shape[1] == 4
+            # the input ids are only passed back as tensor, scalar features are kept to format the predictions
+            assert [basket.samples[0].features for basket in baskets] == [
+                [{"sample_id": basket.id_internal}] for basket in baskets
+            ]
+
+        # the workers are restarted with the new processor
+        pool.set_processor(_WordLengthProcessor(max_seq_len=2))
+        results = list(pool.dataset_from_dicts(dicts, chunksize=10))
+        assert [dataset.tensors[0].shape for dataset, _, _, _ in results] == [(10, 2), (10, 2)]
+    finally:
+        pool.close(join=True)
+
+    with pytest.raises(RuntimeError):
+        pool.dataset_from_dicts(dicts)
+
+
+def test_length_bucketed_batches_without_padding():
+    lengths = [3, 8, 2, 8, 5, 1]
+    padding_mask = torch.tensor([[1] * length + [0] * (8 - length) for length in lengths])
+    input_ids = padding_mask * torch.arange(1, 9)
+    dataset = TensorDataset(input_ids, padding_mask, torch.arange(len(lengths)))
+    tensor_names = ["input_ids", "padding_mask", "sample_ids"]
+    assert list(get_sequence_lengths(dataset, tensor_names)) == lengths
+    assert get_padded_length(dataset, tensor_names) == 8
+
+    batch_sampler = LengthBucketBatchSampler(lengths=lengths, max_tokens=16)
+    # longest samples first, each batch within the token budget
+    assert list(batch_sampler) == [[1, 3], [4, 0, 2], [5]]
+
+    data_loader = NamedDataLoader(dataset=dataset, batch_sampler=batch_sampler, tensor_names=tensor_names)
+    predictions = []
+    for batch in data_loader:
+        batch = remove_padding(batch)
+        batch_length = int(batch["padding_mask"].sum(dim=-1).max())
+        assert batch["input_ids"].shape[1] == batch["padding_mask"].shape[1] == batch_length
+        assert batch["input_ids"].is_contiguous()
+        assert batch["sample_ids"].shape == (len(batch["input_ids"]),)
+        predictions.append(batch["sample_ids"].numpy())
+    assert list(batch_sampler.restore_order(np.concatenate(predictions))) == list(range(len(lengths)))
+
+    assert list(LengthBucketBatchSampler(lengths=lengths, max_tokens=100, max_batch_size=4)) == [[1, 3, 4, 0], [2, 5]]
+
+
 if __name__ == "__main__":
     test_qa_format_and_results()
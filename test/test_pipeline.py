@@ -2,7 +2,10 @@ from pathlib import Path
 
 import os
 import json
+import threading
+import time
 from unittest.mock import Mock
+import numpy as np
 import pytest
 import responses
 from haystack.document_stores.deepsetcloud import DeepsetCloudDocumentStore
@@ -15,7 +18,8 @@ from haystack.pipelines import (
     RootNode,
 )
 from haystack.pipelines import ExtractiveQAPipeline
-from haystack.nodes import DensePassageRetriever, EmbeddingRetriever
+from haystack.nodes import DensePassageRetriever, EmbeddingRetriever, PreProcessor
+from haystack.schema import Document
 
 from conftest import MOCK_DC, DC_API_ENDPOINT, DC_API_KEY, DC_TEST_INDEX, SAMPLES_PATH, deepset_cloud_fixture
 
@@ -414,6 +418,191 @@ def test_parallel_paths_in_pipeline_graph_with_branching():
     assert output["output"] == "ACABEABD"
 
 
+def test_pipeline_execution_plan_is_updated():
+    class A(RootNode):
+        def run(self, test: str = ""):
+            return {"test": test + "A"}, "output_1"
+
+    class B(RootNode):
+        def run(self, test, suffix: str = "B"):
+            return {"test": test + suffix}, "output_1"
+
+    pipeline = Pipeline()
+    pipeline.add_node(name="A", component=A(), inputs=["Query"])
+    assert pipeline.run(query="test")["test"] == "A"
+
+    # adding and replacing nodes after the first run invalidates the cached execution plan
+    pipeline.add_node(name="B", component=B(), inputs=["A"])
+    assert pipeline.run(query="test", params={"suffix": "X"})["test"] == "AX"
+    pipeline.set_node("B", A())
+    assert pipeline.run(query="test")["test"] == "AA"
+
+    with pytest.raises(ValueError):
+        pipeline.run(query="test", params={"suffix": "X"})
+
+
+def test_pipeline_passes_inputs_by_reference():
+    retrieved_documents = [Document(content="text", embedding=np.random.rand(768).astype(np.float32))]
+
+    class Retriever(RootNode):
+        def run(self, query):
+            return {"documents": retrieved_documents}, "output_1"
+
+    class Reader(RootNode):
+        def run(self, documents):
+            assert documents is retrieved_documents
+            return {"documents": documents}, "output_1"
+
+    class Tagger(RootNode):
+        modifies_inputs = True
+
+        def run(self, documents):
+            assert documents is not retrieved_documents
+            for doc in documents:
+                doc.meta["tagged"] = True
+            return {"documents": documents}, "output_1"
+
+    pipeline = Pipeline()
+    pipeline.add_node(name="Retriever", component=Retriever(), inputs=["Query"])
+    pipeline.add_node(name="Reader", component=Reader(), inputs=["Retriever"])
+    pipeline.add_node(name="Tagger", component=Tagger(), inputs=["Reader"])
+    params = {"Tagger": {"debug": True}}
+    output = pipeline.run(query="test", params=params)
+
+    assert output["documents"][0].meta == {"tagged": True}
+    assert retrieved_documents[0].meta == {}
+    assert output["_debug"]["Tagger"]["copied_input_bytes"] > retrieved_documents[0].embedding.nbytes
+    assert params == {"Tagger": {"debug": True}}
+
+
+def test_pipeline_does_not_modify_preprocessor_inputs():
+    documents = [{"content": "  This is a sentence.  \n\n\n\nThis is another one.  ", "meta": {"name": "doc"}}]
+    original_documents = [{"content": documents[0]["content"], "meta": {"name": "doc"}}]
+
+    pipeline = Pipeline()
+    pipeline.add_node(name="PreProcessor", component=PreProcessor(split_by=None), inputs=["File"])
+    output = pipeline.run(documents=documents)
+
+    assert output["documents"][0]["content"] == "This is a sentence.\n\nThis is another one."
+    assert documents == original_documents
+
+    pipeline = Pipeline()
+    pipeline.add_node(
+        name="PreProcessor",
+        component=PreProcessor(split_by="passage", split_length=1, split_respect_sentence_boundary=False),
+        inputs=["File"]
+    )
+    output = pipeline.run(documents=documents)
+
+    assert [doc["meta"]["_split_id"] for doc in output["documents"]] == [0, 1]
+    assert documents == original_documents
+
+
+def test_pipeline_run_batch():
+    batch_sizes = []
+
+    class Classifier(RootNode):
+        outgoing_edges = 2
+
+        def run(self, query):
+            return {}, "output_1" if query.startswith("what") else "output_2"
+
+    class Retriever(RootNode):
+        def run(self, query, top_k: int = 3):
+            return {"documents": [Document(content=f"{query} {i}") for i in range(top_k)]}, "output_1"
+
+        def _run_queries(self, runs_inputs, run_params):
+            batch_sizes.append(len(runs_inputs))
+            return [self.run(query=run_inputs["query"], **run_params) for run_inputs in runs_inputs]
+
+    class Reader(RootNode):
+        def run(self, query, documents):
+            return {"answers": [doc.content for doc in documents]}, "output_1"
+
+    class Keyword(RootNode):
+        def run(self, query):
+            return {"answers": [query.split()[-1]]}, "output_1"
+
+    pipeline = Pipeline()
+    pipeline.add_node(name="Classifier", component=Classifier(), inputs=["Query"])
+    pipeline.add_node(name="Retriever", component=Retriever(), inputs=["Classifier.output_1"])
+    pipeline.add_node(name="Reader", component=Reader(), inputs=["Retriever"])
+    pipeline.add_node(name="Keyword", component=Keyword(), inputs=["Classifier.output_2"])
+
+    queries = ["what is a", "who is b", "what is c"]
+    params = {"Retriever": {"top_k": 2}}
+    outputs = pipeline.run_batch(queries=queries, params=params)
+
+    # the queries that take the same path are processed together
+    assert batch_sizes == [2]
+    assert len(outputs) == 3
+    for query, output in zip(queries, outputs):
+        expected = pipeline.run(query=query, params=params)
+        assert output["query"] == query
+        assert output["answers"] == expected["answers"]
+    assert outputs[0]["answers"] == ["what is a 0", "what is a 1"]
+    assert outputs[1]["answers"] == ["b"]
+
+    # the debug flag doesn't prevent the queries from being processed together
+    batch_sizes.clear()
+    outputs = pipeline.run_batch(queries=queries, params=params, debug=True)
+    assert batch_sizes == [2]
+    assert params == {"Retriever": {"top_k": 2}}
+
+    # without params (the default of the REST API), the queries are processed together as well
+    for empty_params in [None, {}]:
+        batch_sizes.clear()
+        outputs = pipeline.run_batch(queries=queries, params=empty_params)
+        assert batch_sizes == [2]
+        assert outputs[0]["answers"] == ["what is a 0", "what is a 1", "what is a 2"]
+
+    # and also after a node that gets a copy of its inputs
+    pipeline.get_node("Classifier").modifies_inputs = True
+    batch_sizes.clear()
+    pipeline.run_batch(queries=queries)
+    assert batch_sizes == [2]
+
+
+def test_parallel_paths_in_pipeline_graph_run_concurrently():
+    # both branches have to be running at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=10)
+
+    class A(RootNode):
+        def run(self):
+            return {"test": "A"}, "output_1"
+
+    class Branch(RootNode):
+        def __init__(self, suffix: str, delay: float):
+            self.suffix = suffix
+            self.delay = delay
+
+        def run(self, test):
+            barrier.wait()
+            time.sleep(self.delay)
+            return {"test": test + self.suffix}, "output_1"
+
+    class JoinNode(RootNode):
+        def run(self, inputs):
+            return {"test": "".join(input_dict["test"] for input_dict in inputs)}, "output_1"
+
+    pipeline = Pipeline(max_workers=2)
+    pipeline.add_node(name="A", component=A(), inputs=["Query"])
+    # the first branch finishes last, the join node still gets the inputs in the order of a sequential run
+    pipeline.add_node(name="B", component=Branch("B", delay=0.2), inputs=["A"])
+    pipeline.add_node(name="C", component=Branch("C", delay=0.0), inputs=["A"])
+    pipeline.add_node(name="D", component=JoinNode(), inputs=["B", "C"])
+    for _ in range(3):
+        output = pipeline.run(query="test")
+        assert output["test"] == "ABAC"
+
+    # the branches receive the same output of A, each of them gets its own input and params
+    params = {"B": {"debug": False}}
+    output = pipeline.run(query="test", params=params, debug=True)
+    assert output["test"] == "ABAC"
+    assert "D" in output["_debug"]
+    assert params == {"B": {"debug": False}}
+
+
 def test_existing_faiss_document_store():
     clean_faiss_document_store()
 
@@ -36,6 +36,14 @@ def test_ranker(ranker):
     results = ranker.predict(query=query, documents=docs)
     assert results[0] == docs[4]
 
+    other_query = "Who created the Dothraki vocabulary?"
+    results = ranker.predict_batch(query_doc_list=[{"query": query, "docs": docs}, {"query": other_query, "docs": docs}],
+                                   top_k=3, batch_size=2)
+    assert len(results) == 2
+    assert [len(ranked) for ranked in results] == [3, 3]
+    assert results[0] == ranker.predict(query=query, documents=docs, top_k=3)
+    assert results[1][0] == docs[3]
+
 
 def test_ranker_two_logits(ranker_two_logits):
     assert isinstance(ranker_two_logits, BaseRanker)
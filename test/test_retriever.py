@@ -12,7 +12,8 @@ from haystack.document_stores.elasticsearch import ElasticsearchDocumentStore
 from haystack.document_stores.faiss import FAISSDocumentStore
 from haystack.document_stores.milvus import MilvusDocumentStore
 from haystack.nodes.retriever.dense import DensePassageRetriever, TableTextRetriever
-from haystack.nodes.retriever.sparse import ElasticsearchRetriever, ElasticsearchFilterOnlyRetriever, TfidfRetriever
+from haystack.nodes.retriever._query_embedding_cache import QueryEmbeddingCache
+from haystack.nodes.retriever.sparse import ElasticsearchRetriever, ElasticsearchFilterOnlyRetriever, TfidfRetriever, BM25Retriever
 from transformers import DPRContextEncoderTokenizerFast, DPRQuestionEncoderTokenizerFast
 
 from conftest import SAMPLES_PATH
@@ -77,9 +78,7 @@ def test_retrieval(retriever_with_docs, document_store_with_docs):
     assert res[0].meta["name"] == "filename1"
 
     # test with filters
-    if not isinstance(document_store_with_docs, (FAISSDocumentStore, MilvusDocumentStore)) and not isinstance(
-        retriever_with_docs, TfidfRetriever
-    ):
+    if not isinstance(document_store_with_docs, (FAISSDocumentStore, MilvusDocumentStore)):
         # single filter
         result = retriever_with_docs.retrieve(query="godzilla", filters={"name": ["filename3"]}, top_k=5)
         assert len(result) == 1
@@ -101,6 +100,185 @@ def test_retrieval(retriever_with_docs, document_store_with_docs):
         assert len(result) == 0
 
 
+@pytest.mark.parametrize(
+    "retriever_with_docs,document_store_with_docs",
+    [
+        ("dpr", "faiss"),
+        ("dpr", "memory"),
+        ("embedding", "faiss"),
+        ("embedding", "memory"),
+        ("embedding", "elasticsearch"),
+        ("tfidf", "memory"),
+        ("bm25", "memory"),
+        ("bm25", "sql"),
+    ],
+    indirect=True,
+)
+def test_retrieve_batch(retriever_with_docs, document_store_with_docs):
+    if not isinstance(retriever_with_docs, (TfidfRetriever, BM25Retriever)):
+        document_store_with_docs.update_embeddings(retriever_with_docs)
+
+    queries = ["Who lives in Berlin?", "Who lives in Paris?", "Who lives in Berlin?"]
+    results = retriever_with_docs.retrieve_batch(queries=queries, top_k=2)
+    assert len(results) == len(queries)
+    for query, result in zip(queries, results):
+        expected = retriever_with_docs.retrieve(query=query, top_k=2)
+        assert [doc.id for doc in result] == [doc.id for doc in expected]
+        assert [doc.score for doc in result] == pytest.approx([doc.score for doc in expected], abs=1e-4)
+    assert results[0][0].content == "My name is Carla and I live in Berlin"
+    assert results[1][0].content == "My name is Christelle and I live in Paris"
+
+    assert retriever_with_docs.retrieve_batch(queries=[]) == []
+
+
+@pytest.mark.parametrize("document_store_with_docs", ["memory"], indirect=True)
+def test_tfidf_retriever_partial_fit(document_store_with_docs):
+    retriever = TfidfRetriever(document_store=document_store_with_docs)
+    tfidf_matrix_shape = retriever.tfidf_matrix.shape
+
+    document_store_with_docs.write_documents([
+        Document(content="My name is Matteo and I live in Rome", meta={"meta_field": "test4", "name": "filename4"})
+    ])
+    # the new document is added to the tf-idf matrix before the query is answered
+    res = retriever.retrieve(query="Who lives in Rome?", top_k=1)
+    assert res[0].content == "My name is Matteo and I live in Rome"
+    assert retriever.document_count == 4
+    assert retriever.tfidf_matrix.shape[0] == tfidf_matrix_shape[0] + 1
+
+    # the incrementally built index ranks like a fresh fit
+    fitted_retriever = TfidfRetriever(document_store=document_store_with_docs)
+    for query in ["Who lives in Berlin?", "Who lives in Rome?", "Matteo Paul"]:
+        assert [doc.content for doc in retriever.retrieve(query=query)] == \
+               [doc.content for doc in fitted_retriever.retrieve(query=query)]
+
+    # indexed documents are skipped
+    retriever.partial_fit(document_store_with_docs.get_all_documents())
+    assert retriever.tfidf_matrix.shape[0] == tfidf_matrix_shape[0] + 1
+
+    # deleted documents trigger a full fit
+    document_store_with_docs.delete_documents(filters={"name": ["filename4"]})
+    res = retriever.retrieve(query="Who lives in Rome?")
+    assert retriever.document_count == 3
+    assert "My name is Matteo and I live in Rome" not in [doc.content for doc in res]
+
+    # a deletion hidden by a larger number of added documents triggers a full fit as well
+    document_store_with_docs.delete_documents(filters={"name": ["filename1"]})
+    document_store_with_docs.write_documents([
+        Document(content="My name is Matteo and I live in Rome", meta={"name": "filename4"}),
+        Document(content="My name is Paolo and I live in Milan", meta={"name": "filename5"})
+    ])
+    res = retriever.retrieve(query="Who lives in Berlin?")
+    assert retriever.document_count == 4
+    assert "My name is Carla and I live in Berlin" not in [doc.content for doc in res]
+
+    # without auto_fit, only the documents passed to partial_fit() are added
+    retriever = TfidfRetriever(document_store=document_store_with_docs, auto_fit=False)
+    new_docs = [Document(content="My name is Giulia and I live in Turin", meta={"name": "filename6"})]
+    document_store_with_docs.write_documents(new_docs)
+    assert "My name is Giulia and I live in Turin" not in [doc.content for doc in retriever.retrieve(query="Turin")]
+    retriever.partial_fit(new_docs)
+    assert retriever.document_count == 5
+    assert retriever.retrieve(query="Who lives in Turin?", top_k=1)[0].content == "My name is Giulia and I live in Turin"
+
+
+@pytest.mark.parametrize("document_store_with_docs", ["memory", "sql"], indirect=True)
+def test_bm25_retriever(document_store_with_docs, tmp_path):
+    retriever = BM25Retriever(document_store=document_store_with_docs)
+
+    res = retriever.retrieve(query="Who lives in Berlin?")
+    assert len(res) == 3
+    assert res[0].content == "My name is Carla and I live in Berlin"
+    assert res[0].meta["name"] == "filename1"
+    assert res[0].score > res[1].score
+    assert all(0 < doc.score < 1 for doc in res)
+    # only documents that contain one of the query terms are returned
+    assert retriever.retrieve(query="godzilla") == []
+
+    # single filter
+    res = retriever.retrieve(query="Who lives in Berlin?", filters={"name": ["filename3"]})
+    assert [doc.meta["name"] for doc in res] == ["filename3"]
+    # multiple filters
+    res = retriever.retrieve(query="live", filters={"name": ["filename2"], "meta_field": ["test2", "test3"]})
+    assert [doc.meta["name"] for doc in res] == ["filename2"]
+    res = retriever.retrieve(query="live", filters={"name": ["filename1"], "meta_field": ["test2", "test3"]})
+    assert res == []
+
+    # the index is rebuilt after new documents have been written
+    document_store_with_docs.write_documents([
+        Document(content="My name is Matteo and I live in Rome", meta={"meta_field": "test4", "name": "filename4"})
+    ])
+    res = retriever.retrieve(query="Who lives in Rome?", top_k=1)
+    assert res[0].content == "My name is Matteo and I live in Rome"
+
+    # the saved index is memory mapped when it's loaded
+    retriever.save(tmp_path / "bm25_index")
+    loaded_retriever = BM25Retriever.load(tmp_path / "bm25_index", document_store=document_store_with_docs)
+    assert isinstance(loaded_retriever.posting_document_idx, np.memmap)
+    for query, filters in [("Who lives in Berlin?", None), ("My name", {"meta_field": ["test2", "test4"]})]:
+        expected = retriever.retrieve(query=query, filters=filters)
+        res = loaded_retriever.retrieve(query=query, filters=filters)
+        assert [doc.id for doc in res] == [doc.id for doc in expected]
+        assert [doc.score for doc in res] == pytest.approx([doc.score for doc in expected])
+
+    # the returned documents are copies of the stored ones
+    res[0].meta["name"] = "changed"
+    assert document_store_with_docs.get_documents_by_id([res[0].id])[0].meta["name"] != "changed"
+
+    # a loaded index is not rebuilt in memory after documents have been written
+    document_store_with_docs.write_documents([
+        Document(content="My name is Giulia and I live in Turin", meta={"meta_field": "test5", "name": "filename5"})
+    ])
+    assert loaded_retriever.retrieve(query="Turin") == []
+    assert isinstance(loaded_retriever.posting_document_idx, np.memmap)
+
+    # documents deleted since the last fit are skipped
+    retriever.auto_fit = False
+    document_store_with_docs.delete_documents(filters={"name": ["filename1"]})
+    res = retriever.retrieve(query="Who lives in Berlin?")
+    assert "My name is Carla and I live in Berlin" not in [doc.content for doc in res]
+
+
+def test_query_embedding_cache(tmp_path):
+    embedded_queries = []
+
+    def embed(queries):
+        embedded_queries.extend(queries)
+        return [np.full(4, len(query), dtype=np.float32) for query in queries]
+
+    cache = QueryEmbeddingCache(model_id="model", max_size=2, path=tmp_path / "cache.db")
+    embeddings = cache.get_or_embed(["Who lives in Berlin?", " Who  lives in Berlin? ", "Who lives in Paris?"], embed)
+    # normalized duplicates are only embedded once
+    assert embedded_queries == ["Who lives in Berlin?", "Who lives in Paris?"]
+    assert [embedding[0] for embedding in embeddings] == [20, 20, 19]
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    embeddings[0][:] = 0
+    embeddings = cache.get_or_embed(["Who lives in Berlin?"], embed)
+    assert embeddings[0][0] == 20
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # the least recently used query is evicted from memory but still found on disk
+    cache.get_or_embed(["Who lives in New York?"], embed)
+    assert len(cache) == 2
+    cache.get_or_embed(["Who lives in Paris?"], embed)
+    assert embedded_queries == ["Who lives in Berlin?", "Who lives in Paris?", "Who lives in New York?"]
+
+    # the disk cache is shared with other instances of the same model
+    other_cache = QueryEmbeddingCache(model_id="model", path=tmp_path / "cache.db")
+    assert other_cache.get_or_embed(["Who lives in Paris?"], embed)[0][0] == 19
+    assert (other_cache.hits, other_cache.misses) == (1, 0)
+    other_model_cache = QueryEmbeddingCache(model_id="other_model", path=tmp_path / "cache.db")
+    other_model_cache.get_or_embed(["Who lives in Paris?"], embed)
+    assert other_model_cache.misses == 1
+
+    # expired embeddings are created again
+    expiring_cache = QueryEmbeddingCache(model_id="expiring_model", ttl=0.1)
+    expiring_cache.get_or_embed(["Who lives in Rome?"], embed)
+    time.sleep(0.2)
+    expiring_cache.get_or_embed(["Who lives in Rome?"], embed)
+    assert expiring_cache.misses == 2
+
+
 @pytest.mark.elasticsearch
 def test_elasticsearch_custom_query():
     client = Elasticsearch()
@@ -176,6 +354,24 @@ def test_dpr_embedding(document_store, retriever, docs):
     assert abs(doc_5[0] - (-0.0049)) < 0.001
 
 
+@pytest.mark.slow
+@pytest.mark.parametrize("retriever", ["dpr"], indirect=True)
+@pytest.mark.parametrize("document_store", ["memory"], indirect=True)
+def test_dpr_query_embedding_without_processor(retriever):
+    queries = ["Who lives in Berlin?", "Who lives in Berlin", "What is the capital of a country with a very long name?"]
+    embeddings = retriever.embed_queries(texts=queries)
+    expected = retriever._get_predictions([{"query": query} for query in queries])["query"]
+    assert embeddings.shape == (3, 768)
+    assert np.allclose(embeddings, expected, atol=1e-5)
+    # the "?" is removed like by the Processor
+    assert np.allclose(embeddings[0], embeddings[1], atol=1e-5)
+    # more queries than fit into one batch of the preallocated input tensors
+    many_queries = [f"query number {i}" for i in range(retriever.batch_size + 3)]
+    embeddings = retriever.embed_queries(texts=many_queries)
+    expected = retriever._get_predictions([{"query": query} for query in many_queries])["query"]
+    assert np.allclose(embeddings, expected, atol=1e-5)
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize("retriever", ["retribert"], indirect=True)
 @pytest.mark.embedding_dim(128)
@@ -21,6 +21,34 @@ def test_table_reader(table_reader):
     assert prediction["answers"][0].offsets_in_context[0].end == 8
 
 
+def test_table_reader_batch(table_reader):
+    movies = pd.DataFrame({
+        "actors": ["brad pitt", "leonardo di caprio", "george clooney"],
+        "age": ["58", "47", "60"],
+        "number of movies": ["87", "53", "69"],
+        "date of birth": ["18 december 1963", "11 november 1974", "6 may 1961"],
+    })
+    mountains = pd.DataFrame({
+        "Mountain": ["Mount Everest", "K2", "Kangchenjunga", "Lhotse", "Makalu"],
+        "Height": ["8848m", "8,611 m", "8 586m", "8 516 m", "8,485m"]
+    })
+    documents = [Document(content=movies, content_type="table"), Document(content=mountains, content_type="table")]
+    query_doc_list = [
+        {"question": "When was Di Caprio born?", "docs": documents},
+        {"question": "How old is Brad Pitt?", "docs": documents[:1]},
+        {"question": "Which mountain is the highest?", "docs": []},
+    ]
+
+    predictions = table_reader.predict_batch(query_doc_list=query_doc_list, top_k=2, batch_size=2)
+    assert len(predictions) == 3
+    single_prediction = table_reader.predict(query="When was Di Caprio born?", documents=documents, top_k=2)
+    assert [answer.answer for answer in predictions[0]["answers"]] == \
+           [answer.answer for answer in single_prediction["answers"]]
+    assert predictions[0]["answers"][0].answer == "11 november 1974"
+    assert predictions[1]["answers"][0].answer == "58"
+    assert predictions[2]["answers"] == []
+
+
 def test_table_reader_in_pipeline(table_reader):
     pipeline = Pipeline()
     pipeline.add_node(table_reader, "TableReader", ["Query"])
@@ -1,7 +1,10 @@
+import os
+import time
+
 import pytest
 from pathlib import Path
 
-from haystack.utils.preprocessing import convert_files_to_dicts, tika_convert_files_to_dicts
+from haystack.utils.preprocessing import convert_files_to_dicts, parallel_convert_files_to_dicts, tika_convert_files_to_dicts
 from haystack.utils.cleaning import clean_wiki_text
 from haystack.utils.augment_squad import augment_squad
 from haystack.utils.squad_data import SquadData
@@ -13,6 +16,45 @@ def test_convert_files_to_dicts():
     documents = convert_files_to_dicts(dir_path=(SAMPLES_PATH).absolute(), clean_func=clean_wiki_text, split_paragraphs=True)
     assert documents and len(documents) > 0
 
+def test_parallel_convert_files_to_dicts(tmp_path):
+    manifest_path = tmp_path / "manifest.jsonl"
+    dir_path = SAMPLES_PATH / "docs"
+    documents = list(parallel_convert_files_to_dicts(dir_path=dir_path, split_paragraphs=True, num_processes=2,
+                                                     timeout=60, manifest_path=manifest_path))
+    expected = convert_files_to_dicts(dir_path=dir_path, split_paragraphs=True)
+    assert sorted(d["content"] for d in documents) == sorted(d["content"] for d in expected)
+    assert len(manifest_path.read_text().splitlines()) == 2
+
+    # files that are listed in the manifest are not converted again
+    documents = list(parallel_convert_files_to_dicts(dir_path=dir_path, num_processes=2, manifest_path=manifest_path))
+    assert documents == []
+
+def _clean_text_or_fail(text: str) -> str:
+    # runs in the worker processes of parallel_convert_files_to_dicts()
+    if "slow" in text:
+        time.sleep(30)
+    if "wait" in text:
+        time.sleep(0.2)
+    if "crash" in text:
+        os._exit(1)
+    return text
+
+def test_parallel_convert_files_to_dicts_skips_slow_files(tmp_path):
+    for name, text in [("fast_1.txt", "fast"), ("slow.txt", "slow"), ("fast_2.txt", "fast")]:
+        (tmp_path / name).write_text(text)
+    documents = list(parallel_convert_files_to_dicts(dir_path=tmp_path, clean_func=_clean_text_or_fail,
+                                                     num_processes=2, timeout=1))
+    assert sorted(d["meta"]["name"] for d in documents) == ["fast_1.txt", "fast_2.txt"]
+
+def test_parallel_convert_files_to_dicts_skips_files_that_crash_the_worker(tmp_path):
+    names = [f"file_{i}.txt" for i in range(10)]
+    for name in names:
+        (tmp_path / name).write_text("wait")
+    (tmp_path / "crash.txt").write_text("crash")
+    documents = list(parallel_convert_files_to_dicts(dir_path=tmp_path, clean_func=_clean_text_or_fail, num_processes=2))
+    # only the file that crashed the worker is missing, not the other files that were in flight
+    assert sorted(d["meta"]["name"] for d in documents) == names
+
 @pytest.mark.tika
 def test_tika_convert_files_to_dicts():
     documents = tika_convert_files_to_dicts(dir_path=SAMPLES_PATH, clean_func=clean_wiki_text, split_paragraphs=True)